@@ -6,12 +6,13 @@ pr-dataに保存されているPRデータを分析して、改善貢献PR（mer
 統計情報を取得し、結果を報告します。
 """
 
-import json
 import os
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from src.utils.pr_store import open_pr_store
+
 
 def analyze_contribution_prs():
     """改善貢献PRの統計を分析する"""
@@ -30,14 +31,11 @@ def analyze_contribution_prs():
     thankyou_closed_prs = 0
     daily_counts = defaultdict(int)
 
-    json_files = list(pr_data_dir.glob("*.json"))
-    print(f"見つかったPRファイル数: {len(json_files)}")
+    store = open_pr_store(pr_data_dir)
+    print(f"見つかったPRファイル数: {len(store.numbers())}")
 
-    for json_file in json_files:
+    for pr_data in store.iter_pr_data():
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                pr_data = json.load(f)
-
             total_prs += 1
             basic_info = pr_data.get("basic_info", {})
 
@@ -66,7 +64,7 @@ def analyze_contribution_prs():
                 daily_counts[date_str] += 1
 
         except Exception as e:
-            print(f"エラー {json_file}: {e}")
+            print(f"エラー PR #{pr_data.get('basic_info', {}).get('number')}: {e}")
 
     print(f"\n=== 改善貢献PR統計結果 ===")
     print(f"総PR数: {total_prs}")
@@ -5,6 +5,8 @@ PR番号とIssue番号の重複解決スクリプト
 GitHubではPRとIssueが共通の連番を使用するため、欠番と思われるPR番号が
 実際にはIssueとして存在する可能性があります。このスクリプトは欠番PR番号を
 Issueとして確認し、実質的なデータカバレッジを正確に計算します。
+番号の分類には issues 一覧から作成した番号空間マップを使用するため、
+1番号ずつAPIを呼び出すことはありません。
 
 使用目的:
 - 100%カバレッジ達成の確認
@@ -21,19 +23,29 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.github_api import make_github_api_request, load_config
+from src.utils.github_api import load_config
+from src.utils.number_space import NumberSpaceMap, compress_ranges, format_ranges
+from src.utils.pr_store import open_pr_store
 
 
 def resolve_pr_issue_conflicts(debug=False):
     """PR番号とIssue番号の重複を解決する"""
     config = load_config()
-    github_config = config["github"]
+    prs_dir = Path(config["data"]["base_dir"])
 
-    repo_owner = github_config["repo_owner"]
-    repo_name = github_config["repo_name"]
-    api_base_url = github_config["api_base_url"]
+    with open_pr_store(prs_dir) as store:
+        local_pr_numbers = store.numbers()
 
-    missing_pr_numbers = [181, 182, 194, 215, 802, 931, 1803]
+    print("GitHubの番号空間マップを更新中...")
+    number_space = NumberSpaceMap(prs_dir, config)
+    if not number_space.refresh() and not number_space.max_number:
+        print("エラー: 番号空間マップを作成できませんでした")
+        return
+
+    total_github_numbers = number_space.max_number
+    missing_pr_numbers = sorted(
+        set(range(1, total_github_numbers + 1)) - local_pr_numbers
+    )
 
     if debug:
         print(f"デバッグモード: 確認対象PR番号 {missing_pr_numbers}")
@@ -41,60 +53,40 @@ def resolve_pr_issue_conflicts(debug=False):
     print("=== 欠番PRのIssue存在確認 ===\n")
 
     issue_exists = []
+    pr_uncollected = []
     pr_only_missing = []
 
     for pr_number in missing_pr_numbers:
-        print(f"#{pr_number} を確認中...")
-
-        issue_url = f"{api_base_url}/repos/{repo_owner}/{repo_name}/issues/{pr_number}"
-
-        try:
-            issue_data = make_github_api_request(issue_url)
-
-            if issue_data:
-                issue_title = issue_data.get("title", "タイトル不明")
-                issue_state = issue_data.get("state", "状態不明")
-                is_pull_request = "pull_request" in issue_data
-
-                if is_pull_request:
-                    print(f"  → PR #{pr_number}: {issue_title} ({issue_state})")
-                    print(f"     注意: これはPRです（Issue APIでもアクセス可能）")
-                else:
-                    print(f"  → Issue #{pr_number}: {issue_title} ({issue_state})")
-                    issue_exists.append(
-                        {
-                            "number": pr_number,
-                            "title": issue_title,
-                            "state": issue_state,
-                        }
-                    )
-            else:
-                print(f"  → #{pr_number}: 存在しません（PRでもIssueでもない）")
-                pr_only_missing.append(pr_number)
-
-        except Exception as e:
-            print(f"  → #{pr_number}: エラー - {str(e)}")
+        kind = number_space.classify(pr_number)
+        if kind == "issue":
+            issue_exists.append(pr_number)
+        elif kind == "pr":
+            pr_uncollected.append(pr_number)
+        else:
             pr_only_missing.append(pr_number)
 
-        print()
-
     print("=== 確認結果サマリー ===")
     print(f"確認対象: {len(missing_pr_numbers)}件")
     print(f"Issueとして存在: {len(issue_exists)}件")
+    print(f"未収集のPR: {len(pr_uncollected)}件")
     print(f"完全に欠番: {len(pr_only_missing)}件")
 
     if issue_exists:
         print(f"\n📋 Issueとして存在する番号:")
-        for issue in issue_exists:
-            print(f"  #{issue['number']}: {issue['title']} ({issue['state']})")
+        for range_str in format_ranges(compress_ranges(issue_exists)):
+            print(f"  {range_str}")
+
+    if pr_uncollected:
+        print(f"\n⚠️ 未収集のPR番号:")
+        for range_str in format_ranges(compress_ranges(pr_uncollected)):
+            print(f"  {range_str}")
 
     if pr_only_missing:
         print(f"\n❌ 完全に欠番の番号:")
-        for num in pr_only_missing:
-            print(f"  #{num}")
+        for range_str in format_ranges(compress_ranges(pr_only_missing)):
+            print(f"  {range_str}")
 
-    total_github_numbers = 1834  # 最新PR番号
-    actual_missing = len(pr_only_missing)
+    actual_missing = len(pr_uncollected)
     coverage = ((total_github_numbers - actual_missing) / total_github_numbers) * 100
 
     print(f"\n📊 更新されたカバレッジ:")
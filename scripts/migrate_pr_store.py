@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+PRデータの配置方法・保存形式の移行スクリプト
+
+PRデータディレクトリ内のファイルを flat（prs/<PR番号>.json）と
+sharded（prs/<番号範囲>/<PR番号>.json）の間で移動し、必要に応じて
+保存形式（json / json_compact / json_gzip / json_zstd / msgpack）を変換します。
+使用中の配置方法と保存形式は .index/store.json に記録します。
+--apply-projection を指定すると、保存済みのPRデータからも
+collectors.projection で定義された項目以外を取り除きます。
+--dedupe-patches を指定すると、保存済みのPRデータのパッチ本文を
+.blobs/ のブロブストアに移し、files[].patch_ref で参照するように書き換えます。
+--storage-type を指定すると、PRごとのファイル（file_per_pr）と
+SQLiteデータベース（sqlite）の間でPRデータを移します。
+--reconcile-index を指定すると、git pull などで保存処理を経ずに変更された
+データファイルをインデックス（.index/manifest.json）に反映します。パスを指定した場合は
+そのファイルのみを内容まで比較し、省略した場合は全ファイルをサイズで照合します
+（--verify-content で内容まで比較）。
+
+使用目的:
+- PR数の増加に伴うディレクトリ走査・git操作の高速化
+- データサイズと読み込み時間の削減
+- 設定を変更した後のデータ移行
+
+実行方法:
+    python scripts/migrate_pr_store.py [--layout sharded] [--shard-size 1000] [--file-format json_gzip] [--storage-type sqlite] [--apply-projection] [--dedupe-patches] [--reconcile-index [PATH ...]] [--verify-content] [--prs-dir DIR] [--dry-run]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.github_api import load_config
+from src.utils.pr_format import FILE_FORMATS
+from src.utils.blob_store import dedupe_patches
+from src.utils.pr_projection import get_projection, project_pr_data
+from src.utils.pr_database import SQLitePRStore
+from src.utils.pr_store import LAYOUTS, STORAGE_TYPES, PRStore, open_pr_store
+
+
+def apply_projection(store, projection, dry_run=False):
+    """保存済みのPRデータから不要な項目を取り除き、変更した件数を返す"""
+    projected_count = 0
+    for pr_data in store.iter_pr_data():
+        projected = project_pr_data(pr_data, projection)
+        if projected == pr_data:
+            continue
+
+        projected_count += 1
+        if not dry_run:
+            store.save(projected)
+
+    return projected_count
+
+
+def apply_patch_dedupe(store, dry_run=False):
+    """保存済みのPRデータのパッチ本文をブロブストアに移し、変更した件数を返す"""
+    deduped_count = 0
+    for pr_data in store.iter_pr_data():
+        if not any(file_info.get("patch") for file_info in pr_data.get("files", [])):
+            continue
+
+        deduped_count += 1
+        if not dry_run:
+            store.save(dedupe_patches(pr_data, store.blobs))
+
+    return deduped_count
+
+
+def convert_storage(prs_dir, storage_type, dry_run=False):
+    """PRデータを別の保存方式のストアに移し、移した件数を返す"""
+    source = open_pr_store(prs_dir)
+    target_class = SQLitePRStore if storage_type == "sqlite" else PRStore
+    if isinstance(source, target_class):
+        print(f"既に {storage_type} で保存されています")
+        return 0
+
+    numbers = sorted(source.numbers())
+    if dry_run:
+        return len(numbers)
+
+    target = target_class(prs_dir)
+    for pr_data in source.iter_pr_data():
+        summary = source.get_summary(pr_data["basic_info"]["number"]) or {}
+        target.save({**pr_data, "collected_at": summary.get("collected_at")})
+    target.close()
+
+    # 移し終えたら元のデータを削除する
+    if isinstance(source, SQLitePRStore):
+        source.close()
+        source.path.unlink()
+    else:
+        for path in source.list_paths():
+            path.unlink()
+        source.manifest.rebuild()
+        source.remove_empty_shards()
+
+    return len(numbers)
+
+
+def reconcile_index(store, paths=None, verify_content=False):
+    """インデックスをデータファイルと照合し、反映した件数を返す"""
+    if not isinstance(store, PRStore):
+        print("エラー: インデックスの照合は file_per_pr の場合のみ実行できます")
+        return 0
+
+    reconciled = store.reconcile(paths, verify_content=verify_content or None)
+    store.close()
+    return reconciled
+
+
+def migrate_pr_store(
+    layout=None,
+    shard_size=None,
+    file_format=None,
+    projection=False,
+    dedupe=False,
+    storage_type=None,
+    reconcile_paths=None,
+    verify_content=False,
+    prs_dir=None,
+    dry_run=False,
+):
+    """PRデータを指定した保存方式・配置方法・保存形式に移行する"""
+    config = load_config()
+    prs_dir = Path(prs_dir or config["data"]["base_dir"])
+
+    if not prs_dir.exists():
+        print(f"エラー: ディレクトリ {prs_dir} が存在しません")
+        return
+
+    if reconcile_paths is not None:
+        reconciled = reconcile_index(
+            open_pr_store(prs_dir), reconcile_paths or None, verify_content
+        )
+        print(f"インデックスに反映したファイル数: {reconciled:,}件")
+
+    if storage_type:
+        converted = convert_storage(prs_dir, storage_type, dry_run)
+        if dry_run:
+            print(f"{storage_type} への移行対象PR数: {converted:,}件（ドライラン）")
+        else:
+            print(f"{storage_type} に移したPR数: {converted:,}件")
+            print(
+                f"config/settings.yaml の data.storage_type を {storage_type} に設定してください"
+            )
+
+    store = open_pr_store(prs_dir)
+
+    if projection:
+        projected = apply_projection(
+            store, get_projection(config.get("collectors", {})), dry_run
+        )
+        print(f"項目を絞り込んだファイル数: {projected:,}件")
+
+    if dedupe:
+        deduped = apply_patch_dedupe(store, dry_run)
+        print(f"パッチ本文をブロブストアに移したファイル数: {deduped:,}件")
+        if not dry_run:
+            print(
+                "config/settings.yaml の data.dedupe_patches を true に設定してください"
+            )
+
+    if (projection or dedupe) and not dry_run:
+        store.close()
+
+    if not layout and not file_format:
+        return
+    if not isinstance(store, PRStore):
+        print("エラー: 配置方法・保存形式は file_per_pr の場合のみ変更できます")
+        return
+    layout = layout or store.layout
+    file_format = file_format or store.file_format
+    print(f"現在の配置方法: {store.layout} / 保存形式: {store.file_format}")
+    print(f"移行先の配置方法: {layout} / 保存形式: {file_format}")
+
+    migrated = store.migrate(
+        layout, shard_size=shard_size, file_format=file_format, dry_run=dry_run
+    )
+
+    if dry_run:
+        print(f"移行対象ファイル数: {migrated:,}件（ドライランのため変更していません）")
+        return
+
+    print(f"移行したファイル数: {migrated:,}件")
+    print(
+        f"config/settings.yaml の data.layout を {layout}、data.file_format を "
+        f"{file_format} に設定してください（記録済みの設定が優先されます）"
+    )
+
+
+def main():
+    """メイン実行関数"""
+    parser = argparse.ArgumentParser(description="PRデータの配置方法・保存形式の移行")
+    parser.add_argument("--layout", choices=LAYOUTS, help="移行先の配置方法")
+    parser.add_argument(
+        "--shard-size", type=int, help="sharded の場合の1ディレクトリあたりのPR番号数"
+    )
+    parser.add_argument("--file-format", choices=FILE_FORMATS, help="移行先の保存形式")
+    parser.add_argument(
+        "--storage-type", choices=STORAGE_TYPES, help="移行先の保存方式"
+    )
+    parser.add_argument(
+        "--apply-projection",
+        action="store_true",
+        help="保存済みのPRデータから collectors.projection 以外の項目を取り除く",
+    )
+    parser.add_argument(
+        "--dedupe-patches",
+        action="store_true",
+        help="保存済みのPRデータのパッチ本文をブロブストアに移す",
+    )
+    parser.add_argument(
+        "--reconcile-index",
+        nargs="*",
+        metavar="PATH",
+        help="インデックスをデータファイルと照合する（パス省略時は全ファイル）",
+    )
+    parser.add_argument(
+        "--verify-content",
+        action="store_true",
+        help="--reconcile-index で同じサイズのファイルも内容まで比較する",
+    )
+    parser.add_argument(
+        "--prs-dir", help="PRデータディレクトリ（省略時は設定ファイルの data.base_dir）"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="移動せずに対象件数のみ表示"
+    )
+    args = parser.parse_args()
+
+    if not (
+        args.layout
+        or args.file_format
+        or args.storage_type
+        or args.apply_projection
+        or args.dedupe_patches
+        or args.reconcile_index is not None
+    ):
+        parser.error(
+            "--layout, --file-format, --storage-type, --apply-projection, "
+            "--dedupe-patches, --reconcile-index のいずれかを指定してください"
+        )
+
+    migrate_pr_store(
+        layout=args.layout,
+        shard_size=args.shard_size,
+        file_format=args.file_format,
+        projection=args.apply_projection,
+        dedupe=args.dedupe_patches,
+        storage_type=args.storage_type,
+        reconcile_paths=args.reconcile_index,
+        verify_content=args.verify_content,
+        prs_dir=args.prs_dir,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
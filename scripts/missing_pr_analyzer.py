@@ -20,94 +20,60 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.utils.github_api import (
-    make_github_api_request,
-    load_config,
-    get_max_pr_number_from_local_data,
-)
+from src.utils.github_api import load_config
+from src.utils.number_space import NumberSpaceMap, compress_ranges, format_ranges
+from src.utils.pr_store import open_pr_store
 
 
 def analyze_missing_prs(verbose=False):
     """欠損PRの分析を実行する"""
     config = load_config()
-    github_config = config["github"]
-
-    repo_owner = github_config["repo_owner"]
-    repo_name = github_config["repo_name"]
-    api_base_url = github_config["api_base_url"]
-
-    known_issue_numbers = {181, 182, 194, 215, 802, 931, 1803, 2248}
 
     print("ローカルPRファイルを確認中...")
 
-    local_pr_numbers = set()
     prs_dir = Path(config["data"]["base_dir"])
 
-    local_max_pr = get_max_pr_number_from_local_data(prs_dir)
-
-    for json_file in prs_dir.glob("*.json"):
-        if json_file.name != "last_run_info.json":
-            try:
-                pr_number = int(json_file.stem)
-                local_pr_numbers.add(pr_number)
-            except ValueError:
-                continue
+    with open_pr_store(prs_dir) as store:
+        local_pr_numbers = store.numbers()
+    local_max_pr = max(local_pr_numbers) if local_pr_numbers else None
 
     print(f"ローカル総PR数: {len(local_pr_numbers):,}件")
-
     if local_max_pr:
         print(f"ローカル最大PR番号: #{local_max_pr}")
-        print("GitHubから最新PR番号を確認中...")
-    else:
-        print("GitHubから最新PR番号を取得中...")
-
-    url = f"{api_base_url}/repos/{repo_owner}/{repo_name}/pulls"
-    params = {"state": "all", "sort": "created", "direction": "desc", "per_page": 1}
-
-    latest_prs = make_github_api_request(url, params)
-    if not latest_prs:
-        if local_max_pr:
-            print(f"APIエラーのため、ローカル最大PR番号 #{local_max_pr} を使用します")
-            latest_pr_number = local_max_pr
-        else:
-            print("エラー: PRを取得できませんでした")
-            return
-    else:
-        latest_pr_number = latest_prs[0]["number"]
-        print(f"GitHub最新PR番号: #{latest_pr_number}")
 
-    expected_range = set(range(1, latest_pr_number + 1))
-    missing_numbers = expected_range - local_pr_numbers - known_issue_numbers
+    print("GitHubの番号空間マップを更新中...")
+    number_space = NumberSpaceMap(prs_dir, config)
+    if not number_space.refresh() and not number_space.max_number:
+        print("エラー: 番号空間マップを作成できませんでした")
+        return
+
+    latest_pr_number = number_space.max_number
+    pr_numbers = number_space.pr_numbers()
+    issue_numbers = number_space.issue_numbers()
+    deleted_numbers = number_space.deleted_numbers()
+    print(f"GitHub最新番号: #{latest_pr_number}")
+
+    missing_numbers = pr_numbers - local_pr_numbers
 
     print(f"\n=== 連番欠損分析 ===")
-    print(f"期待される総PR数: {len(expected_range):,}件 (1-{latest_pr_number})")
-    print(f"既知のIssue数: {len(known_issue_numbers):,}件")
+    print(f"期待される総PR数: {len(pr_numbers):,}件 (1-{latest_pr_number})")
+    print(f"Issue数: {len(issue_numbers):,}件")
+    print(f"削除済み番号数: {len(deleted_numbers):,}件")
     print(f"実際のローカルPR数: {len(local_pr_numbers):,}件")
     print(f"欠損PR数: {len(missing_numbers):,}件")
-    effective_pr_range = len(expected_range) - len(known_issue_numbers)
-    print(f"カバレッジ: {(len(local_pr_numbers) / effective_pr_range * 100):.1f}%")
+    if pr_numbers:
+        covered = len(pr_numbers & local_pr_numbers)
+        print(f"カバレッジ: {(covered / len(pr_numbers) * 100):.1f}%")
+
+    if verbose:
+        print(f"\nIssue番号: {', '.join(format_ranges(number_space.ranges('issue')))}")
+        print(
+            f"削除済み番号: {', '.join(format_ranges(number_space.ranges('deleted')))}"
+        )
 
     if missing_numbers:
         missing_sorted = sorted(missing_numbers)
-
-        ranges = []
-        start = missing_sorted[0]
-        end = start
-
-        for num in missing_sorted[1:]:
-            if num == end + 1:
-                end = num
-            else:
-                if start == end:
-                    ranges.append(f"#{start}")
-                else:
-                    ranges.append(f"#{start}-#{end}")
-                start = end = num
-
-        if start == end:
-            ranges.append(f"#{start}")
-        else:
-            ranges.append(f"#{start}-#{end}")
+        ranges = format_ranges(compress_ranges(missing_sorted))
 
         print(f"\n欠損PR範囲（最初の20範囲）:")
         for i, range_str in enumerate(ranges[:20]):
@@ -5,26 +5,24 @@
 
 import json
 import os
-from pathlib import Path
 from collections import defaultdict
 
+from src.utils.pr_store import open_pr_store
+
 
 def count_pr_states(pr_dir):
     """PRディレクトリの状態別カウントを取得"""
     states = defaultdict(int)
     total = 0
 
-    for file_path in Path(pr_dir).glob("*.json"):
+    for data in open_pr_store(pr_dir).iter_pr_data():
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
             state = data.get("basic_info", {}).get("state", "unknown")
             states[state] += 1
             total += 1
 
         except Exception as e:
-            print(f"エラー: {file_path} - {e}")
+            print(f"エラー: PR #{data.get('basic_info', {}).get('number')} - {e}")
 
     return dict(states), total
 
@@ -10,15 +10,21 @@ import os
 import re
 from pathlib import Path
 
+from ..utils.blob_store import BlobStore, resolve_patch
 from ..utils.github_api import load_config
 
 
 class SectionAnalyzer:
     """PRのセクション分析を行うクラス"""
 
-    def __init__(self, config=None):
-        """初期化"""
+    def __init__(self, config=None, blob_store=None):
+        """初期化
+
+        blob_store は patch_ref で参照されるパッチ本文の読み込み先で、
+        省略時は設定ファイルの data.base_dir のブロブストアを使用します。
+        """
         self.config = config or load_config()
+        self.blob_store = blob_store or BlobStore(self.config["data"]["base_dir"])
 
     def extract_sections_from_patch(self, patch):
         """パッチからセクション（見出し）を抽出する"""
@@ -48,7 +54,7 @@ class SectionAnalyzer:
             if not filename.lower().endswith((".md", ".markdown")):
                 continue
 
-            patch = file_info.get("patch")
+            patch = resolve_patch(file_info, self.blob_store)
             if not patch:
                 continue
 
@@ -14,6 +14,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.analyzers.section_analyzer import SectionAnalyzer
+from src.utils.blob_store import BlobStore
+from src.utils.pr_store import open_pr_store
 
 
 def parse_args():
@@ -42,16 +44,10 @@ def load_pr_data(input_path):
             else:
                 pr_data = [data]
     elif input_path.is_dir():
-        json_files = list(input_path.glob("*.json"))
-        print(f"{len(json_files)}件のPRデータファイルを見つけました")
-
-        for json_file in json_files:
-            try:
-                with open(json_file, encoding="utf-8") as f:
-                    pr = json.load(f)
-                    pr_data.append(pr)
-            except Exception as e:
-                print(f"{json_file}の読み込み中にエラーが発生しました: {e}")
+        with open_pr_store(input_path) as store:
+            print(f"{len(store.numbers())}件のPRデータファイルを見つけました")
+
+            pr_data.extend(store.iter_pr_data())
     else:
         print(f"指定されたパスが存在しません: {input_path}")
 
@@ -69,7 +65,9 @@ def main():
 
     print(f"{len(pr_data)}件のPRデータを読み込みました")
 
-    analyzer = SectionAnalyzer()
+    input_path = Path(args.input)
+    blob_store = BlobStore(input_path) if input_path.is_dir() else None
+    analyzer = SectionAnalyzer(blob_store=blob_store)
     results = analyzer.analyze_prs(pr_data)
 
     analyzer.generate_section_report(results, args.output)
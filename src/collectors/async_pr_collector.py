@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+非同期PRデータ収集モジュール
+
+asyncioを使用して複数のPRを並行して収集します。
+collectors.max_workers 件までのPRを同時に処理し、保存は入力順に行います。
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from .pr_collector import PRCollector
+
+
+class AsyncPRCollector(PRCollector):
+    """asyncioで複数のPRを並行して収集するクラス
+
+    HTTPリクエストは PRCollector と同じ共有セッション経由でスレッド上から実行されるため、
+    再試行や、全タスクで共有されるRate Limitの管理はそのまま適用されます。
+    """
+
+    def _run(self, coro):
+        """コルーチンを専用のスレッドプール上で実行する"""
+
+        async def runner():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(
+                ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="pr-collect"
+                )
+            )
+            return await coro
+
+        return asyncio.run(runner())
+
+    async def _process_in_order(
+        self, items, worker, handle_result, remaining=None, handle_error=None
+    ):
+        """itemsを並行して処理し、結果を入力順に handle_result へ渡す
+
+        同時に実行するのは最大 max_workers 件、完了待ちの結果は
+        その2倍までに制限されます。handle_result が False を返すと処理を打ち切ります。
+        remaining には最大数までの残り件数を返す関数を指定でき、処理中の件数が
+        残り件数に達している間は、取得しても使われない item の処理を開始しません。
+        worker で例外が発生した item はエラーを表示して handle_error に渡し、
+        残りの item の処理を続けます。
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        window = self.max_workers * 2
+
+        async def run(item):
+            async with semaphore:
+                return await asyncio.to_thread(worker, item)
+
+        pending = deque()
+        items = iter(items)
+
+        def schedule():
+            while len(pending) < window and (
+                remaining is None or len(pending) < remaining()
+            ):
+                item = next(items, None)
+                if item is None:
+                    return
+                pending.append((item, asyncio.create_task(run(item))))
+
+        try:
+            schedule()
+            while pending:
+                item, task = pending.popleft()
+                try:
+                    result = await task
+                except Exception as e:
+                    pr_number = item["number"] if isinstance(item, dict) else item
+                    print(f"PR #{pr_number} の処理中にエラーが発生しました: {e}")
+                    if handle_error:
+                        handle_error(item, e)
+                else:
+                    if handle_result(item, result) is False:
+                        return
+
+                schedule()
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _iter_pr_pages(self, **kwargs):
+        """PR一覧のページを非同期に取得する"""
+        pages = self.iter_pr_list(**kwargs)
+        while True:
+            prs = await asyncio.to_thread(next, pages, None)
+            if not prs:
+                return
+            yield prs
+
+    async def _collect_numbers(
+        self, pr_numbers, output_dir=None, max_count=None, on_saved=None
+    ):
+        """指定されたPR番号を並行して収集し、番号順に保存する
+
+        on_saved を指定すると、PR番号ごとの処理が終わるたびに呼び出します。
+        """
+        collected = {"count": 0}
+
+        def handle_result(pr_number, pr_data):
+            if pr_data:
+                self.save_pr_data(pr_data, output_dir)
+                collected["count"] += 1
+            if on_saved:
+                on_saved(pr_number)
+
+            if max_count and collected["count"] >= max_count:
+                print(f"指定された最大数 {max_count} に達したため収集を終了します")
+                return False
+            return True
+
+        await self._process_in_order(
+            pr_numbers,
+            self.collect_pr_data,
+            handle_result,
+            remaining=(lambda: max_count - collected["count"]) if max_count else None,
+        )
+        return collected["count"]
+
+    async def collect_prs_by_update_time_async(
+        self, output_dir=None, max_count=None, since=None
+    ):
+        """更新時間順にPRを並行して収集する"""
+        store = self.get_store(output_dir)
+        collected_count = 0
+
+        async for prs in self._iter_pr_pages(sort="updated", direction="desc"):
+            pr_numbers = []
+            for pr in prs:
+                pr_number = pr["number"]
+
+                if store.exists(pr_number):
+                    print(f"PR #{pr_number} は既に収集済みのためスキップします")
+                    continue
+
+                if since and pr["updated_at"] < since:
+                    print(
+                        f"PR #{pr_number} は {since} より前に更新されているためスキップします"
+                    )
+                    continue
+
+                pr_numbers.append(pr_number)
+
+            remaining = max_count - collected_count if max_count else None
+            collected_count += await self._collect_numbers(
+                pr_numbers, output_dir, remaining
+            )
+
+            if max_count and collected_count >= max_count:
+                break
+
+        return collected_count
+
+    async def collect_prs_incrementally_async(self, output_dir=None, max_count=None):
+        """ウォーターマーク以降に更新されたPRを並行して差分同期する"""
+        watermark, candidates, newest_updated_at = await asyncio.to_thread(
+            self.get_incremental_candidates, output_dir
+        )
+        print(f"ウォーターマーク: {watermark or '未記録'}")
+        print(f"同期対象PR数: {len(candidates)}件")
+
+        state = {"count": 0, "completed": True}
+
+        def handle_result(pr, pr_data):
+            if pr_data:
+                self.save_pr_data(pr_data, output_dir)
+                state["count"] += 1
+
+            # 同期に失敗したPRがある場合は、次回に再試行するためウォーターマークを進めない
+            if state["completed"]:
+                self.save_update_watermark(pr["updated_at"], output_dir)
+
+            if max_count and state["count"] >= max_count:
+                print(f"指定された最大数 {max_count} に達したため収集を終了します")
+                state["completed"] = False
+                return False
+            return True
+
+        def handle_error(pr, error):
+            state["completed"] = False
+
+        await self._process_in_order(
+            candidates,
+            lambda pr: self.refresh_pr_data(pr["number"], output_dir),
+            handle_result,
+            remaining=(lambda: max_count - state["count"]) if max_count else None,
+            handle_error=handle_error,
+        )
+
+        if state["completed"] and newest_updated_at:
+            self.save_update_watermark(newest_updated_at, output_dir)
+
+        return state["count"]
+
+    async def collect_prs_sequentially_async(
+        self, start_number=1, end_number=None, output_dir=None, resume=False
+    ):
+        """連番でPRを並行して収集する"""
+        checkpoint = self.get_checkpoint("sequential", output_dir)
+        if resume:
+            start_number, end_number = self.resume_sequential_range(
+                start_number, end_number, checkpoint
+            )
+
+        if not end_number:
+            end_number = await asyncio.to_thread(self.get_latest_pr_number)
+            if not end_number:
+                return 0
+            print(f"終了PR番号として最新PR番号 #{end_number} を使用します")
+
+        def save_checkpoint(pr_number):
+            checkpoint.save(next_number=pr_number + 1, end_number=end_number)
+
+        collected_count = await self._collect_numbers(
+            range(start_number, end_number + 1), output_dir, on_saved=save_checkpoint
+        )
+        checkpoint.clear()
+        return collected_count
+
+    async def collect_uncollected_prs_async(self, output_dir=None, max_count=None):
+        """未収集のPRを並行して収集する"""
+        missing_numbers = await asyncio.to_thread(
+            self.get_missing_pr_numbers, output_dir
+        )
+
+        if not missing_numbers:
+            print("未収集のPRはありません")
+            return 0
+
+        print(f"未収集PR数: {len(missing_numbers):,}件")
+
+        return await self._collect_numbers(missing_numbers, output_dir, max_count)
+
+    async def collect_prs_with_state_check_async(
+        self, output_dir=None, max_count=None, check_recent_days=30
+    ):
+        """状態変更をチェックしながらPRを並行して収集する"""
+        counts = {"collected": 0, "updated": 0}
+
+        cutoff_date = (datetime.now() - timedelta(days=check_recent_days)).isoformat()
+
+        print("=== PR状態更新チェック開始 ===")
+        print(f"チェック対象期間: 最近{check_recent_days}日間")
+        print(f"カットオフ日時: {cutoff_date}")
+
+        def refresh(pr):
+            pr_number = pr["number"]
+            if not self.needs_state_update(pr_number, output_dir, pr):
+                print(f"PR #{pr_number} は最新状態です")
+                return None
+
+            print(f"PR #{pr_number} の状態更新を実行中...")
+            local_summary = self.get_local_summary(pr_number, output_dir)
+            old_state = local_summary["state"] if local_summary else None
+            return old_state, self.refresh_pr_data(pr_number, output_dir)
+
+        def handle_result(pr, result):
+            if result is None:
+                return True
+
+            old_state, pr_data = result
+            if pr_data:
+                self.save_pr_data(pr_data, output_dir)
+
+                new_state = pr_data.get("basic_info", {}).get("state")
+                if old_state is not None:
+                    counts["updated"] += 1
+                    if old_state != new_state:
+                        print(f"  状態変更: {old_state} → {new_state}")
+                else:
+                    counts["collected"] += 1
+                    print(f"  新規収集: {new_state}")
+
+            if max_count and (counts["collected"] + counts["updated"]) >= max_count:
+                print(f"指定された最大数 {max_count} に達したため終了")
+                return False
+            return True
+
+        async for prs in self._iter_pr_pages(sort="updated", direction="desc"):
+            recent_prs = [pr for pr in prs if pr["updated_at"] >= cutoff_date]
+
+            await self._process_in_order(
+                recent_prs,
+                refresh,
+                handle_result,
+                remaining=(
+                    (lambda: max_count - counts["collected"] - counts["updated"])
+                    if max_count
+                    else None
+                ),
+            )
+
+            if max_count and (counts["collected"] + counts["updated"]) >= max_count:
+                break
+
+            if len(recent_prs) < len(prs):
+                print(f"古いPR（{cutoff_date}以前）に到達したため終了")
+                break
+
+        print("=== PR状態更新チェック完了 ===")
+        print(f"新規収集: {counts['collected']}件")
+        print(f"状態更新: {counts['updated']}件")
+
+        return counts["collected"], counts["updated"]
+
+    def collect_prs_by_update_time(self, output_dir=None, max_count=None, since=None):
+        """更新時間順にPRを収集する"""
+        return self._run(
+            self.collect_prs_by_update_time_async(output_dir, max_count, since)
+        )
+
+    def collect_prs_incrementally(self, output_dir=None, max_count=None):
+        """ウォーターマーク以降に更新されたPRを差分同期する"""
+        return self._run(self.collect_prs_incrementally_async(output_dir, max_count))
+
+    def collect_prs_sequentially(
+        self, start_number=1, end_number=None, output_dir=None, resume=False
+    ):
+        """連番でPRを収集する"""
+        return self._run(
+            self.collect_prs_sequentially_async(
+                start_number, end_number, output_dir, resume
+            )
+        )
+
+    def collect_uncollected_prs(self, output_dir=None, max_count=None):
+        """未収集のPRを優先的に収集する"""
+        return self._run(self.collect_uncollected_prs_async(output_dir, max_count))
+
+    def collect_prs_with_state_check(
+        self, output_dir=None, max_count=None, check_recent_days=30
+    ):
+        """状態変更をチェックしながらPRを収集する"""
+        return self._run(
+            self.collect_prs_with_state_check_async(
+                output_dir, max_count, check_recent_days
+            )
+        )
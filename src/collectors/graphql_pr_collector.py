@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+GraphQL APIによるPRデータ一括収集モジュール
+
+GitHubのGraphQL APIを使用して、1回のリクエストで複数のPRの基本情報・ラベル・
+コメント・レビューコメント・変更ファイル・コミットを取得し、
+PRCollector と同じ {number}.json 形式で保存します。
+"""
+
+from datetime import datetime
+
+from ..utils.github_api import make_graphql_request
+from .pr_collector import PRCollector
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    pullRequests(
+      first: $first
+      after: $after
+      orderBy: {field: UPDATED_AT, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        state
+        createdAt
+        updatedAt
+        closedAt
+        mergedAt
+        url
+        headRefOid
+        baseRefName
+        baseRefOid
+        author { ...actor }
+        labels(first: 100) {
+          nodes { id name color description }
+        }
+        comments(first: 100) {
+          totalCount
+          nodes {
+            databaseId
+            body
+            createdAt
+            updatedAt
+            url
+            author { ...actor }
+          }
+        }
+        reviewThreads(first: 50) {
+          totalCount
+          nodes {
+            comments(first: 50) {
+              totalCount
+              nodes {
+                databaseId
+                body
+                path
+                diffHunk
+                line
+                originalLine
+                pullRequestReview { databaseId }
+                createdAt
+                updatedAt
+                url
+                replyTo { databaseId }
+                author { ...actor }
+              }
+            }
+          }
+        }
+        files(first: 100) {
+          totalCount
+          nodes { path additions deletions changeType }
+        }
+        commits(first: 100) {
+          totalCount
+          nodes {
+            commit {
+              oid
+              message
+              url
+              author { name email date user { login } }
+              committer { name email date }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+
+fragment actor on Actor {
+  login
+  url
+  ... on User { databaseId }
+  ... on Bot { databaseId }
+}
+"""
+
+# GraphQLのchangeTypeとREST APIのfiles[].statusの対応
+FILE_STATUS_MAP = {
+    "ADDED": "added",
+    "DELETED": "removed",
+    "MODIFIED": "modified",
+    "RENAMED": "renamed",
+    "COPIED": "copied",
+    "CHANGED": "changed",
+}
+
+
+# 削除されたユーザー（GraphQLでは author が null）をREST APIと同じ形式で表す
+GHOST_USER = {"login": "ghost", "id": None, "html_url": None}
+
+
+def _convert_user(author):
+    """GraphQLのActorをREST APIのuser形式に変換する
+
+    削除されたユーザーの場合も、REST APIと同様に ghost のuserを返します。
+    """
+    if not author:
+        return dict(GHOST_USER)
+    return {
+        "login": author.get("login"),
+        "id": author.get("databaseId"),
+        "html_url": author.get("url"),
+    }
+
+
+class GraphQLPRCollector(PRCollector):
+    """GraphQL APIでPRデータを一括収集するクラス
+
+    ネストした一覧（コメント等）が1回のクエリに収まらないPRについては、
+    その一覧のみREST APIで全件を取得し直します。GraphQL APIは変更ファイルの
+    パッチを返さないため、パッチが必要な場合は fetch_patches を有効にします。
+    """
+
+    def __init__(self, config=None, batch_size=25, fetch_patches=False):
+        """初期化"""
+        super().__init__(config)
+        self.graphql_url = f"{self.api_base_url}/graphql"
+        self.batch_size = batch_size
+        self.fetch_patches = fetch_patches
+
+    def iter_pr_nodes(self, after=None):
+        """PRを更新日時の新しい順にバッチ単位で取得するジェネレータ
+
+        バッチごとに (PRノードのリスト, 次のバッチのカーソル) を返します。
+        after にカーソルを指定すると、その続きから取得します。
+        """
+        variables = {
+            "owner": self.repo_owner,
+            "name": self.repo_name,
+            "first": self.batch_size,
+            "after": after,
+        }
+
+        while True:
+            data = make_graphql_request(
+                self.graphql_url, PULL_REQUESTS_QUERY, variables
+            )
+
+            rate_limit = data.get("rateLimit") or {}
+            if rate_limit:
+                print(
+                    f"GraphQL API制限: コスト {rate_limit.get('cost')}, 残り {rate_limit.get('remaining')}"
+                )
+
+            pull_requests = data["repository"]["pullRequests"]
+            page_info = pull_requests["pageInfo"]
+            yield pull_requests["nodes"], page_info["endCursor"]
+
+            if not page_info["hasNextPage"]:
+                break
+            variables["after"] = page_info["endCursor"]
+
+    def _convert_comments(self, node):
+        """コメントをREST API形式に変換する"""
+        connection = node["comments"]
+        if connection["totalCount"] > len(connection["nodes"]):
+            return self.get_pr_comments(node["number"])
+
+        return [
+            {
+                "id": comment.get("databaseId"),
+                "body": comment.get("body"),
+                "user": _convert_user(comment.get("author")),
+                "created_at": comment.get("createdAt"),
+                "updated_at": comment.get("updatedAt"),
+                "html_url": comment.get("url"),
+            }
+            for comment in connection["nodes"]
+        ]
+
+    def _convert_review_comments(self, node):
+        """レビューコメントをREST API形式に変換する"""
+        threads = node["reviewThreads"]
+        truncated = threads["totalCount"] > len(threads["nodes"]) or any(
+            thread["comments"]["totalCount"] > len(thread["comments"]["nodes"])
+            for thread in threads["nodes"]
+        )
+        if truncated:
+            return self.get_pr_review_comments(node["number"])
+
+        review_comments = []
+        for thread in threads["nodes"]:
+            for comment in thread["comments"]["nodes"]:
+                review = comment.get("pullRequestReview") or {}
+                review_comment = {
+                    "id": comment.get("databaseId"),
+                    "body": comment.get("body"),
+                    "path": comment.get("path"),
+                    "diff_hunk": comment.get("diffHunk"),
+                    "line": comment.get("line"),
+                    "original_line": comment.get("originalLine"),
+                    "pull_request_review_id": review.get("databaseId"),
+                    "user": _convert_user(comment.get("author")),
+                    "created_at": comment.get("createdAt"),
+                    "updated_at": comment.get("updatedAt"),
+                    "html_url": comment.get("url"),
+                }
+                # REST APIと同様に、返信の場合のみ in_reply_to_id を含める
+                if comment.get("replyTo"):
+                    review_comment["in_reply_to_id"] = comment["replyTo"]["databaseId"]
+                review_comments.append(review_comment)
+
+        review_comments.sort(key=lambda comment: comment["created_at"] or "")
+        return review_comments
+
+    def _convert_files(self, node):
+        """変更ファイルをREST API形式に変換する"""
+        connection = node["files"]
+        if self.fetch_patches or connection["totalCount"] > len(connection["nodes"]):
+            return self.get_files_fetcher()(node["number"])
+
+        return [
+            {
+                "filename": file_info["path"],
+                "status": FILE_STATUS_MAP.get(
+                    file_info["changeType"], file_info["changeType"].lower()
+                ),
+                "additions": file_info["additions"],
+                "deletions": file_info["deletions"],
+                "changes": file_info["additions"] + file_info["deletions"],
+            }
+            for file_info in connection["nodes"]
+        ]
+
+    def _convert_commits(self, node):
+        """コミットをREST API形式に変換する"""
+        connection = node["commits"]
+        if connection["totalCount"] > len(connection["nodes"]):
+            return self.get_pr_commits(node["number"])
+
+        commits = []
+        for item in connection["nodes"]:
+            author = dict(item["commit"]["author"])
+            # コミットの作成者に対応するGitHubユーザー（REST APIの author）
+            user = author.pop("user", None)
+            commits.append(
+                {
+                    "sha": item["commit"]["oid"],
+                    "html_url": item["commit"]["url"],
+                    "author": {"login": user["login"]} if user else None,
+                    "commit": {
+                        "message": item["commit"]["message"],
+                        "author": author,
+                        "committer": item["commit"]["committer"],
+                    },
+                }
+            )
+        return commits
+
+    def convert_pr_node(self, node):
+        """GraphQLのPRノードを collect_pr_data と同じ形式に変換する"""
+        basic_info = {
+            "number": node["number"],
+            "title": node["title"],
+            "state": "open" if node["state"] == "OPEN" else "closed",
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "closed_at": node["closedAt"],
+            "merged_at": node["mergedAt"],
+            "html_url": node["url"],
+            "user": _convert_user(node.get("author")),
+            "head_sha": node.get("headRefOid"),
+            "base_ref": node.get("baseRefName"),
+            "base_sha": node.get("baseRefOid"),
+        }
+
+        labels = [
+            {
+                "node_id": label["id"],
+                "name": label["name"],
+                "color": label["color"],
+                "description": label.get("description"),
+            }
+            for label in node["labels"]["nodes"]
+        ]
+
+        mirror_resources = None
+        if self.files_source == "git_mirror":
+            mirror_resources = self.get_mirror_sub_resources(basic_info)
+        if mirror_resources is None:
+            mirror_resources = {
+                "files": self._convert_files(node),
+                "commits": self._convert_commits(node),
+            }
+
+        return {
+            "basic_info": basic_info,
+            "labels": labels,
+            "comments": self._convert_comments(node),
+            "review_comments": self._convert_review_comments(node),
+            "files": mirror_resources["files"],
+            "commits": mirror_resources["commits"],
+            "collected_at": datetime.now().isoformat(),
+        }
+
+    def collect_prs_via_graphql(
+        self, output_dir=None, max_count=None, since=None, resume=False
+    ):
+        """GraphQL APIで更新日時の新しい順にPRを一括収集する
+
+        バッチを保存し終えるごとに次のバッチのカーソルをチェックポイントに記録します。
+        resume が True の場合は、記録されたカーソルの続きから収集を再開します。
+        """
+        checkpoint = self.get_checkpoint("graphql", output_dir)
+        after = None
+        if resume:
+            state = checkpoint.load()
+            if state:
+                after = state["cursor"]
+                print(f"チェックポイントから再開します（カーソル: {after}）")
+            else:
+                print("チェックポイントがないため最初から収集します")
+
+        collected_count = 0
+
+        for nodes, end_cursor in self.iter_pr_nodes(after):
+            for node in nodes:
+                if since and node["updatedAt"] < since:
+                    print(f"{since} より前に更新されたPRに到達したため終了します")
+                    checkpoint.clear()
+                    return collected_count
+
+                pr_data = self.convert_pr_node(node)
+                self.save_pr_data(pr_data, output_dir)
+                collected_count += 1
+
+                if max_count and collected_count >= max_count:
+                    print(f"指定された最大数 {max_count} に達したため収集を終了します")
+                    return collected_count
+
+            checkpoint.save(cursor=end_cursor)
+
+        checkpoint.clear()
+        return collected_count
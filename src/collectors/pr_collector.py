@@ -7,16 +7,86 @@ GitHubのAPIを使用してPRデータを収集し、ファイルに保存しま
 
 import json
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from ..utils.checkpoint import CollectionCheckpoint
+from ..utils.diff_parser import parse_unified_diff
+from ..utils.git_mirror import GitMirror
 from ..utils.github_api import (
+    get_headers,
     load_config,
     make_github_api_request,
-    check_rate_limit,
-    wait_for_rate_limit_reset,
+    send_github_api_request,
+    iter_github_api_pages,
+    fetch_all_pages,
 )
+from ..utils.number_space import NumberSpaceMap
+from ..utils.pr_manifest import summarize_pr_data, write_file_atomically
+from ..utils.pr_projection import get_projection, project_pr_data
+from ..utils.pr_store import open_pr_store
+
+# PRの差分全体を unified diff 形式で取得するメディアタイプ
+DIFF_MEDIA_TYPE = "application/vnd.github.diff"
+
+# サブリソースと、PR詳細APIでその件数を表す項目
+SUB_RESOURCE_COUNTERS = {
+    "comments": "comments",
+    "review_comments": "review_comments",
+    "files": "changed_files",
+    "commits": "commits",
+}
+
+# 一覧APIで取得できる件数の上限（PR詳細APIの件数はこれを超える場合がある）
+SUB_RESOURCE_API_LIMITS = {
+    "files": 3000,
+    "commits": 250,
+}
+
+# リポジトリ全体のコメント一覧API（PRデータの項目, エンドポイント, PRのURLを持つ項目）
+REPO_COMMENT_SOURCES = (
+    ("comments", "issues/comments", "issue_url"),
+    ("review_comments", "pulls/comments", "pull_request_url"),
+)
+
+
+def classify_changed_sub_resources(pr_details, stored_pr_data):
+    """PR詳細APIの値と保存済みのPRデータを比較し、取得し直すサブリソースを返す
+
+    ヘッドのコミットが変わった場合はファイルとコミット、件数が変わった場合は
+    そのサブリソースを対象にします。ラベルや状態のみの変更では空の集合になります。
+    ヘッドのコミットが同じで、保存済みの件数が一覧APIの上限に達しているサブリソースは、
+    取得し直しても件数が一致しないため件数を比較しません。
+    """
+    changed = set()
+
+    head_sha = (pr_details.get("head") or {}).get("sha")
+    stored_head_sha = stored_pr_data.get("basic_info", {}).get("head_sha")
+    head_changed = not head_sha or head_sha != stored_head_sha
+    if head_changed:
+        changed.update(("files", "commits"))
+
+    for key, counter in SUB_RESOURCE_COUNTERS.items():
+        stored_count = len(stored_pr_data.get(key) or [])
+        limit = SUB_RESOURCE_API_LIMITS.get(key)
+        if not head_changed and limit and stored_count >= limit:
+            continue
+
+        count = pr_details.get(counter)
+        if count is None or count != stored_count:
+            changed.add(key)
+
+    return changed
+
+
+def merge_comments(existing, updates):
+    """保存済みのコメントに更新・追加されたコメントをIDで統合し、作成日時順に並べる"""
+    merged = {comment.get("id"): comment for comment in existing}
+    for comment in updates:
+        merged[comment.get("id")] = comment
+    return sorted(merged.values(), key=lambda comment: comment.get("created_at") or "")
 
 
 class PRCollector:
@@ -28,6 +98,7 @@ class PRCollector:
         self.github_config = self.config["github"]
         self.data_config = self.config["data"]
         self.api_config = self.config.get("api", {})
+        self.collectors_config = self.config.get("collectors", {})
 
         self.repo_owner = self.github_config["repo_owner"]
         self.repo_name = self.github_config["repo_name"]
@@ -36,6 +107,64 @@ class PRCollector:
         self.base_dir = Path(self.data_config["base_dir"])
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
+        self.max_workers = self.collectors_config.get("max_workers", 10)
+        self.concurrent_fetch = self.collectors_config.get("concurrent_fetch", False)
+        self.projection = get_projection(self.collectors_config)
+        self.files_source = self.collectors_config.get("files_source", "api")
+        self._git_mirror = None
+        self._git_mirror_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+
+    def _get_executor(self):
+        """サブリソース取得用のワーカープールを取得する（max_workersで上限を設ける）"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="pr-fetch",
+                    )
+        return self._executor
+
+    def close(self):
+        """ワーカープールを停止し、ローカルインデックスを書き戻す"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+        with self._stores_lock:
+            for store in self._stores.values():
+                store.close()
+
+    def get_store(self, output_dir=None):
+        """保存先ディレクトリのストアを取得する"""
+        save_dir = Path(output_dir) if output_dir else self.base_dir
+        key = str(save_dir.resolve())
+
+        with self._stores_lock:
+            if key not in self._stores:
+                self._stores[key] = open_pr_store(save_dir, self.config)
+            return self._stores[key]
+
+    def get_git_mirror(self):
+        """政策リポジトリのローカルミラーを取得する（初回のみ全PRのヘッドを取得する）"""
+        if self._git_mirror is None:
+            with self._git_mirror_lock:
+                if self._git_mirror is None:
+                    git_mirror = GitMirror.from_config(self.config)
+                    git_mirror.fetch()
+                    self._git_mirror = git_mirror
+        return self._git_mirror
+
+    def get_checkpoint(self, mode, output_dir=None):
+        """保存先ディレクトリの収集モードごとのチェックポイントを取得する"""
+        save_dir = Path(output_dir) if output_dir else self.base_dir
+        return CollectionCheckpoint(save_dir, mode)
+
     def get_pr_list(
         self, state="all", sort="updated", direction="desc", per_page=100, page=1
     ):
@@ -51,6 +180,13 @@ class PRCollector:
 
         return make_github_api_request(url, params)
 
+    def iter_pr_list(self, state="all", sort="updated", direction="desc", per_page=100):
+        """PRの一覧をページ単位で順に取得するジェネレータ"""
+        url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls"
+        params = {"state": state, "sort": sort, "direction": direction}
+
+        return iter_github_api_pages(url, params, per_page=per_page)
+
     def get_pr_details(self, pr_number):
         """PRの詳細情報を取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}"
@@ -66,32 +202,140 @@ class PRCollector:
     def get_pr_comments(self, pr_number):
         """PRのコメントを取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/issues/{pr_number}/comments"
-        return make_github_api_request(url)
+        return fetch_all_pages(url)
 
     def get_pr_review_comments(self, pr_number):
         """PRのレビューコメントを取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}/comments"
-        return make_github_api_request(url)
+        return fetch_all_pages(url)
 
     def get_pr_files(self, pr_number):
         """PRで変更されたファイル一覧を取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}/files"
-        return make_github_api_request(url)
+        return fetch_all_pages(url)
+
+    def get_pr_diff(self, pr_number):
+        """PRの差分全体を unified diff 形式の文字列として1回のリクエストで取得する"""
+        url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}"
+        headers = {**get_headers(), "Accept": DIFF_MEDIA_TYPE}
+        response = send_github_api_request(url, headers=headers)
+        return response.content.decode("utf-8", errors="replace")
+
+    def get_pr_files_from_diff(self, pr_number):
+        """PRの差分を1回のリクエストで取得し、変更ファイル一覧と同じ形式に変換する
+
+        差分が大きすぎてGitHubが返さない場合は、ファイル一覧APIで取得します。
+        """
+        try:
+            return parse_unified_diff(self.get_pr_diff(pr_number))
+        except Exception as e:
+            if hasattr(e, "response") and e.response.status_code in (406, 422):
+                print(
+                    f"PR #{pr_number} の差分が大きすぎるためファイル一覧APIで取得します"
+                )
+                return self.get_pr_files(pr_number)
+            raise
+
+    def get_files_fetcher(self):
+        """collectors.files_source に応じた変更ファイル一覧の取得関数を返す"""
+        if self.files_source == "diff":
+            return self.get_pr_files_from_diff
+        return self.get_pr_files
 
     def get_pr_commits(self, pr_number):
         """PRのコミット一覧を取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls/{pr_number}/commits"
-        return make_github_api_request(url)
+        return fetch_all_pages(url)
+
+    def get_mirror_sub_resources(self, basic_info):
+        """ローカルミラーからPRの変更ファイルとコミットを計算する
+
+        オープンなPRは現在のベースブランチ、クローズ済みのPRは記録された
+        ベースのコミットと比較します。ミラーにコミットがない場合は
+        そのPRのヘッドのみを取得し直し、それでも計算できない場合はNoneを返します
+        （収集時はAPIでの取得に切り替わります）。
+        """
+        pr_number = basic_info["number"]
+        head_sha = basic_info.get("head_sha")
+        base = basic_info.get("base_sha")
+        if basic_info.get("state") == "open" and basic_info.get("base_ref"):
+            base = f"refs/heads/{basic_info['base_ref']}"
+        if not head_sha or not base:
+            return None
 
-    def collect_pr_data(self, pr_number):
-        """PRの全データを収集する"""
-        print(f"PR #{pr_number} のデータを収集中...")
+        git_mirror = self.get_git_mirror()
+        try:
+            if not (git_mirror.resolve(head_sha) and git_mirror.resolve(base)):
+                git_mirror.fetch_pr_head(pr_number)
+                if not (git_mirror.resolve(head_sha) and git_mirror.resolve(base)):
+                    print(f"PR #{pr_number} のコミットがミラーにありません")
+                    return None
+
+            files = git_mirror.diff_files(base, head_sha)
+            if files is None:
+                return None
 
-        pr_details = self.get_pr_details(pr_number)
-        if not pr_details:
+            html_base_url = basic_info.get("html_url", "").rsplit("/pull/", 1)[0]
+            commits = git_mirror.log_commits(base, head_sha, html_base_url or None)
+        except RuntimeError as e:
+            print(f"PR #{pr_number} のミラーからの計算に失敗しました: {e}")
             return None
 
-        basic_info = {
+        return {"files": files, "commits": commits}
+
+    def fetch_pr_sub_resources(
+        self, pr_number, concurrent=None, basic_info=None, keys=None
+    ):
+        """PRのコメント・レビューコメント・ファイル・コミットを取得する
+
+        keys を指定した場合は、そのサブリソースのみを取得します。
+
+        concurrent が有効な場合は4つのエンドポイントを共有ワーカープールで
+        並行して取得するため、所要時間は最も遅いエンドポイント程度になります。
+        collectors.files_source が git_mirror の場合、ファイルとコミットは
+        basic_info のコミットSHAを使ってローカルミラーから計算します。
+        diff の場合、ファイルはPRの差分全体を1回のリクエストで取得して変換します。
+        """
+        if concurrent is None:
+            concurrent = self.concurrent_fetch
+
+        fetchers = {
+            "comments": self.get_pr_comments,
+            "review_comments": self.get_pr_review_comments,
+            "files": self.get_files_fetcher(),
+            "commits": self.get_pr_commits,
+        }
+        if keys is not None:
+            fetchers = {key: fetch for key, fetch in fetchers.items() if key in keys}
+
+        local_resources = {}
+        if (
+            self.files_source == "git_mirror"
+            and basic_info
+            and ("files" in fetchers or "commits" in fetchers)
+        ):
+            local_resources = self.get_mirror_sub_resources(basic_info) or {}
+            local_resources = {
+                key: items for key, items in local_resources.items() if key in fetchers
+            }
+        fetchers = {
+            key: fetch for key, fetch in fetchers.items() if key not in local_resources
+        }
+
+        if not concurrent:
+            fetched = {key: fetch(pr_number) for key, fetch in fetchers.items()}
+            return {**local_resources, **fetched}
+
+        executor = self._get_executor()
+        futures = {
+            key: executor.submit(fetch, pr_number) for key, fetch in fetchers.items()
+        }
+        fetched = {key: future.result() for key, future in futures.items()}
+        return {**local_resources, **fetched}
+
+    def build_basic_info(self, pr_details):
+        """PR詳細APIのレスポンス（またはWebhookのPR）から basic_info を作成する"""
+        return {
             "number": pr_details["number"],
             "title": pr_details["title"],
             "state": pr_details["state"],
@@ -105,62 +349,86 @@ class PRCollector:
                 "id": pr_details["user"]["id"],
                 "html_url": pr_details["user"]["html_url"],
             },
+            "head_sha": (pr_details.get("head") or {}).get("sha"),
+            "base_ref": (pr_details.get("base") or {}).get("ref"),
+            "base_sha": (pr_details.get("base") or {}).get("sha"),
         }
 
-        labels = pr_details.get("labels", [])
+    def collect_pr_data(self, pr_number, concurrent=None, stored_pr_data=None):
+        """PRの全データを収集する
+
+        stored_pr_data に保存済みのPRデータを渡した場合は、PR詳細APIの
+        ヘッドのコミットと件数を比較し、変化したサブリソースのみを取得し直します
+        （変化のないサブリソースは保存済みのものを使用します）。
+        """
+        print(f"PR #{pr_number} のデータを収集中...")
 
-        comments = self.get_pr_comments(pr_number)
-        review_comments = self.get_pr_review_comments(pr_number)
+        pr_details = self.get_pr_details(pr_number)
+        if not pr_details:
+            return None
+
+        basic_info = self.build_basic_info(pr_details)
+        labels = pr_details.get("labels", [])
 
-        files = self.get_pr_files(pr_number)
+        keys = None
+        if stored_pr_data:
+            keys = classify_changed_sub_resources(pr_details, stored_pr_data)
+            print(f"PR #{pr_number} の再取得対象: {', '.join(sorted(keys)) or 'なし'}")
 
-        commits = self.get_pr_commits(pr_number)
+        sub_resources = self.fetch_pr_sub_resources(
+            pr_number, concurrent, basic_info, keys
+        )
+        if keys is not None:
+            sub_resources = {
+                **{key: stored_pr_data.get(key) or [] for key in SUB_RESOURCE_COUNTERS},
+                **sub_resources,
+            }
 
         pr_data = {
             "basic_info": basic_info,
             "labels": labels,
-            "comments": comments,
-            "review_comments": review_comments,
-            "files": files,
-            "commits": commits,
+            "comments": sub_resources["comments"],
+            "review_comments": sub_resources["review_comments"],
+            "files": sub_resources["files"],
+            "commits": sub_resources["commits"],
             "collected_at": datetime.now().isoformat(),
         }
 
         return pr_data
 
+    def refresh_pr_data(self, pr_number, output_dir=None):
+        """保存済みのPRデータと比較して、変化した部分のみを取得し直す
+
+        未保存のPRの場合は全データを収集します。
+        """
+        stored_pr_data = self.get_store(output_dir).load(pr_number)
+        return self.collect_pr_data(pr_number, stored_pr_data=stored_pr_data)
+
     def save_pr_data(self, pr_data, output_dir=None):
-        """PRデータをJSONファイルに保存する"""
+        """PRデータをJSONファイルに保存する
+
+        collectors.projection の定義で不要な項目を取り除いてから保存します
+        （collectors.keep_raw_payloads が true の場合はそのまま保存します）。
+        """
         if not pr_data or "basic_info" not in pr_data:
             return False
 
         pr_number = pr_data["basic_info"]["number"]
 
-        if output_dir:
-            save_dir = Path(output_dir)
-        else:
-            save_dir = self.base_dir
-
-        save_dir.mkdir(parents=True, exist_ok=True)
-
-        file_path = save_dir / f"{pr_number}.json"
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(pr_data, f, ensure_ascii=False, indent=2)
+        pr_data = project_pr_data(pr_data, self.projection)
+        file_path = self.get_store(output_dir).save(pr_data)
 
-        print(f"PR #{pr_number} のデータを {file_path} に保存しました")
+        if file_path is None:
+            print(f"PR #{pr_number} のデータに変更がないため書き込みを省略しました")
+        else:
+            print(f"PR #{pr_number} のデータを {file_path} に保存しました")
         return True
 
     def collect_prs_by_update_time(self, output_dir=None, max_count=None, since=None):
         """更新時間順にPRを収集する"""
-        page = 1
-        per_page = 100
         collected_count = 0
 
-        while True:
-            prs = self.get_pr_list(
-                sort="updated", direction="desc", per_page=per_page, page=page
-            )
-
+        for prs in self.iter_pr_list(sort="updated", direction="desc"):
             if not prs:
                 break
 
@@ -168,13 +436,7 @@ class PRCollector:
                 pr_number = pr["number"]
                 updated_at = pr["updated_at"]
 
-                if output_dir:
-                    save_dir = Path(output_dir)
-                else:
-                    save_dir = self.base_dir
-                file_path = save_dir / f"{pr_number}.json"
-
-                if file_path.exists():
+                if self.get_store(output_dir).exists(pr_number):
                     print(f"PR #{pr_number} は既に収集済みのためスキップします")
                     continue
 
@@ -193,74 +455,309 @@ class PRCollector:
                     print(f"指定された最大数 {max_count} に達したため収集を終了します")
                     return collected_count
 
-                time.sleep(self.api_config.get("request_delay", 0.5))
+        return collected_count
 
-            page += 1
+    def load_last_run_info(self, output_dir=None):
+        """保存先ディレクトリの last_run_info.json を読み込む"""
+        save_dir = Path(output_dir) if output_dir else self.base_dir
+        file_path = save_dir / "last_run_info.json"
 
-        return collected_count
+        if not file_path.exists():
+            return {}
 
-    def collect_prs_sequentially(
-        self, start_number=1, end_number=None, output_dir=None
-    ):
-        """連番でPRを収集する"""
-        collected_count = 0
-        current_number = start_number
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"{file_path} の読み込みに失敗しました: {e}")
+            return {}
+
+    def save_last_run_value(self, key, value, output_dir=None):
+        """last_run_info.json の指定した項目を更新する"""
+        save_dir = Path(output_dir) if output_dir else self.base_dir
+        save_dir.mkdir(parents=True, exist_ok=True)
+
+        info = self.load_last_run_info(output_dir)
+        info[key] = value
+
+        content = json.dumps(info, ensure_ascii=False, indent=2)
+        write_file_atomically(save_dir / "last_run_info.json", content.encode("utf-8"))
+
+    def save_update_watermark(self, watermark, output_dir=None):
+        """差分同期済みの最大 updated_at を last_run_info.json に記録する"""
+        self.save_last_run_value("update_watermark", watermark, output_dir)
+
+    def get_incremental_candidates(self, output_dir=None):
+        """前回の同期以降に更新されたPRを更新日時の古い順に取得する
 
-        while True:
-            if end_number and current_number > end_number:
+        一覧は更新日時の降順に取得し、ウォーターマークを下回った時点で
+        ページングを打ち切ります。ウォーターマークが未記録の場合は
+        未収集のPRのみを対象にします。
+        """
+        store = self.get_store(output_dir)
+        watermark = self.load_last_run_info(output_dir).get("update_watermark")
+
+        candidates = []
+        newest_updated_at = None
+
+        for prs in self.iter_pr_list(sort="updated", direction="desc"):
+            if not prs:
                 break
 
-            remaining, reset_time = check_rate_limit()
-            if remaining < 10:
-                wait_for_rate_limit_reset(reset_time)
+            reached_watermark = False
+            for pr in prs:
+                newest_updated_at = newest_updated_at or pr["updated_at"]
 
-            pr_data = self.collect_pr_data(current_number)
+                if watermark and pr["updated_at"] < watermark:
+                    reached_watermark = True
+                    break
+
+                if not watermark and store.exists(pr["number"]):
+                    continue
+
+                candidates.append(pr)
+
+            if reached_watermark:
+                break
+
+        candidates.reverse()
+        return watermark, candidates, newest_updated_at
+
+    def collect_prs_incrementally(self, output_dir=None, max_count=None):
+        """ウォーターマーク以降に更新されたPRを差分同期する
+
+        更新日時の古い順に処理し、1件保存するごとにウォーターマークを進めるため、
+        途中で中断しても次回は続きから同期されます。
+        """
+        watermark, candidates, newest_updated_at = self.get_incremental_candidates(
+            output_dir
+        )
+        print(f"ウォーターマーク: {watermark or '未記録'}")
+        print(f"同期対象PR数: {len(candidates)}件")
+
+        collected_count = 0
+        for pr in candidates:
+            pr_data = self.refresh_pr_data(pr["number"], output_dir)
             if pr_data:
                 self.save_pr_data(pr_data, output_dir)
                 collected_count += 1
 
-            current_number += 1
+            self.save_update_watermark(pr["updated_at"], output_dir)
 
-            time.sleep(self.api_config.get("request_delay", 0.5))
+            if max_count and collected_count >= max_count:
+                print(f"指定された最大数 {max_count} に達したため収集を終了します")
+                return collected_count
+
+        if newest_updated_at:
+            self.save_update_watermark(newest_updated_at, output_dir)
 
         return collected_count
 
-    def get_missing_pr_numbers(self, output_dir=None):
-        """ローカルに存在しない（欠損している）PR番号のリストを取得する"""
-        known_issue_numbers = {181, 182, 194, 215, 802, 931, 1803}
+    def refresh_files_from_git_mirror(self, output_dir=None, max_count=None):
+        """保存済みの全PRの変更ファイルとコミットをローカルミラーから計算し直す
+
+        ミラーの更新は1回の git fetch のみで、APIリクエストは行いません。
+        ヘッドのコミットはミラー上の refs/pull/<番号>/head に合わせて更新します。
+        """
+        store = self.get_store(output_dir)
+        pull_heads = self.get_git_mirror().pull_heads()
+
+        refreshed_count = 0
+        skipped_count = 0
+        for pr_number in sorted(store.numbers()):
+            pr_data = store.load(pr_number)
+            if not pr_data:
+                continue
+
+            basic_info = dict(pr_data["basic_info"])
+            if pr_number in pull_heads:
+                basic_info["head_sha"] = pull_heads[pr_number]
+
+            sub_resources = self.get_mirror_sub_resources(basic_info)
+            if sub_resources is None:
+                skipped_count += 1
+                continue
+
+            pr_data = {**pr_data, "basic_info": basic_info, **sub_resources}
+            self.save_pr_data(pr_data, output_dir)
+            refreshed_count += 1
+
+            if max_count and refreshed_count >= max_count:
+                print(f"指定された最大数 {max_count} に達したため処理を終了します")
+                break
 
-        if output_dir:
-            prs_dir = Path(output_dir)
-        else:
-            prs_dir = self.base_dir
+        if skipped_count:
+            print(
+                f"コミットSHAが未記録またはミラーにないPR {skipped_count}件はスキップしました"
+            )
+        return refreshed_count
+
+    def iter_repo_comments(self, endpoint, since=None):
+        """リポジトリ全体のコメントを更新日時の古い順にページ単位で取得するジェネレータ"""
+        url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/{endpoint}"
+        params = {"sort": "updated", "direction": "asc"}
+        if since:
+            params["since"] = since
+
+        return iter_github_api_pages(url, params)
+
+    def get_updated_comments_by_pr(self, since=None):
+        """since 以降に作成・更新されたコメントとレビューコメントをPR番号ごとにまとめる
+
+        {PR番号: {"comments": [...], "review_comments": [...]}} と、
+        取得したコメントの最大 updated_at を返します。
+        """
+        comments_by_pr = {}
+        newest_updated_at = since
+
+        for key, endpoint, url_field in REPO_COMMENT_SOURCES:
+            for comments in self.iter_repo_comments(endpoint, since):
+                for comment in comments:
+                    pr_url = comment.get(url_field) or ""
+                    pr_number = pr_url.rsplit("/", 1)[-1]
+                    if not pr_number.isdigit():
+                        continue
+
+                    pr_comments = comments_by_pr.setdefault(
+                        int(pr_number), {"comments": [], "review_comments": []}
+                    )
+                    pr_comments[key].append(comment)
+
+                    updated_at = comment.get("updated_at")
+                    if updated_at and (
+                        not newest_updated_at or updated_at > newest_updated_at
+                    ):
+                        newest_updated_at = updated_at
+
+        return comments_by_pr, newest_updated_at
 
-        from ..utils.github_api import get_max_pr_number_from_local_data
+    def sync_comments(self, output_dir=None, since=None):
+        """リポジトリ全体のコメント一覧APIで、保存済みPRのコメントをまとめて更新する
 
-        local_max_pr = get_max_pr_number_from_local_data(prs_dir)
+        前回の同期で記録したウォーターマーク（last_run_info.json の
+        comment_watermark）以降に作成・更新されたコメントのみを取得するため、
+        PRごとのコメント取得は行いません。IssueへのコメントやPRデータが
+        未保存のPRへのコメントは対象外です。GitHubは削除されたコメントを
+        返さないため、削除はPRの再収集時に反映されます。
+        """
+        store = self.get_store(output_dir)
+        since = since or self.load_last_run_info(output_dir).get("comment_watermark")
+        print(f"コメントのウォーターマーク: {since or '未記録（全件を取得します）'}")
 
+        comments_by_pr, newest_updated_at = self.get_updated_comments_by_pr(since)
+
+        updated_count = 0
+        for pr_number in sorted(comments_by_pr):
+            pr_data = store.load(pr_number)
+            if not pr_data:
+                continue
+
+            updates = comments_by_pr[pr_number]
+            pr_data = {
+                **pr_data,
+                "comments": merge_comments(
+                    pr_data.get("comments", []), updates["comments"]
+                ),
+                "review_comments": merge_comments(
+                    pr_data.get("review_comments", []), updates["review_comments"]
+                ),
+            }
+            self.save_pr_data(pr_data, output_dir)
+            updated_count += 1
+
+        print(
+            f"コメントが更新されたPR {len(comments_by_pr)}件のうち、"
+            f"保存済みの {updated_count}件を更新しました"
+        )
+
+        if newest_updated_at:
+            self.save_last_run_value("comment_watermark", newest_updated_at, output_dir)
+        return updated_count
+
+    def resume_sequential_range(self, start_number, end_number, checkpoint):
+        """チェックポイントから連番収集の再開位置と終了番号を決める"""
+        state = checkpoint.load()
+        if not state:
+            print("チェックポイントがないため最初から収集します")
+            return start_number, end_number
+
+        start_number = state["next_number"]
+        end_number = end_number or state.get("end_number")
+        print(f"チェックポイントから再開します: PR #{start_number}")
+        return start_number, end_number
+
+    def collect_prs_sequentially(
+        self, start_number=1, end_number=None, output_dir=None, resume=False
+    ):
+        """連番でPRを収集する
+
+        1件処理するごとに次のPR番号をチェックポイントに記録します。
+        resume が True の場合は、記録された番号から収集を再開します。
+        """
+        checkpoint = self.get_checkpoint("sequential", output_dir)
+        if resume:
+            start_number, end_number = self.resume_sequential_range(
+                start_number, end_number, checkpoint
+            )
+
+        if not end_number:
+            end_number = self.get_latest_pr_number()
+            if not end_number:
+                return 0
+            print(f"終了PR番号として最新PR番号 #{end_number} を使用します")
+
+        collected_count = 0
+        for current_number in range(start_number, end_number + 1):
+            pr_data = self.collect_pr_data(current_number)
+            if pr_data:
+                self.save_pr_data(pr_data, output_dir)
+                collected_count += 1
+
+            checkpoint.save(next_number=current_number + 1, end_number=end_number)
+
+        checkpoint.clear()
+        return collected_count
+
+    def get_latest_pr_number(self):
+        """GitHub上の最新PR番号を取得する"""
         url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls"
         params = {"state": "all", "sort": "created", "direction": "desc", "per_page": 1}
 
         latest_prs = make_github_api_request(url, params)
         if not latest_prs:
-            if local_max_pr:
-                latest_pr_number = local_max_pr
-            else:
-                return []
+            return None
+        return latest_prs[0]["number"]
+
+    def get_number_space(self, output_dir=None):
+        """保存先ディレクトリの番号空間マップを最新の状態にして取得する"""
+        save_dir = Path(output_dir) if output_dir else self.base_dir
+        number_space = NumberSpaceMap(save_dir, self.config)
+        number_space.refresh()
+        return number_space
+
+    def get_missing_pr_numbers(self, output_dir=None):
+        """ローカルに存在しない（欠損している）PR番号のリストを取得する
+
+        番号空間マップでPRと分類された番号のみを対象とするため、
+        Issueや削除済みの番号をPRとして取得しようとすることはありません。
+        """
+        if output_dir:
+            prs_dir = Path(output_dir)
         else:
-            latest_pr_number = latest_prs[0]["number"]
-
-        local_pr_numbers = set()
-        for json_file in prs_dir.glob("*.json"):
-            if json_file.name != "last_run_info.json":
-                try:
-                    pr_number = int(json_file.stem)
-                    local_pr_numbers.add(pr_number)
-                except ValueError:
-                    continue
+            prs_dir = self.base_dir
+
+        local_pr_numbers = self.get_store(prs_dir).numbers()
+        number_space = self.get_number_space(prs_dir)
 
-        expected_range = set(range(1, latest_pr_number + 1))
-        missing_numbers = expected_range - local_pr_numbers - known_issue_numbers
+        expected_numbers = number_space.pr_numbers()
+        if not expected_numbers:
+            # マップを作成できなかった場合は最新PR番号までの全番号を対象にする
+            latest_pr_number = self.get_latest_pr_number()
+            if not latest_pr_number:
+                return []
+            expected_numbers = set(range(1, latest_pr_number + 1))
+
+        missing_numbers = expected_numbers - local_pr_numbers
         return sorted(missing_numbers)
 
     def collect_uncollected_prs(self, output_dir=None, max_count=None):
@@ -275,51 +772,60 @@ class PRCollector:
 
         collected_count = 0
         for pr_number in missing_numbers:
-            remaining, reset_time = check_rate_limit()
-            if remaining < 10:
-                wait_for_rate_limit_reset(reset_time)
-
             pr_data = self.collect_pr_data(pr_number)
             if pr_data:
                 self.save_pr_data(pr_data, output_dir)
                 collected_count += 1
             else:
                 print(f"PR #{pr_number} は存在しません（削除済みまたはアクセス不可）")
-                print(f"  - known_issue_numbersへの追加を検討してください")
 
             if max_count and collected_count >= max_count:
                 print(f"指定された最大数 {max_count} に達したため収集を終了します")
                 break
 
-            time.sleep(self.api_config.get("request_delay", 0.5))
-
         return collected_count
 
-    def needs_state_update(self, pr_number, local_file_path):
-        """PRの状態更新が必要かチェックする"""
-        if not local_file_path.exists():
-            return True
+    def get_local_summary(self, pr_number, output_dir=None):
+        """ローカルに保存済みのPRの state, updated_at, merged_at などを取得する
+
+        ローカルインデックスを優先し、インデックスにない場合のみPRデータファイルを読み込みます。
+        未保存の場合はNoneを返します。
+        """
+        store = self.get_store(output_dir)
+        summary = store.get_summary(pr_number)
+        if summary:
+            return summary
+
+        pr_data = store.load(pr_number)
+        return summarize_pr_data(pr_data) if pr_data else None
 
+    def needs_state_update(self, pr_number, output_dir=None, pr_summary=None):
+        """PRの状態更新が必要かチェックする
+
+        pr_summary にPR一覧APIの要素を渡した場合は、その updated_at, state, merged_at と
+        ローカルインデックスを比較するだけで判定し、APIリクエストを行いません。
+        """
         try:
-            with open(local_file_path, "r", encoding="utf-8") as f:
-                local_data = json.load(f)
+            local_summary = self.get_local_summary(pr_number, output_dir)
+            if local_summary is None:
+                return True
 
-            local_basic_info = local_data.get("basic_info", {})
-            local_updated_at = local_basic_info.get("updated_at")
-            local_state = local_basic_info.get("state")
-            local_merged_at = local_basic_info.get("merged_at")
+            local_updated_at = local_summary.get("updated_at")
+            local_state = local_summary.get("state")
+            local_merged_at = local_summary.get("merged_at")
 
             if not local_updated_at or not local_state:
                 print(f"PR #{pr_number} のローカルデータが不完全です")
                 return True
 
-            pr_details = self.get_pr_details(pr_number)
-            if not pr_details:
-                return False
+            if pr_summary is None:
+                pr_summary = self.get_pr_details(pr_number)
+                if not pr_summary:
+                    return False
 
-            github_updated_at = pr_details["updated_at"]
-            github_state = pr_details["state"]
-            github_merged_at = pr_details.get("merged_at")
+            github_updated_at = pr_summary["updated_at"]
+            github_state = pr_summary["state"]
+            github_merged_at = pr_summary.get("merged_at")
 
             state_changed = local_state != github_state
             updated_time_changed = local_updated_at != github_updated_at
@@ -341,8 +847,6 @@ class PRCollector:
         self, output_dir=None, max_count=None, check_recent_days=30
     ):
         """状態変更をチェックしながらPRを収集する"""
-        page = 1
-        per_page = 100
         collected_count = 0
         updated_count = 0
 
@@ -352,16 +856,7 @@ class PRCollector:
         print(f"チェック対象期間: 最近{check_recent_days}日間")
         print(f"カットオフ日時: {cutoff_date}")
 
-        while True:
-            remaining, reset_time = check_rate_limit()
-            if remaining < 20:
-                print(f"Rate Limit残り{remaining}件のため待機中...")
-                wait_for_rate_limit_reset(reset_time)
-
-            prs = self.get_pr_list(
-                sort="updated", direction="desc", per_page=per_page, page=page
-            )
-
+        for prs in self.iter_pr_list(sort="updated", direction="desc"):
             if not prs:
                 break
 
@@ -373,25 +868,13 @@ class PRCollector:
                     print(f"古いPR（{cutoff_date}以前）に到達したため終了")
                     return collected_count, updated_count
 
-                if output_dir:
-                    save_dir = Path(output_dir)
-                else:
-                    save_dir = self.base_dir
-                file_path = save_dir / f"{pr_number}.json"
-
-                if self.needs_state_update(pr_number, file_path):
+                if self.needs_state_update(pr_number, output_dir, pr):
                     print(f"PR #{pr_number} の状態更新を実行中...")
 
-                    old_state = None
-                    if file_path.exists():
-                        try:
-                            with open(file_path, "r", encoding="utf-8") as f:
-                                old_data = json.load(f)
-                            old_state = old_data.get("basic_info", {}).get("state")
-                        except:
-                            pass
+                    local_summary = self.get_local_summary(pr_number, output_dir)
+                    old_state = local_summary["state"] if local_summary else None
 
-                    pr_data = self.collect_pr_data(pr_number)
+                    pr_data = self.refresh_pr_data(pr_number, output_dir)
                     if pr_data:
                         self.save_pr_data(pr_data, output_dir)
 
@@ -408,13 +891,9 @@ class PRCollector:
                     if max_count and (collected_count + updated_count) >= max_count:
                         print(f"指定された最大数 {max_count} に達したため終了")
                         return collected_count, updated_count
-
-                    time.sleep(self.api_config.get("request_delay", 0.5))
                 else:
                     print(f"PR #{pr_number} は最新状態です")
 
-            page += 1
-
         print(f"=== PR状態更新チェック完了 ===")
         print(f"新規収集: {collected_count}件")
         print(f"状態更新: {updated_count}件")
@@ -14,8 +14,11 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.collectors.async_pr_collector import AsyncPRCollector
+from src.collectors.graphql_pr_collector import GraphQLPRCollector
 from src.collectors.pr_collector import PRCollector
-from src.utils.github_api import load_config
+from src.utils.github_api import enable_etag_cache, load_config
+from src.utils.pr_manifest import write_file_atomically
 
 
 def parse_args():
@@ -24,9 +27,17 @@ def parse_args():
 
     parser.add_argument(
         "--mode",
-        choices=["update", "sequential", "uncollected", "state_update"],
+        choices=[
+            "update",
+            "sequential",
+            "uncollected",
+            "state_update",
+            "graphql",
+            "git_mirror",
+            "comments",
+        ],
         default="update",
-        help="収集モード: update=更新時間順, sequential=連番, uncollected=未収集優先, state_update=状態更新チェック",
+        help="収集モード: update=更新時間順, sequential=連番, uncollected=未収集優先, state_update=状態更新チェック, graphql=GraphQL APIで一括収集, git_mirror=保存済みPRのファイルとコミットをローカルミラーから再計算, comments=リポジトリ全体のコメント一覧で保存済みPRのコメントを同期",
     )
 
     parser.add_argument("--output-dir", help="PRデータの保存先ディレクトリ")
@@ -41,7 +52,13 @@ def parse_args():
 
     parser.add_argument(
         "--since",
-        help="指定した日時以降に更新されたPRのみを収集 (ISO形式: YYYY-MM-DDTHH:MM:SSZ)",
+        help="指定した日時以降に更新されたPRのみを収集（commentsモードでは指定日時以降に更新されたコメントを取得） (ISO形式: YYYY-MM-DDTHH:MM:SSZ)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="前回同期した最大updated_at（ウォーターマーク）以降に更新されたPRのみを再取得する（updateモード用）",
     )
 
     parser.add_argument(
@@ -50,6 +67,54 @@ def parse_args():
         default=30,
         help="状態更新チェック対象日数（state_updateモード用）",
     )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=25,
+        help="1回のGraphQLリクエストで取得するPR数（graphqlモード用）",
+    )
+
+    parser.add_argument(
+        "--graphql-patches",
+        action="store_true",
+        help="変更ファイルのパッチをREST APIで補完する（graphqlモード用）",
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        help="収集エンジン: sync=1件ずつ順に収集, async=collectors.max_workers件まで並行して収集（デフォルト: collectors.engine）",
+    )
+
+    parser.add_argument(
+        "--etag-cache-dir",
+        help="条件付きリクエスト用のETagキャッシュディレクトリ（指定するとapi.conditional_requestsに関係なく有効）",
+    )
+
+    parser.add_argument(
+        "--concurrent-fetch",
+        action="store_true",
+        help="PRごとのコメント・ファイル・コミット取得を並行して実行する",
+    )
+
+    parser.add_argument(
+        "--files-source",
+        choices=["api", "diff", "git_mirror"],
+        help="変更ファイルとコミットの取得元: api=REST API, diff=ファイルはPRの差分を1回で取得して変換, git_mirror=ローカルミラーから計算（デフォルト: collectors.files_source）",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="前回中断した位置（チェックポイント）から収集を再開する（sequential・graphqlモード用）",
+    )
+
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="項目を絞り込まずにAPIレスポンスをそのまま保存する（デバッグ用）",
+    )
     return parser.parse_args()
 
 
@@ -63,40 +128,45 @@ def save_last_run_info(output_dir, mode, count):
 
     file_path = Path(output_dir) / "last_run_info.json"
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(info, f, ensure_ascii=False, indent=2)
-
-    print(f"実行情報を {file_path} に保存しました")
+    if file_path.exists():
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                info = {**json.load(f), **info}
+        except Exception as e:
+            print(f"{file_path} の読み込みに失敗しました: {e}")
 
+    content = json.dumps(info, ensure_ascii=False, indent=2)
+    write_file_atomically(file_path, content.encode("utf-8"))
 
-def main():
-    """メイン関数"""
-    args = parse_args()
-    config = load_config()
+    print(f"実行情報を {file_path} に保存しました")
 
-    output_dir = args.output_dir
-    if not output_dir:
-        output_dir = config["data"]["base_dir"]
 
-    collector = PRCollector(config)
+def run_mode(collector, args, output_dir):
+    """指定されたモードで収集を実行し、収集したPRの件数を返す"""
+    if args.mode == "update" and args.incremental:
+        print("前回の同期以降に更新されたPRを差分同期します")
+        return collector.collect_prs_incrementally(
+            output_dir=output_dir, max_count=args.max_count
+        )
 
-    if args.mode == "update":
+    elif args.mode == "update":
         print("更新時間順にPRを収集します")
-        count = collector.collect_prs_by_update_time(
+        return collector.collect_prs_by_update_time(
             output_dir=output_dir, max_count=args.max_count, since=args.since
         )
 
     elif args.mode == "sequential":
         print(f"PR #{args.start_number} から連番でPRを収集します")
-        count = collector.collect_prs_sequentially(
+        return collector.collect_prs_sequentially(
             start_number=args.start_number,
             end_number=args.end_number,
             output_dir=output_dir,
+            resume=args.resume,
         )
 
     elif args.mode == "uncollected":
         print("未収集のPRを優先的に収集します")
-        count = collector.collect_uncollected_prs(
+        return collector.collect_uncollected_prs(
             output_dir=output_dir, max_count=args.max_count
         )
 
@@ -107,8 +177,65 @@ def main():
             max_count=args.max_count,
             check_recent_days=args.check_days,
         )
-        count = collected_count + updated_count
         print(f"新規収集: {collected_count}件, 状態更新: {updated_count}件")
+        return collected_count + updated_count
+
+    elif args.mode == "graphql":
+        print(f"GraphQL APIで{args.batch_size}件ずつPRを一括収集します")
+        return collector.collect_prs_via_graphql(
+            output_dir=output_dir,
+            max_count=args.max_count,
+            since=args.since,
+            resume=args.resume,
+        )
+
+    elif args.mode == "git_mirror":
+        print("保存済みPRの変更ファイルとコミットをローカルミラーから再計算します")
+        return collector.refresh_files_from_git_mirror(
+            output_dir=output_dir, max_count=args.max_count
+        )
+
+    elif args.mode == "comments":
+        print("リポジトリ全体のコメント一覧で保存済みPRのコメントを同期します")
+        return collector.sync_comments(output_dir=output_dir, since=args.since)
+
+
+def main():
+    """メイン関数"""
+    args = parse_args()
+    config = load_config()
+
+    output_dir = args.output_dir
+    if not output_dir:
+        output_dir = config["data"]["base_dir"]
+
+    if args.etag_cache_dir:
+        enable_etag_cache(args.etag_cache_dir)
+
+    engine = args.engine or config.get("collectors", {}).get("engine", "sync")
+    if args.mode == "graphql":
+        collector = GraphQLPRCollector(
+            config, batch_size=args.batch_size, fetch_patches=args.graphql_patches
+        )
+    elif engine == "async":
+        print(
+            f"非同期エンジンで収集します（最大並行数: {config['collectors']['max_workers']}）"
+        )
+        collector = AsyncPRCollector(config)
+    else:
+        collector = PRCollector(config)
+    if args.concurrent_fetch:
+        collector.concurrent_fetch = True
+    if args.keep_raw:
+        collector.projection = None
+    if args.files_source:
+        collector.files_source = args.files_source
+
+    try:
+        count = run_mode(collector, args, output_dir)
+    finally:
+        # 途中で失敗した場合も、保存済みのPRをインデックスに書き戻す
+        collector.close()
     save_last_run_info(output_dir, args.mode, count)
 
     print(f"収集完了: {count}件のPRデータを収集しました")
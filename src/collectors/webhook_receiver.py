@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+GitHub Webhookの受信によるPRデータの更新
+
+pull_request, issue_comment, pull_request_review_comment, label の
+Webhookイベントを受け取り、ペイロードの内容を PRCollector.save_pr_data と
+同じ保存処理でPRデータに反映します。ペイロードだけでは反映できない場合
+（新しいコミットの追加や未保存のPRなど）のみ、そのPRの再取得を予約します。
+
+受信したイベントは1つのワーカースレッドが順に処理するため、
+同じPRへの更新が並行して書き込まれることはありません。
+"""
+
+import hashlib
+import hmac
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .pr_collector import classify_changed_sub_resources, merge_comments
+
+SUPPORTED_EVENTS = (
+    "ping",
+    "pull_request",
+    "issue_comment",
+    "pull_request_review_comment",
+    "label",
+)
+
+# GitHubが送信するペイロードの上限（25MB）
+MAX_PAYLOAD_SIZE = 25 * 1024 * 1024
+
+
+def verify_signature(secret, body, signature_header):
+    """X-Hub-Signature-256 ヘッダーの署名を検証する"""
+    if not secret or not signature_header:
+        return False
+    if not signature_header.startswith("sha256="):
+        return False
+
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature_header)
+
+
+def remove_comment(comments, comment_id):
+    """指定されたIDのコメントを取り除いたリストを返す"""
+    return [comment for comment in comments if comment.get("id") != comment_id]
+
+
+class WebhookProcessor:
+    """Webhookイベントをキューに入れ、ワーカースレッドで順にPRデータへ反映するクラス"""
+
+    def __init__(self, collector, output_dir=None):
+        """初期化"""
+        self.collector = collector
+        self.output_dir = output_dir
+        self.store = collector.get_store(output_dir)
+        self.full_name = f"{collector.repo_owner}/{collector.repo_name}"
+
+        self._queue = queue.Queue()
+        self._pending_refreshes = set()
+        self._pending_lock = threading.Lock()
+        self._worker = None
+
+    def start(self):
+        """ワーカースレッドを開始する"""
+        self._worker = threading.Thread(
+            target=self._run, name="webhook-worker", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self):
+        """キューに残ったイベントを処理してからワーカースレッドを停止する"""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, event, payload):
+        """イベントを処理キューに追加する"""
+        self._queue.put(("event", event, payload))
+
+    def queue_refresh(self, pr_number, reason):
+        """PRの再取得を予約する（同じPRの再取得が予約済みの場合は何もしない）"""
+        with self._pending_lock:
+            if pr_number in self._pending_refreshes:
+                return
+            self._pending_refreshes.add(pr_number)
+
+        print(f"PR #{pr_number} の再取得を予約しました（{reason}）")
+        self._queue.put(("refresh", pr_number, None))
+
+    def _run(self):
+        """キューのイベントと再取得を順に処理する"""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            self._process_task(*task)
+
+    def process_pending(self):
+        """キューに残っているイベントと再取得をこのスレッドで処理する（記録したペイロードの再生用）"""
+        while not self._queue.empty():
+            task = self._queue.get()
+            if task is not None:
+                self._process_task(*task)
+
+    def _process_task(self, kind, target, payload):
+        """キューの1件を処理する（失敗しても後続の処理は続ける）"""
+        try:
+            if kind == "refresh":
+                with self._pending_lock:
+                    self._pending_refreshes.discard(target)
+                self.refresh(target)
+            else:
+                print(f"{target}: {self.process(target, payload)}")
+        except Exception as e:
+            print(f"Webhookの処理中にエラーが発生しました: {e}")
+
+    def refresh(self, pr_number):
+        """PRの変化した部分のみを取得し直して保存する"""
+        pr_data = self.collector.refresh_pr_data(pr_number, self.output_dir)
+        if pr_data:
+            self.collector.save_pr_data(pr_data, self.output_dir)
+
+    def process(self, event, payload):
+        """イベントをPRデータに反映し、処理結果を返す"""
+        repository = payload.get("repository") or {}
+        if repository.get("full_name", self.full_name) != self.full_name:
+            return (
+                f"対象外のリポジトリのため無視しました: {repository.get('full_name')}"
+            )
+
+        if event == "ping":
+            return "pong"
+        if event == "pull_request":
+            return self.apply_pull_request(payload)
+        if event == "issue_comment":
+            issue = payload.get("issue") or {}
+            if "pull_request" not in issue:
+                return "Issueへのコメントのため無視しました"
+            return self.apply_comment(payload, "comments", issue["number"])
+        if event == "pull_request_review_comment":
+            pr_number = payload["pull_request"]["number"]
+            return self.apply_comment(payload, "review_comments", pr_number)
+        if event == "label":
+            return self.apply_label(payload)
+        return f"未対応のイベントのため無視しました: {event}"
+
+    def save(self, pr_data):
+        """PRCollector と同じ保存処理でPRデータを保存する"""
+        self.collector.save_pr_data(pr_data, self.output_dir)
+
+    def apply_pull_request(self, payload):
+        """pull_request イベントのPRで basic_info とラベルを更新する
+
+        コミット数やコメント数などが保存済みのデータから変化している場合は、
+        ペイロードに含まれないサブリソースを取得するため再取得を予約します。
+        配信の遅延や再送で保存済みのデータより古いペイロードが届いた場合は反映しません。
+        """
+        pull_request = payload["pull_request"]
+        pr_number = pull_request["number"]
+
+        stored_pr_data = self.store.load(pr_number)
+        if not stored_pr_data:
+            self.queue_refresh(pr_number, "未保存のPR")
+            return f"PR #{pr_number} は未保存のため再取得を予約しました"
+
+        stored_updated_at = stored_pr_data.get("basic_info", {}).get("updated_at")
+        if (pull_request.get("updated_at") or "") < (stored_updated_at or ""):
+            return f"PR #{pr_number} は保存済みのデータより古いため無視しました"
+
+        changed = classify_changed_sub_resources(pull_request, stored_pr_data)
+        if changed:
+            self.queue_refresh(pr_number, f"{', '.join(sorted(changed))} の変化")
+            return f"PR #{pr_number} の再取得を予約しました"
+
+        self.save(
+            {
+                **stored_pr_data,
+                "basic_info": self.collector.build_basic_info(pull_request),
+                "labels": pull_request.get("labels", []),
+            }
+        )
+        return f"PR #{pr_number} を更新しました（{payload.get('action')}）"
+
+    def apply_comment(self, payload, key, pr_number):
+        """コメントの作成・編集・削除を保存済みのPRデータに反映する"""
+        stored_pr_data = self.store.load(pr_number)
+        if not stored_pr_data:
+            self.queue_refresh(pr_number, "未保存のPR")
+            return f"PR #{pr_number} は未保存のため再取得を予約しました"
+
+        comment = payload["comment"]
+        comments = stored_pr_data.get(key) or []
+        if payload.get("action") == "deleted":
+            comments = remove_comment(comments, comment.get("id"))
+        else:
+            comments = merge_comments(comments, [comment])
+
+        self.save({**stored_pr_data, key: comments})
+        return f"PR #{pr_number} の{key}を更新しました（{payload.get('action')}）"
+
+    def apply_label(self, payload):
+        """ラベルの名前・色などの変更や削除を、そのラベルが付いた保存済みのPRに反映する"""
+        action = payload.get("action")
+        label = payload["label"]
+        if action not in ("edited", "deleted"):
+            return f"ラベルの{action}はPRデータに影響しないため無視しました"
+
+        old_name = ((payload.get("changes") or {}).get("name") or {}).get(
+            "from", label["name"]
+        )
+
+        updated_count = 0
+        for pr_number, _ in self.store.query(label=old_name):
+            stored_pr_data = self.store.load(pr_number)
+            if not stored_pr_data:
+                continue
+
+            labels = []
+            for pr_label in stored_pr_data.get("labels", []):
+                if pr_label.get("name") != old_name:
+                    labels.append(pr_label)
+                elif action == "edited":
+                    labels.append(label)
+
+            self.save({**stored_pr_data, "labels": labels})
+            updated_count += 1
+
+        return f"ラベル「{old_name}」の{action}を {updated_count}件のPRに反映しました"
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """Webhookの配信を受け付けるHTTPハンドラ
+
+    署名を検証したイベントをキューに入れてすぐに応答し、反映はワーカースレッドで行います。
+    """
+
+    server_version = "PolicyPRHubWebhook/1.0"
+
+    def log_message(self, format, *args):
+        """アクセスログを標準出力に出力する"""
+        print(f"{self.address_string()} - {format % args}")
+
+    def _respond(self, status, message):
+        """JSONで応答する"""
+        body = json.dumps({"message": message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """死活監視用に応答する"""
+        self._respond(200, "ok")
+
+    def do_POST(self):
+        """Webhookの配信を受け付ける"""
+        if self.path.split("?", 1)[0] != self.server.webhook_path:
+            self._respond(404, "not found")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._respond(400, "invalid content length")
+            return
+        if length > MAX_PAYLOAD_SIZE:
+            self._respond(413, "payload too large")
+            return
+        body = self.rfile.read(length)
+
+        signature = self.headers.get("X-Hub-Signature-256")
+        if not verify_signature(self.server.webhook_secret, body, signature):
+            self._respond(401, "invalid signature")
+            return
+
+        event = self.headers.get("X-GitHub-Event", "")
+        if event not in SUPPORTED_EVENTS:
+            self._respond(202, f"ignored event: {event}")
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._respond(400, "invalid json")
+            return
+
+        self.server.processor.submit(event, payload)
+        self._respond(202, "accepted")
+
+
+def create_webhook_server(
+    processor, secret, host="127.0.0.1", port=8080, path="/webhook"
+):
+    """Webhookを受け付けるHTTPサーバーを作成する"""
+    server = ThreadingHTTPServer((host, port), WebhookRequestHandler)
+    server.processor = processor
+    server.webhook_secret = secret
+    server.webhook_path = path
+    return server
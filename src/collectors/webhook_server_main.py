@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Webhook受信サーバー起動スクリプト
+
+GitHubのWebhookを受け付けてPRデータをほぼリアルタイムに更新するサーバーを起動します。
+署名の検証に使用するシークレットは環境変数 GITHUB_WEBHOOK_SECRET で指定します。
+--replay を指定すると、記録したペイロードをサーバーを起動せずに反映します。
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.collectors.pr_collector import PRCollector
+from src.collectors.webhook_receiver import (
+    SUPPORTED_EVENTS,
+    WebhookProcessor,
+    create_webhook_server,
+)
+from src.utils.github_api import load_config
+
+
+def parse_args():
+    """コマンドライン引数をパースする"""
+    parser = argparse.ArgumentParser(
+        description="GitHubのWebhookを受け付けてPRデータを更新するサーバー"
+    )
+
+    parser.add_argument("--output-dir", help="PRデータの保存先ディレクトリ")
+
+    parser.add_argument("--host", help="待ち受けるアドレス（デフォルト: webhook.host）")
+
+    parser.add_argument(
+        "--port", type=int, help="待ち受けるポート番号（デフォルト: webhook.port）"
+    )
+
+    parser.add_argument(
+        "--replay",
+        nargs="+",
+        metavar="PAYLOAD_FILE",
+        help="記録したペイロードのJSONファイルを順に反映して終了する（署名の検証は行わない）",
+    )
+
+    parser.add_argument(
+        "--event",
+        choices=SUPPORTED_EVENTS,
+        help="--replay で反映するペイロードのイベント名（X-GitHub-Event）",
+    )
+
+    return parser.parse_args()
+
+
+def replay_payloads(processor, event, payload_files):
+    """記録したペイロードを順に反映する"""
+    for payload_file in payload_files:
+        with open(payload_file, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        print(f"{payload_file}: {processor.process(event, payload)}")
+        processor.process_pending()
+
+
+def main():
+    """メイン関数"""
+    args = parse_args()
+    config = load_config()
+    webhook_config = config.get("webhook", {})
+
+    output_dir = args.output_dir or config["data"]["base_dir"]
+    collector = PRCollector(config)
+    processor = WebhookProcessor(collector, output_dir)
+
+    if args.replay:
+        if not args.event:
+            print("--replay には --event の指定が必要です")
+            return 1
+        try:
+            replay_payloads(processor, args.event, args.replay)
+        finally:
+            collector.close()
+        return 0
+
+    secret = os.environ.get("GITHUB_WEBHOOK_SECRET")
+    if not secret:
+        print("環境変数 GITHUB_WEBHOOK_SECRET が設定されていません")
+        return 1
+
+    host = args.host or webhook_config.get("host", "127.0.0.1")
+    port = args.port or webhook_config.get("port", 8080)
+    path = webhook_config.get("path", "/webhook")
+    server = create_webhook_server(processor, secret, host, port, path)
+
+    processor.start()
+    print(f"Webhookの受信を開始しました: http://{host}:{port}{path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Webhookの受信を終了します")
+    finally:
+        server.server_close()
+        processor.stop()
+        collector.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
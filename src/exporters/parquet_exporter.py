@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+PRデータのParquet形式エクスポート
+
+PRデータ（ファイルまたはSQLiteのストア）を prs, labels, files, comments, commits の
+5つのテーブルに分け、PR番号の範囲ごとに分割したParquetファイルとして出力します。
+
+    <出力先>/<テーブル名>/bucket=<番号範囲の開始番号>/part.parquet
+
+前回のエクスポート時の内容ハッシュを _export_state.json に記録し、
+変更・追加・削除されたPRを含む番号範囲のファイルだけを書き直します。
+出力したテーブルを pandas で読み込み、既存のレポートと同じ集計を
+ベクトル化した処理で行う関数も提供します。
+
+pyarrow パッケージ（集計には pandas パッケージも）が必要です。
+"""
+
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from ..generators.policy_report import POLICY_AREA_KEYWORDS
+from ..utils.pr_database import normalize_pr_data
+from ..utils.pr_manifest import write_file_atomically
+
+STATE_FILE_NAME = "_export_state.json"
+EXPORT_VERSION = 1
+
+# 1つのParquetファイルにまとめるPR番号の範囲
+PARTITION_SIZE = 1000
+
+TABLES = ("prs", "labels", "files", "comments", "commits")
+
+# 日時として出力する列
+TIMESTAMP_COLUMNS = {
+    "prs": ("created_at", "updated_at", "closed_at", "merged_at"),
+    "comments": ("created_at", "updated_at"),
+    "commits": ("date",),
+}
+
+
+def check_parquet_support(require_pandas=False):
+    """Parquet形式の読み書きに必要なパッケージがあるか確認する（ない場合は例外）"""
+    if pa is None:
+        raise RuntimeError(
+            "Parquet形式の出力には pyarrow パッケージが必要です: pip install pyarrow"
+        )
+    if require_pandas and pd is None:
+        raise RuntimeError(
+            "Parquet形式での集計には pandas パッケージが必要です: pip install pandas"
+        )
+
+
+def get_schemas():
+    """テーブルごとのスキーマを返す"""
+    timestamp = pa.timestamp("s", tz="UTC")
+    return {
+        "prs": pa.schema(
+            [
+                ("number", pa.int64()),
+                ("title", pa.string()),
+                ("state", pa.string()),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+                ("closed_at", timestamp),
+                ("merged_at", timestamp),
+                ("author", pa.string()),
+                ("html_url", pa.string()),
+                ("comment_count", pa.int64()),
+                ("review_comment_count", pa.int64()),
+                ("file_count", pa.int64()),
+                ("commit_count", pa.int64()),
+                ("additions", pa.int64()),
+                ("deletions", pa.int64()),
+            ]
+        ),
+        "labels": pa.schema(
+            [
+                ("pr_number", pa.int64()),
+                ("name", pa.string()),
+                ("color", pa.string()),
+                ("description", pa.string()),
+            ]
+        ),
+        "files": pa.schema(
+            [
+                ("pr_number", pa.int64()),
+                ("filename", pa.string()),
+                ("status", pa.string()),
+                ("additions", pa.int64()),
+                ("deletions", pa.int64()),
+                ("changes", pa.int64()),
+            ]
+        ),
+        "comments": pa.schema(
+            [
+                ("pr_number", pa.int64()),
+                ("id", pa.int64()),
+                ("kind", pa.string()),
+                ("author", pa.string()),
+                ("path", pa.string()),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+                ("body", pa.string()),
+            ]
+        ),
+        "commits": pa.schema(
+            [
+                ("pr_number", pa.int64()),
+                ("sha", pa.string()),
+                ("author", pa.string()),
+                ("date", timestamp),
+                ("message", pa.string()),
+            ]
+        ),
+    }
+
+
+def parse_timestamp(value):
+    """GitHub APIの日時文字列をdatetimeに変換する（値がない場合はNone）"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def pr_data_to_rows(pr_data):
+    """PRデータをテーブルごとの行に変換する"""
+    basic_info = pr_data["basic_info"]
+    files = pr_data.get("files", [])
+
+    rows = normalize_pr_data(pr_data)
+    rows["prs"] = [
+        {
+            "number": basic_info["number"],
+            "title": basic_info.get("title"),
+            "state": basic_info.get("state"),
+            "created_at": basic_info.get("created_at"),
+            "updated_at": basic_info.get("updated_at"),
+            "closed_at": basic_info.get("closed_at"),
+            "merged_at": basic_info.get("merged_at"),
+            "author": (basic_info.get("user") or {}).get("login"),
+            "html_url": basic_info.get("html_url"),
+            "comment_count": len(pr_data.get("comments", [])),
+            "review_comment_count": len(pr_data.get("review_comments", [])),
+            "file_count": len(files),
+            "commit_count": len(pr_data.get("commits", [])),
+            "additions": sum(f.get("additions") or 0 for f in files),
+            "deletions": sum(f.get("deletions") or 0 for f in files),
+        }
+    ]
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for row in rows[table]:
+            for column in columns:
+                row[column] = parse_timestamp(row[column])
+    return rows
+
+
+def partition_of(pr_number):
+    """PR番号が属する番号範囲の開始番号を返す"""
+    return pr_number // PARTITION_SIZE * PARTITION_SIZE
+
+
+class ParquetExporter:
+    """PRデータをParquet形式のテーブルに差分エクスポートするクラス"""
+
+    def __init__(self, store, output_dir):
+        """初期化
+
+        store は PRStore または SQLitePRStore です。
+        """
+        check_parquet_support()
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.state_path = self.output_dir / STATE_FILE_NAME
+        self.schemas = get_schemas()
+
+    def _load_state(self):
+        """前回エクスポートしたPRの内容ハッシュを読み込む"""
+        if not self.state_path.exists():
+            return {}
+
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception as e:
+            print(f"{self.state_path} の読み込みに失敗したため全件を出力します: {e}")
+            return {}
+
+        if state.get("version") != EXPORT_VERSION:
+            print("エクスポートの形式が変更されたため全件を出力します")
+            return {}
+        return {int(number): value for number, value in state["hashes"].items()}
+
+    def _save_state(self, hashes):
+        """エクスポートしたPRの内容ハッシュを記録する"""
+        state = {
+            "version": EXPORT_VERSION,
+            "exported_at": datetime.now().isoformat(),
+            "hashes": {str(number): value for number, value in hashes.items()},
+        }
+        content = json.dumps(state, ensure_ascii=False, sort_keys=True)
+        write_file_atomically(self.state_path, content.encode("utf-8"))
+
+    def partition_path(self, table, partition):
+        """テーブルの番号範囲ごとのファイルのパスを返す"""
+        return self.output_dir / table / f"bucket={partition:06d}" / "part.parquet"
+
+    def _write_partition(self, partition, numbers):
+        """番号範囲に含まれるPRを読み込み、各テーブルのファイルを書き直す"""
+        rows = {table: [] for table in TABLES}
+        for pr_data in self.store.iter_pr_data(numbers):
+            for table, table_rows in pr_data_to_rows(pr_data).items():
+                rows[table].extend(table_rows)
+
+        for table in TABLES:
+            path = self.partition_path(table, partition)
+            if not rows[table]:
+                if path.exists():
+                    path.unlink()
+                    path.parent.rmdir()
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            arrow_table = pa.Table.from_pylist(rows[table], schema=self.schemas[table])
+            fd, tmp_path = tempfile.mkstemp(
+                dir=path.parent, prefix=".part.", suffix=".tmp"
+            )
+            os.close(fd)
+            try:
+                pq.write_table(arrow_table, tmp_path, compression="zstd")
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def export(self, full=False):
+        """変更されたPRを含む番号範囲を出力し、(変更PR数, 書き直した範囲数) を返す
+
+        full が True の場合は前回の記録を使わずに全件を出力します。
+        """
+        current = self.store.content_hashes()
+        previous = {} if full else self._load_state()
+
+        changed = {
+            number
+            for number in current.keys() | previous.keys()
+            if current.get(number) != previous.get(number)
+        }
+        partitions = sorted({partition_of(number) for number in changed})
+
+        numbers_by_partition = {partition: [] for partition in partitions}
+        for number in sorted(current):
+            if partition_of(number) in numbers_by_partition:
+                numbers_by_partition[partition_of(number)].append(number)
+
+        for partition in partitions:
+            self._write_partition(partition, numbers_by_partition[partition])
+
+        self._save_state(current)
+        return len(changed), len(partitions)
+
+
+def load_parquet_tables(export_dir, tables=TABLES):
+    """エクスポートしたテーブルを pandas の DataFrame として読み込む"""
+    check_parquet_support(require_pandas=True)
+    schemas = get_schemas()
+
+    frames = {}
+    for table in tables:
+        table_dir = Path(export_dir) / table
+        if table_dir.exists() and any(table_dir.glob("bucket=*/part.parquet")):
+            frame = pd.read_parquet(table_dir)
+            frames[table] = frame.drop(columns=["bucket"], errors="ignore")
+        else:
+            frames[table] = schemas[table].empty_table().to_pandas()
+    return frames
+
+
+def contribution_stats_from_tables(tables):
+    """ContributionStatsGenerator.analyze_contribution_prs と同じ統計を集計する"""
+    prs = tables["prs"]
+    labels = tables["labels"]
+
+    thankyou_numbers = labels.loc[labels["name"] == "thankyou", "pr_number"]
+    is_merged = prs["merged_at"].notna()
+    is_thankyou_closed = (
+        ~is_merged
+        & (prs["state"] == "closed")
+        & prs["closed_at"].notna()
+        & prs["number"].isin(thankyou_numbers)
+    )
+
+    contribution_dates = pd.concat(
+        [
+            prs.loc[is_merged, "merged_at"],
+            prs.loc[is_thankyou_closed, "closed_at"],
+        ]
+    ).dt.strftime("%Y-%m-%d")
+
+    return {
+        "total_prs": len(prs),
+        "contribution_prs": int(is_merged.sum() + is_thankyou_closed.sum()),
+        "merged_prs": int(is_merged.sum()),
+        "thankyou_closed_prs": int(is_thankyou_closed.sum()),
+        "daily_counts": {
+            date: int(count)
+            for date, count in contribution_dates.value_counts().sort_index().items()
+        },
+    }
+
+
+def local_pr_stats_from_tables(tables):
+    """DataValidator.get_local_pr_stats と同じ統計を集計する"""
+    prs = tables["prs"]
+    labels = tables["labels"]
+
+    states = prs["state"].where(prs["merged_at"].isna(), "merged")
+    state_counts = {"open": 0, "closed": 0, "merged": 0}
+    state_counts.update(
+        {state: int(count) for state, count in states.value_counts().items()}
+    )
+
+    def counts(series):
+        return {key: int(count) for key, count in series.value_counts().items()}
+
+    return {
+        "total_prs": len(prs),
+        "state_counts": state_counts,
+        "label_counts": counts(labels["name"]),
+        "user_counts": counts(prs["author"].dropna()),
+        "monthly_counts": counts(prs["created_at"].dropna().dt.strftime("%Y-%m")),
+        "file_count": len(prs),
+    }
+
+
+def policy_area_numbers_from_tables(tables, area_keywords=POLICY_AREA_KEYWORDS):
+    """PolicyReportGenerator.group_prs_by_policy_area と同じ分類でPR番号を返す
+
+    変更ファイル名・タイトル・ラベル名のいずれかにキーワードを含む分野に分類し、
+    どの分野にも該当しないPRは「その他」に分類します。
+    """
+    prs = tables["prs"]
+    files = tables["files"]
+    labels = tables["labels"]
+
+    areas = {}
+    for area, keywords in area_keywords.items():
+        pattern = "|".join(re.escape(keyword) for keyword in keywords)
+        matched = pd.concat(
+            [
+                files.loc[
+                    files["filename"].fillna("").str.contains(pattern), "pr_number"
+                ],
+                prs.loc[prs["title"].fillna("").str.contains(pattern), "number"],
+                labels.loc[
+                    labels["name"].fillna("").str.contains(pattern), "pr_number"
+                ],
+            ]
+        )
+        if not matched.empty:
+            areas[area] = sorted(int(number) for number in matched.unique())
+
+    assigned = {number for numbers in areas.values() for number in numbers}
+    others = sorted(int(number) for number in prs["number"] if number not in assigned)
+    if others:
+        areas["その他"] = others
+    return areas
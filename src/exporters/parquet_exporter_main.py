@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Parquet形式エクスポートスクリプト
+
+PRデータをParquet形式のテーブルに差分エクスポートし、
+必要に応じてエクスポートしたテーブルから統計を集計して表示します。
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.exporters.parquet_exporter import (
+    ParquetExporter,
+    contribution_stats_from_tables,
+    load_parquet_tables,
+    local_pr_stats_from_tables,
+    policy_area_numbers_from_tables,
+)
+from src.utils.github_api import load_config
+from src.utils.pr_store import open_pr_store
+
+REPORTS = {
+    "contribution": contribution_stats_from_tables,
+    "local_stats": local_pr_stats_from_tables,
+    "policy_areas": policy_area_numbers_from_tables,
+}
+
+
+def parse_args():
+    """コマンドライン引数をパースする"""
+    parser = argparse.ArgumentParser(
+        description="PRデータをParquet形式のテーブルにエクスポートするスクリプト"
+    )
+
+    parser.add_argument(
+        "--input-dir",
+        help="PRデータのディレクトリ（省略時は設定ファイルの data.base_dir）",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        help="Parquetファイルの出力先（省略時は設定ファイルの data.parquet_dir）",
+    )
+
+    parser.add_argument(
+        "--full", action="store_true", help="前回の記録を使わずに全件を出力する"
+    )
+
+    parser.add_argument(
+        "--report",
+        choices=sorted(REPORTS),
+        help="エクスポート後にテーブルから集計した統計をJSONで表示する",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """メイン関数"""
+    args = parse_args()
+    config = load_config()
+
+    input_dir = args.input_dir or config["data"]["base_dir"]
+    output_dir = args.output_dir or config["data"].get("parquet_dir", ".cache/parquet")
+
+    if not Path(input_dir).is_dir():
+        print(f"ディレクトリが存在しません: {input_dir}")
+        return 1
+
+    with open_pr_store(input_dir) as store:
+        changed_count, partition_count = ParquetExporter(store, output_dir).export(
+            full=args.full
+        )
+    print(
+        f"変更されたPR {changed_count}件を含む {partition_count}範囲を "
+        f"{output_dir} に出力しました"
+    )
+
+    if args.report:
+        tables = load_parquet_tables(output_dir)
+        result = REPORTS[args.report](tables)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
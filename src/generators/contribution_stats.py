@@ -12,6 +12,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from ..utils.pr_store import open_pr_store
+
 
 class ContributionStatsGenerator:
     """改善貢献PR統計を生成するクラス"""
@@ -20,51 +22,44 @@ class ContributionStatsGenerator:
         """初期化"""
         self.config = config or {}
 
-    def load_pr_data_from_directory(self, input_dir):
-        """PRデータをディレクトリから読み込む（ファイルごとのPRデータ）"""
-        pr_data = []
+    def load_pr_summaries_from_directory(self, input_dir):
+        """PRの状態・日時・ラベルをディレクトリのインデックスから読み込む
+
+        統計に必要な項目はインデックス（SQLiteの場合はデータベース）に含まれるため、
+        PRデータファイルは読み込みません。
+        """
         input_path = Path(input_dir)
 
         if not input_path.exists() or not input_path.is_dir():
             print(f"ディレクトリが存在しません: {input_dir}")
             return []
 
-        json_files = list(input_path.glob("*.json"))
-        print(f"{len(json_files)}件のPRデータファイルを見つけました")
+        with open_pr_store(input_path) as store:
+            summaries = [summary for _, summary in store.query()]
+        print(f"{len(summaries)}件のPRデータを見つけました")
 
-        for json_file in json_files:
-            try:
-                with open(json_file, encoding="utf-8") as f:
-                    pr = json.load(f)
-                    pr_data.append(pr)
-            except Exception as e:
-                print(f"{json_file}の読み込み中にエラーが発生しました: {e}")
+        return summaries
 
-        return pr_data
-
-    def analyze_contribution_prs(self, pr_data):
-        """改善貢献PRを分析する"""
+    def analyze_contribution_prs(self, pr_summaries):
+        """改善貢献PRを分析する（PRごとの state, merged_at, closed_at, labels を使用）"""
         stats = {
-            "total_prs": len(pr_data),
+            "total_prs": len(pr_summaries),
             "contribution_prs": 0,
             "merged_prs": 0,
             "thankyou_closed_prs": 0,
             "daily_counts": defaultdict(int),
         }
 
-        for pr in pr_data:
-            if not pr:
+        for summary in pr_summaries:
+            if not summary:
                 continue
 
-            basic_info = pr.get("basic_info", {})
-
-            merged_at = basic_info.get("merged_at")
+            merged_at = summary.get("merged_at")
             is_merged = merged_at is not None
 
-            state = basic_info.get("state")
-            closed_at = basic_info.get("closed_at")
-            labels = pr.get("labels", [])
-            has_thankyou = any(label.get("name") == "thankyou" for label in labels)
+            state = summary.get("state")
+            closed_at = summary.get("closed_at")
+            has_thankyou = "thankyou" in summary.get("labels", [])
             is_thankyou_closed = (
                 state == "closed" and closed_at is not None and has_thankyou
             )
@@ -125,12 +120,12 @@ class ContributionStatsGenerator:
         """統計を生成する"""
         print("改善貢献PR統計の生成を開始します...")
 
-        pr_data = self.load_pr_data_from_directory(input_dir)
-        if not pr_data:
+        pr_summaries = self.load_pr_summaries_from_directory(input_dir)
+        if not pr_summaries:
             print("PRデータがありません")
             return False
 
-        stats = self.analyze_contribution_prs(pr_data)
+        stats = self.analyze_contribution_prs(pr_summaries)
 
         print(f"\n=== 統計結果 ===")
         print(f"総PR数: {stats['total_prs']}")
@@ -5,12 +5,25 @@
 PRデータから政策チーム向けのマークダウンレポートを生成します。
 """
 
-import json
 import os
 from collections import defaultdict
 from pathlib import Path
 
 from ..utils.github_api import load_config
+from ..utils.pr_store import open_pr_store
+
+# 政策分野ごとの判定キーワード（ファイル名・タイトル・ラベル名に含まれるかで判定する）
+POLICY_AREA_KEYWORDS = {
+    "教育": ["教育", "学校", "学習", "教師", "先生", "生徒", "学生"],
+    "子育て": ["子育て", "保育", "児童", "子ども", "子供"],
+    "行政改革": ["行政", "改革", "デジタル化", "効率化", "手続き"],
+    "産業": ["産業", "経済", "企業", "ビジネス", "起業"],
+    "科学技術": ["科学", "技術", "研究", "開発", "イノベーション"],
+    "医療": ["医療", "健康", "病院", "診療", "介護"],
+    "エネルギー": ["エネルギー", "電力", "再生可能", "環境"],
+    "経済財政": ["経済", "財政", "税金", "予算", "財源"],
+    "デジタル民主主義": ["デジタル", "民主主義", "参加", "透明性"],
+}
 
 
 class PolicyReportGenerator:
@@ -29,16 +42,10 @@ class PolicyReportGenerator:
             print(f"ディレクトリが存在しません: {input_dir}")
             return []
 
-        json_files = list(input_path.glob("*.json"))
-        print(f"{len(json_files)}件のPRデータファイルを見つけました")
+        with open_pr_store(input_path) as store:
+            print(f"{len(store.numbers())}件のPRデータファイルを見つけました")
 
-        for json_file in json_files:
-            try:
-                with open(json_file, encoding="utf-8") as f:
-                    pr = json.load(f)
-                    pr_data.append(pr)
-            except Exception as e:
-                print(f"{json_file}の読み込み中にエラーが発生しました: {e}")
+            pr_data.extend(store.iter_pr_data())
 
         return pr_data
 
@@ -46,18 +53,6 @@ class PolicyReportGenerator:
         """PRを政策分野ごとにグループ化する"""
         policy_areas = defaultdict(list)
 
-        area_keywords = {
-            "教育": ["教育", "学校", "学習", "教師", "先生", "生徒", "学生"],
-            "子育て": ["子育て", "保育", "児童", "子ども", "子供"],
-            "行政改革": ["行政", "改革", "デジタル化", "効率化", "手続き"],
-            "産業": ["産業", "経済", "企業", "ビジネス", "起業"],
-            "科学技術": ["科学", "技術", "研究", "開発", "イノベーション"],
-            "医療": ["医療", "健康", "病院", "診療", "介護"],
-            "エネルギー": ["エネルギー", "電力", "再生可能", "環境"],
-            "経済財政": ["経済", "財政", "税金", "予算", "財源"],
-            "デジタル民主主義": ["デジタル", "民主主義", "参加", "透明性"],
-        }
-
         for pr in pr_data:
             if not pr:  # Noneの場合はスキップ
                 continue
@@ -71,18 +66,18 @@ class PolicyReportGenerator:
             assigned_areas = set()
 
             for filename in filenames:
-                for area, keywords in area_keywords.items():
+                for area, keywords in POLICY_AREA_KEYWORDS.items():
                     if any(keyword in filename for keyword in keywords):
                         assigned_areas.add(area)
 
-            for area, keywords in area_keywords.items():
+            for area, keywords in POLICY_AREA_KEYWORDS.items():
                 if any(keyword in title for keyword in keywords):
                     assigned_areas.add(area)
 
             labels = pr.get("labels", [])
             for label in labels:
                 label_name = label.get("name", "")
-                for area, keywords in area_keywords.items():
+                for area, keywords in POLICY_AREA_KEYWORDS.items():
                     if any(keyword in label_name for keyword in keywords):
                         assigned_areas.add(area)
 
@@ -109,34 +104,22 @@ class PolicyReportGenerator:
             files = pr.get("files", [])
             filenames = [file.get("filename", "") for file in files]
 
-            area_keywords = {
-                "教育": ["教育", "学校", "学習", "教師", "先生", "生徒", "学生"],
-                "子育て": ["子育て", "保育", "児童", "子ども", "子供"],
-                "行政改革": ["行政", "改革", "デジタル化", "効率化", "手続き"],
-                "産業": ["産業", "経済", "企業", "ビジネス", "起業"],
-                "科学技術": ["科学", "技術", "研究", "開発", "イノベーション"],
-                "医療": ["医療", "健康", "病院", "診療", "介護"],
-                "エネルギー": ["エネルギー", "電力", "再生可能", "環境"],
-                "経済財政": ["経済", "財政", "税金", "予算", "財源"],
-                "デジタル民主主義": ["デジタル", "民主主義", "参加", "透明性"],
-            }
-
             assigned_areas = set()
 
             for filename in filenames:
-                for area, keywords in area_keywords.items():
+                for area, keywords in POLICY_AREA_KEYWORDS.items():
                     if any(keyword in filename for keyword in keywords):
                         assigned_areas.add(area)
 
             title = basic_info.get("title", "")
-            for area, keywords in area_keywords.items():
+            for area, keywords in POLICY_AREA_KEYWORDS.items():
                 if any(keyword in title for keyword in keywords):
                     assigned_areas.add(area)
 
             labels = pr.get("labels", [])
             for label in labels:
                 label_name = label.get("name", "")
-                for area, keywords in area_keywords.items():
+                for area, keywords in POLICY_AREA_KEYWORDS.items():
                     if any(keyword in label_name for keyword in keywords):
                         assigned_areas.add(area)
 
@@ -15,6 +15,7 @@ import backoff
 import requests
 
 from ..utils.github_api import load_config
+from ..utils.pr_store import open_pr_store
 
 
 class WelfareLabelChecker:
@@ -71,7 +72,11 @@ class WelfareLabelChecker:
         self.total_cost = 0.0
 
     def load_pr_data_from_directory(self, input_dir):
-        """PRデータをディレクトリから読み込む"""
+        """オープンPRのデータをディレクトリから読み込む
+
+        インデックス（SQLiteの場合はデータベース）で状態を絞り込み、
+        オープンPRのデータのみを読み込みます。
+        """
         pr_data = []
         input_path = Path(input_dir)
 
@@ -79,16 +84,13 @@ class WelfareLabelChecker:
             print(f"ディレクトリが存在しません: {input_dir}")
             return []
 
-        json_files = list(input_path.glob("*.json"))
-        print(f"{len(json_files)}件のPRデータファイルを見つけました")
+        with open_pr_store(input_path) as store:
+            open_numbers = [number for number, _ in store.query(state="open")]
+            print(
+                f"{len(store.numbers())}件のPRデータのうち、オープンPR {len(open_numbers)}件を読み込みます"
+            )
 
-        for json_file in json_files:
-            try:
-                with open(json_file, encoding="utf-8") as f:
-                    pr = json.load(f)
-                    pr_data.append(pr)
-            except Exception as e:
-                print(f"{json_file}の読み込み中にエラーが発生しました: {e}")
+            pr_data.extend(store.iter_pr_data(open_numbers))
 
         return pr_data
 
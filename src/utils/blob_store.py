@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+パッチ本文のコンテンツアドレス型ストア
+
+同じマークダウンファイルへのほぼ同一の変更（一括編集や再提出された提案）では
+パッチ本文が多くのPRで重複します。パッチ本文をハッシュ値をキーにして
+PRデータディレクトリ内の .blobs/<ハッシュ先頭2文字>/<ハッシュ> に1度だけ保存し、
+PRデータには files[].patch の代わりに files[].patch_ref としてハッシュ値を記録します。
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from .pr_manifest import write_file_atomically
+
+BLOB_DIR_NAME = ".blobs"
+
+# 読み込んだパッチ本文を保持する件数
+BLOB_CACHE_SIZE = 1024
+
+
+class BlobStore:
+    """ハッシュ値をキーにテキストを保存するストア"""
+
+    def __init__(self, prs_dir, cache_size=BLOB_CACHE_SIZE):
+        """初期化"""
+        self.root = Path(prs_dir) / BLOB_DIR_NAME
+        self.get = lru_cache(maxsize=cache_size)(self._read)
+
+    @staticmethod
+    def make_key(text):
+        """テキストのハッシュ値を計算する"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        """ハッシュ値に対応するファイルのパスを返す"""
+        return self.root / key[:2] / key
+
+    def put(self, text):
+        """テキストを保存してハッシュ値を返す（保存済みの場合は書き込まない）"""
+        key = self.make_key(text)
+        path = self._path(key)
+        if not path.exists():
+            write_file_atomically(path, text.encode("utf-8"))
+        return key
+
+    def _read(self, key):
+        """ハッシュ値に対応するテキストを読み込む（存在しない場合はNone）"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+
+def dedupe_patches(pr_data, blob_store):
+    """files[].patch をブロブストアに保存し、patch_ref に置き換えたコピーを返す"""
+    files = pr_data.get("files")
+    if not files:
+        return pr_data
+
+    deduped_files = []
+    for file_info in files:
+        patch = file_info.get("patch")
+        if patch:
+            file_info = dict(file_info)
+            del file_info["patch"]
+            file_info["patch_ref"] = blob_store.put(patch)
+        deduped_files.append(file_info)
+
+    return {**pr_data, "files": deduped_files}
+
+
+def resolve_patch(file_info, blob_store):
+    """ファイル情報のパッチ本文を返す（patch_ref の場合はブロブストアから読み込む）"""
+    patch = file_info.get("patch")
+    if patch is not None or blob_store is None:
+        return patch
+
+    patch_ref = file_info.get("patch_ref")
+    return blob_store.get(patch_ref) if patch_ref else None
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+収集処理のチェックポイント
+
+数時間かかる連番収集やGraphQLでの一括収集の進捗を、収集モードごとに
+PRデータディレクトリ内の .index/checkpoints/<モード>.json に記録します。
+処理が中断された場合は --resume を指定して再実行すると、
+記録された位置から再取得なしで収集を再開できます。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .pr_manifest import INDEX_DIR_NAME, write_file_atomically
+
+CHECKPOINT_DIR_NAME = "checkpoints"
+
+
+class CollectionCheckpoint:
+    """収集モードごとの進捗を記録するクラス"""
+
+    def __init__(self, prs_dir, mode):
+        """初期化"""
+        self.mode = mode
+        self.path = (
+            Path(prs_dir) / INDEX_DIR_NAME / CHECKPOINT_DIR_NAME / f"{mode}.json"
+        )
+
+    def load(self):
+        """記録された進捗を読み込む（記録がない場合はNone）"""
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"チェックポイント {self.path} の読み込みに失敗しました: {e}")
+            return None
+
+    def save(self, **state):
+        """進捗を記録する"""
+        state = {"mode": self.mode, "saved_at": datetime.now().isoformat(), **state}
+        content = json.dumps(state, ensure_ascii=False, indent=2)
+        write_file_atomically(self.path, content.encode("utf-8"))
+
+    def clear(self):
+        """収集が完了したため進捗の記録を削除する"""
+        if self.path.exists():
+            self.path.unlink()
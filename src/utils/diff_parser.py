@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+unified diff 形式の解析
+
+git diff の出力を、GitHub APIのPR変更ファイル一覧（files[]）と同じ形式の
+filename, previous_filename, status, additions, deletions, changes, patch, sha
+を持つ辞書のリストに変換します。patch はGitHub APIと同様に最初のハンク（@@）以降の
+本文で、バイナリファイルなどハンクがない場合は含めません。
+"""
+
+import re
+
+DIFF_HEADER_PREFIX = "diff --git "
+HUNK_PREFIX = "@@"
+NULL_SHA_PATTERN = re.compile(r"^0+$")
+FULL_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# C言語形式のエスケープ（git が特殊な文字を含むパスを引用符で囲む場合に使用する）
+ESCAPES = {
+    "a": 7,
+    "b": 8,
+    "t": 9,
+    "n": 10,
+    "v": 11,
+    "f": 12,
+    "r": 13,
+    '"': 34,
+    "\\": 92,
+}
+
+
+def unquote_path(path):
+    """git が引用符で囲んだパスを元に戻す（日本語などは8進数でエスケープされる）"""
+    if not (len(path) >= 2 and path.startswith('"') and path.endswith('"')):
+        return path
+
+    body = path[1:-1]
+    data = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\" or i + 1 >= len(body):
+            data.extend(char.encode("utf-8"))
+            i += 1
+            continue
+
+        escaped = body[i + 1]
+        octal = body[i + 1 : i + 4]
+        if re.match(r"^[0-7]{3}$", octal):
+            data.append(int(octal, 8))
+            i += 4
+        else:
+            data.append(ESCAPES.get(escaped, ord(escaped)))
+            i += 2
+
+    return data.decode("utf-8", errors="replace")
+
+
+def _strip_prefix(path):
+    """--- a/path や +++ b/path のパスから a/ b/ の接頭辞を取り除く"""
+    path = unquote_path(path.split("\t", 1)[0])
+    if path == "/dev/null":
+        return None
+    if path[:2] in ("a/", "b/"):
+        return path[2:]
+    return path
+
+
+def _paths_from_diff_header(line):
+    """diff --git a/<旧パス> b/<新パス> からパスを取り出す
+
+    パスに空白を含む場合は区切りが曖昧なため、旧パスと新パスが同じ場合のみ分割します。
+    """
+    rest = line[len(DIFF_HEADER_PREFIX) :]
+    if rest.startswith('"'):
+        match = re.match(r'^("(?:[^"\\]|\\.)*") (.*)$', rest)
+        if match:
+            return _strip_prefix(match.group(1)), _strip_prefix(match.group(2))
+
+    half = (len(rest) - 1) // 2
+    old_path, new_path = rest[:half], rest[half + 1 :]
+    if old_path[2:] == new_path[2:]:
+        return _strip_prefix(old_path), _strip_prefix(new_path)
+
+    parts = rest.split(" b/", 1)
+    if len(parts) == 2:
+        return _strip_prefix(parts[0]), parts[1]
+    return None, None
+
+
+def _parse_file_section(lines):
+    """1ファイル分の差分を files[] の要素に変換する"""
+    old_path, new_path = _paths_from_diff_header(lines[0])
+    status = "modified"
+    file_info = {}
+    hunk_start = None
+
+    for index, line in enumerate(lines[1:], start=1):
+        if line.startswith(HUNK_PREFIX):
+            hunk_start = index
+            break
+
+        if line.startswith("new file mode"):
+            status = "added"
+        elif line.startswith("deleted file mode"):
+            status = "removed"
+        elif line.startswith("rename from "):
+            status = "renamed"
+            old_path = unquote_path(line[len("rename from ") :])
+        elif line.startswith("rename to "):
+            new_path = unquote_path(line[len("rename to ") :])
+        elif line.startswith("copy from "):
+            status = "copied"
+            old_path = unquote_path(line[len("copy from ") :])
+        elif line.startswith("copy to "):
+            new_path = unquote_path(line[len("copy to ") :])
+        elif line.startswith("index "):
+            blob_shas = line.split()[1].split("..")
+            if len(blob_shas) == 2:
+                old_sha, new_sha = blob_shas
+                sha = old_sha if NULL_SHA_PATTERN.match(new_sha) else new_sha
+                if FULL_SHA_PATTERN.match(sha):
+                    file_info["sha"] = sha
+        elif line.startswith("--- "):
+            old_path = _strip_prefix(line[4:]) or old_path
+        elif line.startswith("+++ "):
+            new_path = _strip_prefix(line[4:]) or new_path
+
+    filename = new_path if status != "removed" else old_path
+    file_info.update(
+        {
+            "filename": filename or old_path,
+            "status": status,
+            "additions": 0,
+            "deletions": 0,
+            "changes": 0,
+        }
+    )
+    if status in ("renamed", "copied"):
+        file_info["previous_filename"] = old_path
+
+    if hunk_start is not None:
+        hunk_lines = lines[hunk_start:]
+        while hunk_lines and hunk_lines[-1] == "":
+            hunk_lines.pop()
+
+        for line in hunk_lines:
+            if line.startswith("+"):
+                file_info["additions"] += 1
+            elif line.startswith("-"):
+                file_info["deletions"] += 1
+
+        file_info["changes"] = file_info["additions"] + file_info["deletions"]
+        file_info["patch"] = "\n".join(hunk_lines)
+
+    return file_info
+
+
+def iter_file_sections(lines):
+    """diff の行を1ファイル分ずつ区切って返すジェネレータ"""
+    section = []
+    for line in lines:
+        if line.startswith(DIFF_HEADER_PREFIX) and section:
+            yield section
+            section = []
+        if section or line.startswith(DIFF_HEADER_PREFIX):
+            section.append(line)
+
+    if section:
+        yield section
+
+
+def parse_unified_diff(diff_text):
+    """git diff 形式の差分を files[] 形式の辞書のリストに変換する
+
+    改行コードが CRLF のファイルの行末を保つため、行の分割は "\\n" のみで行います。
+    """
+    lines = diff_text.split("\n")
+    return [_parse_file_section(section) for section in iter_file_sections(lines)]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+政策リポジトリのローカルミラー
+
+政策リポジトリのベアリポジトリを collectors.git_mirror_dir に保持し、
+ブランチと全PRのヘッド（refs/pull/*/head）を1回の git fetch で取得します。
+PRの変更ファイル・パッチ・コミット一覧はミラー上で計算するため、
+PRごとのファイル一覧・コミット一覧のAPIリクエストが不要になります
+（ファイル一覧APIの3000件の上限もありません）。
+"""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+from .diff_parser import parse_unified_diff
+
+FETCH_REFSPECS = (
+    "+refs/heads/*:refs/heads/*",
+    "+refs/pull/*/head:refs/pull/*/head",
+)
+
+# git log の出力の区切り文字（項目の区切りとコミットの区切り）
+FIELD_SEPARATOR = "\x00"
+RECORD_SEPARATOR = "\x1e"
+LOG_FORMAT = "%H%x00%an%x00%ae%x00%ad%x00%cn%x00%ce%x00%cd%x00%B%x1e"
+
+
+class GitMirror:
+    """政策リポジトリのベアミラーを操作するクラス"""
+
+    def __init__(self, mirror_dir, remote_url):
+        """初期化"""
+        self.mirror_dir = Path(mirror_dir)
+        self.remote_url = remote_url
+        self._fetch_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """設定ファイルの collectors.git_mirror_dir と github の設定からミラーを作成する"""
+        collectors_config = config.get("collectors", {})
+        github_config = config["github"]
+
+        remote_url = collectors_config.get("git_remote_url") or (
+            f"https://github.com/{github_config['repo_owner']}/"
+            f"{github_config['repo_name']}.git"
+        )
+        mirror_dir = collectors_config.get("git_mirror_dir", ".cache/git-mirror")
+        return cls(mirror_dir, remote_url)
+
+    def _git(self, *args, check=True):
+        """ミラーに対して git コマンドを実行し、標準出力を返す"""
+        env = dict(os.environ, TZ="UTC", GIT_TERMINAL_PROMPT="0")
+        result = subprocess.run(
+            ["git", "-c", "core.quotepath=false", "--git-dir", str(self.mirror_dir)]
+            + list(args),
+            capture_output=True,
+            env=env,
+        )
+        if check and result.returncode != 0:
+            raise RuntimeError(
+                f"git {' '.join(args)} が失敗しました: "
+                f"{result.stderr.decode('utf-8', errors='replace').strip()}"
+            )
+        return result.stdout.decode("utf-8", errors="replace")
+
+    def ensure(self):
+        """ミラーが存在しない場合はベアリポジトリとして作成する"""
+        if (self.mirror_dir / "HEAD").exists():
+            self._git("remote", "set-url", "origin", self.remote_url)
+            return
+
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        self._git("init", "--bare", "--quiet")
+        self._git("remote", "add", "origin", self.remote_url)
+        print(f"ミラーリポジトリを作成しました: {self.mirror_dir}")
+
+    def fetch(self, refspecs=FETCH_REFSPECS):
+        """ブランチと全PRのヘッドを1回の git fetch で取得する"""
+        with self._fetch_lock:
+            self.ensure()
+            print(f"{self.remote_url} からミラーを更新中...")
+            self._git("fetch", "--prune", "--quiet", "origin", *refspecs)
+
+    def fetch_pr_head(self, pr_number):
+        """指定されたPRのヘッドとブランチのみを取得する"""
+        self.fetch(
+            (
+                FETCH_REFSPECS[0],
+                f"+refs/pull/{pr_number}/head:refs/pull/{pr_number}/head",
+            )
+        )
+
+    def pull_heads(self):
+        """ミラー上の全PRのヘッドのコミットを {PR番号: SHA} で返す"""
+        output = self._git(
+            "for-each-ref", "--format=%(refname) %(objectname)", "refs/pull/"
+        )
+        heads = {}
+        for line in output.splitlines():
+            refname, sha = line.split(" ", 1)
+            parts = refname.split("/")
+            if len(parts) == 4 and parts[2].isdigit() and parts[3] == "head":
+                heads[int(parts[2])] = sha
+        return heads
+
+    def resolve(self, revision):
+        """リビジョンのコミットSHAを返す（ミラーにない場合はNone）"""
+        output = self._git(
+            "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}", check=False
+        )
+        return output.strip() or None
+
+    def merge_base(self, base, head):
+        """ベースとヘッドの分岐点のコミットSHAを返す（共通の祖先がない場合はNone）"""
+        output = self._git("merge-base", base, head, check=False)
+        return output.strip() or None
+
+    def diff_files(self, base, head):
+        """分岐点からヘッドまでの変更を files[] 形式で返す（GitHubの3点比較と同じ）"""
+        merge_base = self.merge_base(base, head)
+        if not merge_base:
+            return None
+
+        diff_text = self._git(
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            "--full-index",
+            "--find-renames",
+            merge_base,
+            head,
+        )
+        return parse_unified_diff(diff_text)
+
+    def log_commits(self, base, head, html_base_url=None):
+        """ベースに含まれずヘッドに含まれるコミットを古い順に commits[] 形式で返す"""
+        output = self._git(
+            "log",
+            "--reverse",
+            "--date=format-local:%Y-%m-%dT%H:%M:%SZ",
+            f"--format={LOG_FORMAT}",
+            f"{base}..{head}",
+        )
+
+        commits = []
+        for record in output.split(RECORD_SEPARATOR):
+            record = record.lstrip("\n")
+            if not record:
+                continue
+
+            sha, author_name, author_email, author_date, *rest = record.split(
+                FIELD_SEPARATOR
+            )
+            committer_name, committer_email, committer_date, message = rest
+            commit = {
+                "sha": sha,
+                "commit": {
+                    "message": message.rstrip("\n"),
+                    "author": {
+                        "name": author_name,
+                        "email": author_email,
+                        "date": author_date,
+                    },
+                    "committer": {
+                        "name": committer_name,
+                        "email": committer_email,
+                        "date": committer_date,
+                    },
+                },
+            }
+            if html_base_url:
+                commit["html_url"] = f"{html_base_url}/commit/{sha}"
+            commits.append(commit)
+
+        return commits
@@ -7,23 +7,59 @@ GitHubのAPIを呼び出すための共通機能を提供します。
 
 import datetime
 import os
+import threading
 import time
 import yaml
 from pathlib import Path
 
 import backoff
 import requests
+from requests.adapters import HTTPAdapter
 
+from .http_cache import ETagCache
+from .pr_store import open_pr_store
+from .rate_limiter import RateLimitGovernor
 
-def load_config():
+DEFAULT_POOL_SIZE = 10
+DEFAULT_PER_PAGE = 100
+MAX_RATE_LIMIT_RETRIES = 5
+
+_UNSET = object()
+
+_config = None
+_token = _UNSET
+_settings_lock = threading.RLock()
+
+_session = None
+_session_lock = threading.Lock()
+
+_governor = None
+_etag_cache = _UNSET
+
+
+def _read_config_file():
     """設定ファイルを読み込む"""
     config_path = Path(__file__).parent.parent.parent / "config" / "settings.yaml"
     with open(config_path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
-def get_github_token():
-    """環境変数からGitHubトークンを取得する"""
+def load_config():
+    """設定を取得する
+
+    設定ファイルは最初の呼び出し時に一度だけ読み込まれ、以降はプロセス内で
+    同じオブジェクトを共有します。共有オブジェクトのため呼び出し側で変更しないでください。
+    """
+    global _config
+    if _config is None:
+        with _settings_lock:
+            if _config is None:
+                _config = _read_config_file()
+    return _config
+
+
+def _resolve_github_token():
+    """環境変数または gh CLI からGitHubトークンを解決する"""
     config = load_config()
     token_env_var = config["github"]["token_env_var"]
 
@@ -43,6 +79,16 @@ def get_github_token():
     return token
 
 
+def get_github_token():
+    """GitHubトークンを取得する（解決結果はプロセス内でキャッシュされる）"""
+    global _token
+    if _token is _UNSET:
+        with _settings_lock:
+            if _token is _UNSET:
+                _token = _resolve_github_token()
+    return _token
+
+
 def get_headers():
     """APIリクエスト用のヘッダーを取得する"""
     token = get_github_token()
@@ -53,6 +99,189 @@ def get_headers():
     return headers
 
 
+def reset_settings_cache():
+    """設定と認証情報のキャッシュを破棄する
+
+    長時間稼働するプロセスで設定ファイルやトークンを更新した場合に呼び出します。
+    接続プールのサイズも設定に依存するため、共有セッションも閉じられます。
+    """
+    global _config, _token, _governor, _etag_cache
+    with _settings_lock:
+        _config = None
+        _token = _UNSET
+        _governor = None
+        _etag_cache = _UNSET
+    close_session()
+
+
+def _create_session():
+    """接続プールを設定したHTTPセッションを作成する"""
+    config = load_config()
+    pool_size = config.get("collectors", {}).get("max_workers", DEFAULT_POOL_SIZE)
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """プロセス内で共有するKeep-Alive対応のHTTPセッションを取得する
+
+    接続プールのサイズは collectors.max_workers に合わせるため、
+    複数スレッドから同時に呼び出してもTCP/TLS接続が再利用されます。
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def close_session():
+    """共有HTTPセッションを閉じる（次回の get_session で再作成される）"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_rate_limit_governor():
+    """プロセス内で共有するレート制限管理オブジェクトを取得する"""
+    global _governor
+    if _governor is None:
+        with _settings_lock:
+            if _governor is None:
+                _governor = RateLimitGovernor.from_config(load_config())
+    return _governor
+
+
+def get_etag_cache():
+    """ETagキャッシュを取得する（api.conditional_requests が無効の場合はNone）"""
+    global _etag_cache
+    if _etag_cache is _UNSET:
+        with _settings_lock:
+            if _etag_cache is _UNSET:
+                api_config = load_config().get("api", {})
+                cache_dir = api_config.get("etag_cache_dir")
+                if api_config.get("conditional_requests") and cache_dir:
+                    _etag_cache = ETagCache.from_config(api_config)
+                else:
+                    _etag_cache = None
+    return _etag_cache
+
+
+def enable_etag_cache(cache_dir):
+    """設定にかかわらず、指定したディレクトリでETagキャッシュを有効にする"""
+    global _etag_cache
+    api_config = load_config().get("api", {})
+    with _settings_lock:
+        _etag_cache = ETagCache.from_config(api_config, cache_dir)
+
+
+def _send_with_rate_limit(method, url, resource="core", **kwargs):
+    """レート制限に合わせて待機しながらリクエストを送信する
+
+    レスポンスヘッダーで予算を更新し、二次レート制限などで拒否された場合は
+    Retry-After またはリセット時刻まで待機して再送します。
+    """
+    governor = get_rate_limit_governor()
+
+    for attempt in range(MAX_RATE_LIMIT_RETRIES):
+        governor.wait(resource)
+        response = get_session().request(method, url, **kwargs)
+        governor.update_from_response(response)
+
+        delay = governor.retry_delay(response, attempt)
+        if delay is None:
+            break
+
+        print(f"レート制限により拒否されました。{delay:.1f}秒後に再試行します...")
+        time.sleep(delay)
+
+    return response
+
+
+@backoff.on_exception(
+    backoff.expo,
+    (requests.exceptions.RequestException, requests.exceptions.HTTPError),
+    max_tries=5,
+    max_time=30,
+    giveup=lambda e: isinstance(e, requests.exceptions.HTTPError)
+    # 認証エラーや取得できないリソース（大きすぎる差分など）の場合は再試行しない
+    and e.response.status_code in [401, 403, 404, 406, 422],
+)
+def send_github_api_request(url, params=None, headers=None, use_cache=True):
+    """GitHubのAPIリクエストを実行し、再試行ロジックを適用してレスポンスを返す
+
+    ETagキャッシュが有効な場合は条件付きリクエストを送信し、
+    304が返されたときはキャッシュした内容を200レスポンスとして返します。
+    """
+    if headers is None:
+        headers = get_headers()
+
+    cache = get_etag_cache() if use_cache else None
+    cache_entry = None
+    if cache:
+        cache_key = cache.make_key(url, params, headers.get("Accept"))
+        cache_entry = cache.get(cache_key)
+        if cache_entry:
+            headers = {**headers, **cache.conditional_headers(cache_entry)}
+
+    response = _send_with_rate_limit("GET", url, headers=headers, params=params)
+
+    if cache_entry and response.status_code == 304:
+        return cache.to_response(cache_entry, response)
+
+    response.raise_for_status()
+
+    if cache:
+        cache.store(cache_key, response)
+    return response
+
+
+def make_github_api_request(url, params=None, headers=None, use_cache=True):
+    """GitHubのAPIリクエストを実行し、JSONをデコードして返す"""
+    return send_github_api_request(url, params, headers, use_cache).json()
+
+
+def iter_github_api_pages(url, params=None, headers=None, per_page=DEFAULT_PER_PAGE):
+    """一覧APIの結果をページ単位で返すジェネレータ
+
+    Linkヘッダーの rel="next" を辿るため、ページ番号を推測して
+    空ページを取得する余分なリクエストは発生しません。
+    """
+    params = dict(params or {})
+    params.setdefault("per_page", per_page)
+
+    while url:
+        response = send_github_api_request(url, params, headers)
+        yield response.json()
+
+        url = response.links.get("next", {}).get("url")
+        params = None  # nextのURLにはクエリパラメータが含まれている
+
+
+def fetch_all_pages(url, params=None, headers=None, per_page=DEFAULT_PER_PAGE):
+    """一覧APIの全ページを取得して1つのリストにまとめる"""
+    items = []
+    for page in iter_github_api_pages(url, params, headers, per_page):
+        items.extend(page)
+    return items
+
+
+class GitHubGraphQLError(Exception):
+    """GraphQL APIがエラーを返した場合の例外"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        messages = "; ".join(error.get("message", str(error)) for error in errors)
+        super().__init__(f"GraphQL APIエラー: {messages}")
+
+
 @backoff.on_exception(
     backoff.expo,
     (requests.exceptions.RequestException, requests.exceptions.HTTPError),
@@ -62,14 +291,21 @@ def get_headers():
     and e.response.status_code
     in [401, 403, 404],  # 認証エラーやリソースが存在しない場合は再試行しない
 )
-def make_github_api_request(url, params=None, headers=None):
-    """GitHubのAPIリクエストを実行し、再試行ロジックを適用する"""
+def make_graphql_request(url, query, variables=None, headers=None):
+    """GitHubのGraphQL APIリクエストを実行し、dataを返す"""
     if headers is None:
         headers = get_headers()
 
-    response = requests.get(url, headers=headers, params=params)
+    payload = {"query": query, "variables": variables or {}}
+    response = _send_with_rate_limit(
+        "POST", url, resource="graphql", headers=headers, json=payload
+    )
     response.raise_for_status()
-    return response.json()
+
+    result = response.json()
+    if result.get("errors"):
+        raise GitHubGraphQLError(result["errors"])
+    return result["data"]
 
 
 @backoff.on_exception(
@@ -78,12 +314,16 @@ def make_github_api_request(url, params=None, headers=None):
     max_tries=3,
 )
 def check_rate_limit():
-    """GitHub APIのレート制限状況を確認する"""
+    """GitHub APIのレート制限状況を確認する
+
+    通常のAPIリクエストではレスポンスヘッダーから自動的に把握されるため、
+    このエンドポイントを明示的に呼び出す必要があるのは診断時などに限られます。
+    """
     config = load_config()
     api_base_url = config["github"]["api_base_url"]
 
     url = f"{api_base_url}/rate_limit"
-    response = requests.get(url, headers=get_headers())
+    response = get_session().get(url, headers=get_headers())
     response.raise_for_status()
 
     rate_limit_data = response.json()
@@ -93,9 +333,12 @@ def check_rate_limit():
     reset_time = datetime.datetime.fromtimestamp(core_rate["reset"])
     now = datetime.datetime.now()
 
-    print(f"API制限: 残り {remaining} リクエスト")
+    get_rate_limit_governor().record(
+        "core", remaining, core_rate["reset"], core_rate.get("limit")
+    )
+
     print(
-        f"制限リセット時間: {reset_time} (あと {(reset_time - now).total_seconds() / 60:.1f} 分)"
+        f"API制限: 残り {remaining} リクエスト (リセット: {reset_time}, あと {(reset_time - now).total_seconds() / 60:.1f} 分)"
     )
 
     return remaining, reset_time
@@ -121,13 +364,5 @@ def get_max_pr_number_from_local_data(prs_dir_path):
     if not prs_dir.exists() or not prs_dir.is_dir():
         return None
 
-    max_pr_number = 0
-    for json_file in prs_dir.glob("*.json"):
-        if json_file.name != "last_run_info.json":
-            try:
-                pr_number = int(json_file.stem)
-                max_pr_number = max(max_pr_number, pr_number)
-            except ValueError:
-                continue
-
-    return max_pr_number if max_pr_number > 0 else None
+    with open_pr_store(prs_dir) as store:
+        return store.max_number()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+GitHub APIレスポンスのETagキャッシュ
+
+取得済みのレスポンスをETag/Last-Modifiedと共にディスクへ保存し、
+条件付きリクエスト（If-None-Match / If-Modified-Since）に304が返された場合は
+保存済みの内容を返します。GitHubは304レスポンスを主レート制限に数えません。
+
+本文は差分（application/vnd.github.diff）などテキストとして復元できない
+レスポンスもそのまま返せるよう、バイト列をBase64で保存します。
+キャッシュは最後に使用した日時（ファイルの更新日時）で管理し、
+api.etag_cache_max_age_days を過ぎたエントリと、
+api.etag_cache_max_entries を超えた古いエントリを削除します。
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+CACHE_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_MAX_AGE_DAYS = 30
+
+# この件数を保存するごとに上限を超えたエントリを削除する
+PRUNE_INTERVAL = 1000
+
+
+class ETagCache:
+    """URLとパラメータをキーにレスポンスを保存するディスクキャッシュ"""
+
+    def __init__(
+        self,
+        cache_dir,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        max_age_days=DEFAULT_MAX_AGE_DAYS,
+    ):
+        """初期化（max_entries, max_age_days に None を指定した場合は制限しない）"""
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400 if max_age_days else None
+
+        self._stored_count = 0
+        self._prune_lock = threading.Lock()
+        self.prune()
+
+    @classmethod
+    def from_config(cls, api_config, cache_dir=None):
+        """設定ファイルの api セクションから作成する"""
+        return cls(
+            cache_dir or api_config["etag_cache_dir"],
+            max_entries=api_config.get("etag_cache_max_entries", DEFAULT_MAX_ENTRIES),
+            max_age_days=api_config.get(
+                "etag_cache_max_age_days", DEFAULT_MAX_AGE_DAYS
+            ),
+        )
+
+    @staticmethod
+    def make_key(url, params=None, accept=None):
+        """URL・クエリパラメータ・Acceptヘッダーからキャッシュキーを作成する"""
+        source = json.dumps(
+            [url, sorted((params or {}).items()), accept],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        """キャッシュファイルのパスを取得する"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _is_expired(self, mtime):
+        """最後に使用した日時が保存期間を過ぎているか"""
+        return self.max_age is not None and time.time() - mtime > self.max_age
+
+    def get(self, key):
+        """キャッシュされたエントリを取得する（存在しない場合や期限切れの場合はNone）"""
+        path = self._path(key)
+        try:
+            if self._is_expired(path.stat().st_mtime):
+                path.unlink()
+                return None
+
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != CACHE_VERSION:
+                return None
+
+            # 使用した日時を記録し、よく使うエントリが削除されないようにする
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, entry):
+        """キャッシュエントリから条件付きリクエスト用のヘッダーを作成する"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response):
+        """ETagまたはLast-Modifiedを持つ200レスポンスを保存する"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        entry = {
+            "version": CACHE_VERSION,
+            "url": response.url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "link": response.headers.get("Link"),
+            "content_type": response.headers.get("Content-Type"),
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._stored_count += 1
+        if self._stored_count % PRUNE_INTERVAL == 0:
+            self.prune()
+
+    def prune(self):
+        """期限切れのエントリと、件数の上限を超えた古いエントリを削除し、削除した件数を返す"""
+        if not self.cache_dir.exists():
+            return 0
+
+        with self._prune_lock:
+            entries = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+
+            entries.sort(reverse=True)
+            expired = [path for mtime, path in entries if self._is_expired(mtime)]
+            kept = len(entries) - len(expired)
+            if self.max_entries is not None and kept > self.max_entries:
+                expired.extend(path for _, path in entries[self.max_entries : kept])
+
+            removed_count = 0
+            for path in expired:
+                try:
+                    path.unlink()
+                    removed_count += 1
+                except OSError:
+                    continue
+
+        if removed_count:
+            print(f"ETagキャッシュから{removed_count}件の古いエントリを削除しました")
+        return removed_count
+
+    def to_response(self, entry, not_modified):
+        """キャッシュエントリを通常の200レスポンスとして復元する
+
+        304レスポンスのレート制限ヘッダーは引き継ぎます。
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response._content = base64.b64decode(entry["body"])
+
+        response.headers.update(not_modified.headers)
+        if entry.get("link"):
+            response.headers["Link"] = entry["link"]
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        response.headers["X-From-ETag-Cache"] = "1"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
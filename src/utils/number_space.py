@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Issue/PR番号空間マップ
+
+GitHubではIssueとPRが共通の連番を使用するため、PR番号の欠番が
+「未収集のPR」なのか「Issue」なのか「削除済み」なのかを区別する必要があります。
+このモジュールは issues?state=all の一覧（1リクエストで100番号）から
+全番号を PR / Issue / 削除済み に分類し、連続範囲の形で
+PRデータディレクトリ内の .index/number_space.json に保存します。
+
+2回目以降は前回記録した最大番号より新しい番号だけを取得して追記します。
+"""
+
+import json
+from pathlib import Path
+
+from .github_api import iter_github_api_pages
+from .pr_manifest import INDEX_DIR_NAME, write_file_atomically
+
+NUMBER_SPACE_FILE_NAME = "number_space.json"
+NUMBER_SPACE_VERSION = 1
+
+KINDS = ("pr", "issue", "deleted")
+
+
+def compress_ranges(numbers):
+    """番号の集合を [開始, 終了] の連続範囲のリストに変換する"""
+    ranges = []
+    for number in sorted(numbers):
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ranges
+
+
+def expand_ranges(ranges):
+    """連続範囲のリストを番号の集合に戻す"""
+    numbers = set()
+    for start, end in ranges:
+        numbers.update(range(start, end + 1))
+    return numbers
+
+
+def format_ranges(ranges):
+    """連続範囲を "#1-#5" 形式の文字列のリストに変換する"""
+    return [
+        f"#{start}" if start == end else f"#{start}-#{end}" for start, end in ranges
+    ]
+
+
+class NumberSpaceMap:
+    """リポジトリの番号をPR・Issue・削除済みに分類したマップ"""
+
+    def __init__(self, prs_dir, config):
+        """初期化"""
+        github_config = config["github"]
+        self.issues_url = (
+            f"{github_config['api_base_url']}/repos/"
+            f"{github_config['repo_owner']}/{github_config['repo_name']}/issues"
+        )
+
+        self.path = Path(prs_dir) / INDEX_DIR_NAME / NUMBER_SPACE_FILE_NAME
+        self.max_number = 0
+        self._numbers = {kind: set() for kind in KINDS}
+        self._load()
+
+    def _load(self):
+        """保存済みのマップを読み込む"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != NUMBER_SPACE_VERSION:
+                return
+
+            self.max_number = data["max_number"]
+            for kind in KINDS:
+                self._numbers[kind] = expand_ranges(data["ranges"][kind])
+        except Exception as e:
+            print(
+                f"番号空間マップ {self.path} の読み込みに失敗したため作り直します: {e}"
+            )
+            self.max_number = 0
+            self._numbers = {kind: set() for kind in KINDS}
+
+    def save(self):
+        """マップを連続範囲の形で保存する"""
+        data = {
+            "version": NUMBER_SPACE_VERSION,
+            "max_number": self.max_number,
+            "ranges": {kind: compress_ranges(self._numbers[kind]) for kind in KINDS},
+        }
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        write_file_atomically(self.path, content.encode("utf-8"))
+
+    def refresh(self, full=False):
+        """前回の最大番号より新しい番号を取得してマップを更新する
+
+        issues?state=all を作成日時の降順に取得し、既知の番号に達した時点で打ち切ります。
+        一覧に現れない番号は削除済み（または移管済み）として扱います。
+        full=True の場合は全番号を取得し直します。取得に失敗した場合はFalseを返します。
+        """
+        known_max = 0 if full else self.max_number
+        found = {"pr": set(), "issue": set()}
+        newest = known_max
+
+        params = {"state": "all", "sort": "created", "direction": "desc"}
+
+        try:
+            for items in iter_github_api_pages(self.issues_url, params):
+                new_items = [item for item in items if item["number"] > known_max]
+                for item in new_items:
+                    kind = "pr" if "pull_request" in item else "issue"
+                    found[kind].add(item["number"])
+                    newest = max(newest, item["number"])
+
+                if len(new_items) < len(items):
+                    break
+        except Exception as e:
+            print(f"警告: 番号空間マップの更新に失敗しました: {e}")
+            return False
+
+        if full:
+            self._numbers = {kind: set() for kind in KINDS}
+
+        new_range = set(range(known_max + 1, newest + 1))
+        self._numbers["pr"] |= found["pr"]
+        self._numbers["issue"] |= found["issue"]
+        self._numbers["deleted"] |= new_range - found["pr"] - found["issue"]
+        self.max_number = newest
+
+        if new_range or full:
+            self.save()
+            print(
+                f"番号空間マップを更新しました: #{known_max + 1}-#{newest} "
+                f"(PR {len(found['pr'])}件, Issue {len(found['issue'])}件)"
+            )
+        return True
+
+    def classify(self, number):
+        """番号の種別（"pr" / "issue" / "deleted"）を返す（未取得の場合はNone）"""
+        for kind in KINDS:
+            if number in self._numbers[kind]:
+                return kind
+        return None
+
+    def pr_numbers(self):
+        """PR番号の集合を返す"""
+        return set(self._numbers["pr"])
+
+    def issue_numbers(self):
+        """Issue番号の集合を返す"""
+        return set(self._numbers["issue"])
+
+    def deleted_numbers(self):
+        """削除済み（一覧に存在しない）番号の集合を返す"""
+        return set(self._numbers["deleted"])
+
+    def ranges(self, kind):
+        """指定した種別の連続範囲のリストを返す"""
+        return compress_ranges(self._numbers[kind])
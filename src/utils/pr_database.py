@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+PRデータのSQLiteストア
+
+data.storage_type が sqlite の場合に、PRデータをPRデータディレクトリ内の
+prs.sqlite3 に保存します。PRデータ全体はJSONとして prs テーブルに保持し、
+ラベル・変更ファイル・コメント・コミットは検索用に正規化したテーブルにも記録します。
+状態・作成日時・マージ日時・作成者・ラベルにはインデックスを作成するため、
+PRStore と同じ query / stats による絞り込みと集計を、
+PRデータを読み込まずにSQLで行えます。
+
+データベースファイルは1つのバイナリのため、PRデータと一緒にコミットしても
+差分やマージができません。そのためPRデータディレクトリの .gitignore で
+コミットの対象から外します（コミットするPRデータは file_per_pr で保存します）。
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from .blob_store import BlobStore, dedupe_patches
+from .pr_format import decode_pr_data, encode_pr_data
+from .pr_manifest import (
+    VOLATILE_FIELDS,
+    ensure_gitignored,
+    hash_content,
+    summarize_pr_data,
+)
+
+DATABASE_FILE_NAME = "prs.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prs (
+    number INTEGER PRIMARY KEY,
+    title TEXT,
+    state TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    merged_at TEXT,
+    author TEXT,
+    html_url TEXT,
+    collected_at TEXT,
+    hash TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS labels (
+    pr_number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    color TEXT,
+    description TEXT,
+    PRIMARY KEY (pr_number, name)
+);
+CREATE TABLE IF NOT EXISTS files (
+    pr_number INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT,
+    additions INTEGER,
+    deletions INTEGER,
+    changes INTEGER
+);
+CREATE TABLE IF NOT EXISTS comments (
+    pr_number INTEGER NOT NULL,
+    id INTEGER,
+    kind TEXT NOT NULL,
+    author TEXT,
+    path TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS commits (
+    pr_number INTEGER NOT NULL,
+    sha TEXT,
+    author TEXT,
+    date TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prs_state ON prs (state);
+CREATE INDEX IF NOT EXISTS idx_prs_created_at ON prs (created_at);
+CREATE INDEX IF NOT EXISTS idx_prs_updated_at ON prs (updated_at);
+CREATE INDEX IF NOT EXISTS idx_prs_merged_at ON prs (merged_at);
+CREATE INDEX IF NOT EXISTS idx_prs_author ON prs (author);
+CREATE INDEX IF NOT EXISTS idx_labels_name ON labels (name, pr_number);
+CREATE INDEX IF NOT EXISTS idx_files_pr_number ON files (pr_number);
+CREATE INDEX IF NOT EXISTS idx_files_filename ON files (filename);
+CREATE INDEX IF NOT EXISTS idx_comments_pr_number ON comments (pr_number);
+CREATE INDEX IF NOT EXISTS idx_commits_pr_number ON commits (pr_number);
+"""
+
+CHILD_TABLES = ("labels", "files", "comments", "commits")
+
+# PRの状態・日時とラベル名の一覧（PRデータと同じ順序）を1行で取得するSQL
+SUMMARY_SQL = """
+SELECT number, state, created_at, updated_at, merged_at, closed_at, author,
+    collected_at,
+    (SELECT json_group_array(name) FROM (
+        SELECT name FROM labels WHERE pr_number = prs.number ORDER BY rowid
+    )) AS label_names
+FROM prs
+"""
+
+# PRデータ全体を保存する形式
+DATA_FORMAT = "json_compact"
+
+
+def normalize_pr_data(pr_data):
+    """PRデータのラベル・変更ファイル・コメント・コミットをテーブルごとの行に変換する
+
+    SQLiteストアの検索用テーブルとParquet形式のエクスポートで共通の列を使用します。
+    """
+    pr_number = pr_data["basic_info"]["number"]
+
+    labels = {}
+    for label in pr_data.get("labels", []):
+        if label.get("name"):
+            labels.setdefault(
+                label["name"],
+                {
+                    "pr_number": pr_number,
+                    "name": label["name"],
+                    "color": label.get("color"),
+                    "description": label.get("description"),
+                },
+            )
+
+    return {
+        "labels": list(labels.values()),
+        "files": [
+            {
+                "pr_number": pr_number,
+                "filename": file_info.get("filename"),
+                "status": file_info.get("status"),
+                "additions": file_info.get("additions"),
+                "deletions": file_info.get("deletions"),
+                "changes": file_info.get("changes"),
+            }
+            for file_info in pr_data.get("files", [])
+        ],
+        "comments": [
+            {
+                "pr_number": pr_number,
+                "id": comment.get("id"),
+                "kind": kind,
+                "author": (comment.get("user") or {}).get("login"),
+                "path": comment.get("path"),
+                "created_at": comment.get("created_at"),
+                "updated_at": comment.get("updated_at"),
+                "body": comment.get("body"),
+            }
+            for kind, key in (("issue", "comments"), ("review", "review_comments"))
+            for comment in pr_data.get(key, [])
+        ],
+        "commits": [
+            {
+                "pr_number": pr_number,
+                "sha": commit.get("sha"),
+                "author": (commit.get("author") or {}).get("login"),
+                "date": ((commit.get("commit") or {}).get("author") or {}).get("date"),
+                "message": (commit.get("commit") or {}).get("message"),
+            }
+            for commit in pr_data.get("commits", [])
+        ],
+    }
+
+
+class SQLitePRStore:
+    """PRデータをSQLiteデータベースに読み書きするクラス
+
+    PRStore と同じメソッドを持つため、収集・分析・レポート生成の各ツールから
+    同じ方法で使用できます。
+    """
+
+    def __init__(self, prs_dir, dedupe_patches=False):
+        """初期化"""
+        self.prs_dir = Path(prs_dir)
+        self.prs_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.prs_dir / DATABASE_FILE_NAME
+        # データベースと、SQLiteが同じ名前で作成するジャーナル等はコミットしない
+        ensure_gitignored(self.prs_dir, [f"{DATABASE_FILE_NAME}*"])
+        self.blobs = BlobStore(self.prs_dir)
+        self.dedupe_patches = dedupe_patches
+
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config, prs_dir=None):
+        """設定ファイルの data セクションから作成する"""
+        data_config = config.get("data", {})
+        return cls(
+            prs_dir or data_config["base_dir"],
+            dedupe_patches=data_config.get("dedupe_patches", False),
+        )
+
+    def _fetch(self, sql, params=()):
+        """SQLを実行して全行を返す"""
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def exists(self, pr_number):
+        """PRデータが保存済みか"""
+        return bool(self._fetch("SELECT 1 FROM prs WHERE number = ?", (pr_number,)))
+
+    def load(self, pr_number):
+        """PRデータを読み込む（保存されていない場合はNone）"""
+        rows = self._fetch("SELECT data FROM prs WHERE number = ?", (pr_number,))
+        if not rows:
+            return None
+        return decode_pr_data(rows[0]["data"], DATA_FORMAT)
+
+    def save(self, pr_data):
+        """PRデータを保存し、データベースのパスを返す
+
+        保存済みの内容と変わらない場合は書き込まずにNoneを返します。
+        """
+        pr_number = pr_data["basic_info"]["number"]
+        stored_data = {
+            key: value for key, value in pr_data.items() if key not in VOLATILE_FIELDS
+        }
+        if self.dedupe_patches:
+            stored_data = dedupe_patches(stored_data, self.blobs)
+
+        content = encode_pr_data(stored_data, DATA_FORMAT)
+        content_hash = hash_content(content)
+
+        rows = self._fetch(
+            "SELECT hash, collected_at FROM prs WHERE number = ?", (pr_number,)
+        )
+        if rows and rows[0]["hash"] == content_hash:
+            return None
+
+        if "collected_at" not in pr_data and rows:
+            # 保存済みのデータを書き直す場合は、記録済みの収集日時を引き継ぐ
+            pr_data = {**pr_data, "collected_at": rows[0]["collected_at"]}
+
+        summary = summarize_pr_data(pr_data)
+        basic_info = pr_data["basic_info"]
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                """
+                INSERT OR REPLACE INTO prs (
+                    number, title, state, created_at, updated_at, closed_at,
+                    merged_at, author, html_url, collected_at, hash, data
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    pr_number,
+                    basic_info.get("title"),
+                    summary["state"],
+                    summary["created_at"],
+                    summary["updated_at"],
+                    summary["closed_at"],
+                    summary["merged_at"],
+                    summary["author"],
+                    basic_info.get("html_url"),
+                    summary["collected_at"],
+                    content_hash,
+                    content,
+                ),
+            )
+            self._replace_children(pr_number, stored_data)
+
+        return self.path
+
+    def _replace_children(self, pr_number, pr_data):
+        """ラベル・変更ファイル・コメント・コミットのテーブルを書き換える"""
+        for table in CHILD_TABLES:
+            self.connection.execute(
+                f"DELETE FROM {table} WHERE pr_number = ?", (pr_number,)
+            )
+
+        for table, rows in normalize_pr_data(pr_data).items():
+            if not rows:
+                continue
+            columns = list(rows[0])
+            self.connection.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + column for column in columns)})",
+                rows,
+            )
+
+    def numbers(self):
+        """保存済みのPR番号の集合を返す"""
+        return {row["number"] for row in self._fetch("SELECT number FROM prs")}
+
+    def content_hashes(self):
+        """保存済みのPR番号と内容ハッシュの対応を返す"""
+        return {
+            row["number"]: row["hash"]
+            for row in self._fetch("SELECT number, hash FROM prs")
+        }
+
+    def max_number(self):
+        """保存済みの最大PR番号を返す（PRがない場合はNone）"""
+        return self._fetch("SELECT MAX(number) AS number FROM prs")[0]["number"]
+
+    @staticmethod
+    def _summary(row):
+        """SUMMARY_SQL の行からインデックスのエントリと同じ形式の辞書を作る"""
+        return {
+            "state": row["state"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "merged_at": row["merged_at"],
+            "closed_at": row["closed_at"],
+            "labels": json.loads(row["label_names"]),
+            "author": row["author"],
+            "collected_at": row["collected_at"],
+        }
+
+    def get_summary(self, pr_number):
+        """PRの状態・日時・ラベルなどを取得する（保存されていない場合はNone）"""
+        rows = self._fetch(SUMMARY_SQL + " WHERE number = ?", (pr_number,))
+        return self._summary(rows[0]) if rows else None
+
+    def query(
+        self,
+        state=None,
+        label=None,
+        author=None,
+        created_since=None,
+        updated_since=None,
+        merged=None,
+    ):
+        """絞り込み条件に一致するPR番号とエントリの組をPR番号順に返す"""
+        conditions = []
+        params = []
+        for column, value in (("state", state), ("author", author)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for column, value in (
+            ("created_at", created_since),
+            ("updated_at", updated_since),
+        ):
+            if value:
+                conditions.append(f"{column} >= ?")
+                params.append(value)
+        if label:
+            conditions.append("number IN (SELECT pr_number FROM labels WHERE name = ?)")
+            params.append(label)
+        if merged is not None:
+            conditions.append(
+                "merged_at IS NOT NULL" if merged else "merged_at IS NULL"
+            )
+
+        sql = SUMMARY_SQL
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY number"
+
+        return [(row["number"], self._summary(row)) for row in self._fetch(sql, params)]
+
+    def stats(self):
+        """保存済みのPRを状態別・ラベル別・作成者別・月別に集計する"""
+        state_counts = {"open": 0, "closed": 0, "merged": 0}
+        for row in self._fetch("""
+            SELECT CASE WHEN merged_at IS NOT NULL THEN 'merged' ELSE state END
+                AS state, COUNT(*) AS count
+            FROM prs GROUP BY 1
+            """):
+            state_counts[row["state"]] = row["count"]
+
+        def counts(sql):
+            return {row[0]: row[1] for row in self._fetch(sql)}
+
+        return {
+            "total_prs": self._fetch("SELECT COUNT(*) FROM prs")[0][0],
+            "state_counts": state_counts,
+            "label_counts": counts("SELECT name, COUNT(*) FROM labels GROUP BY name"),
+            "user_counts": counts(
+                "SELECT author, COUNT(*) FROM prs "
+                "WHERE author IS NOT NULL GROUP BY author"
+            ),
+            "monthly_counts": counts(
+                "SELECT substr(created_at, 1, 7), COUNT(*) FROM prs "
+                "WHERE created_at IS NOT NULL GROUP BY 1"
+            ),
+        }
+
+    def iter_pr_data(self, numbers=None):
+        """保存済みのPRデータをPR番号順に返す（numbers を指定した場合はそのPRのみ）"""
+        if numbers is None:
+            rows = self._fetch("SELECT number, data FROM prs ORDER BY number")
+        else:
+            wanted = sorted(set(numbers))
+            rows = [
+                row
+                for start in range(0, len(wanted), 500)
+                for row in self._fetch(
+                    "SELECT number, data FROM prs WHERE number IN (%s) ORDER BY number"
+                    % ",".join("?" * len(wanted[start : start + 500])),
+                    wanted[start : start + 500],
+                )
+            ]
+
+        for row in rows:
+            try:
+                yield decode_pr_data(row["data"], DATA_FORMAT)
+            except Exception as e:
+                print(f"PR #{row['number']} の読み込み中にエラーが発生しました: {e}")
+
+    def close(self):
+        """データベースへの接続を閉じる"""
+        with self._lock:
+            self.connection.close()
+
+    def __enter__(self):
+        """with 文で使用する"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """with 文の終了時に閉じる"""
+        self.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+PRデータファイルの保存形式
+
+data.file_format で選択できる形式:
+- json:         インデント付きJSON（<PR番号>.json）
+- json_compact: 空白を除いたJSON（<PR番号>.json）
+- json_gzip:    空白を除いたJSONをgzip圧縮（<PR番号>.json.gz）
+- json_zstd:    空白を除いたJSONをzstd圧縮（<PR番号>.json.zst、zstandard パッケージが必要）
+- msgpack:      MessagePack（<PR番号>.msgpack、msgpack パッケージが必要）
+"""
+
+import gzip
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+DEFAULT_FILE_FORMAT = "json"
+
+FILE_SUFFIXES = {
+    "json": ".json",
+    "json_compact": ".json",
+    "json_gzip": ".json.gz",
+    "json_zstd": ".json.zst",
+    "msgpack": ".msgpack",
+}
+
+FILE_FORMATS = tuple(FILE_SUFFIXES)
+
+ZSTD_LEVEL = 10
+
+
+def file_suffix(file_format):
+    """保存形式のファイル拡張子を返す"""
+    if file_format not in FILE_SUFFIXES:
+        raise ValueError(f"未対応の保存形式です: {file_format}")
+    return FILE_SUFFIXES[file_format]
+
+
+def check_file_format(file_format):
+    """保存形式が使用可能か確認する（必要なパッケージがない場合は例外）"""
+    file_suffix(file_format)
+    if file_format == "json_zstd" and zstandard is None:
+        raise RuntimeError(
+            "json_zstd 形式には zstandard パッケージが必要です: pip install zstandard"
+        )
+    if file_format == "msgpack" and msgpack is None:
+        raise RuntimeError(
+            "msgpack 形式には msgpack パッケージが必要です: pip install msgpack"
+        )
+
+
+def _dump_compact_json(pr_data):
+    """空白を除いたJSONのバイト列を返す"""
+    return json.dumps(pr_data, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def encode_pr_data(pr_data, file_format=DEFAULT_FILE_FORMAT):
+    """PRデータを保存形式のバイト列に変換する"""
+    check_file_format(file_format)
+
+    if file_format == "json":
+        return json.dumps(pr_data, ensure_ascii=False, indent=2).encode("utf-8")
+    if file_format == "json_compact":
+        return _dump_compact_json(pr_data)
+    if file_format == "json_gzip":
+        # mtimeを固定して、同じ内容からは同じバイト列が得られるようにする
+        return gzip.compress(_dump_compact_json(pr_data), mtime=0)
+    if file_format == "json_zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(
+            _dump_compact_json(pr_data)
+        )
+    return msgpack.packb(pr_data, use_bin_type=True)
+
+
+def decode_pr_data(content, file_format=DEFAULT_FILE_FORMAT):
+    """保存形式のバイト列からPRデータを復元する"""
+    check_file_format(file_format)
+
+    if file_format in ("json", "json_compact"):
+        return json.loads(content)
+    if file_format == "json_gzip":
+        return json.loads(gzip.decompress(content))
+    if file_format == "json_zstd":
+        return json.loads(zstandard.ZstdDecompressor().decompress(content))
+    return msgpack.unpackb(content, raw=False)
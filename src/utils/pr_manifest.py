@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+PRデータのローカルインデックス（マニフェスト）
+
+保存済みPRの状態・ラベル・作成者・収集日時・ファイルサイズ・内容ハッシュを
+PRデータディレクトリ内の .index/manifest.json にまとめて保持し、
+PRごとのJSONファイルを開かずに欠番検出や状態比較を行えるようにします。
+内容ハッシュは、変更のないPRデータの書き込みを省略する判定にも使用します。
+状態・ラベル・作成者・日時による絞り込み（query）と集計（stats）も
+インデックスだけで行えます。
+
+更新は .index/manifest.journal.jsonl への1行追記で記録し、一定件数ごとに
+manifest.json へ一時ファイル経由で書き戻す（コンパクション）ため、
+保存のたびにインデックス全体を書き直すことはありません。
+
+git pull や手作業での復元など、保存処理を経ずに追加・変更・削除された
+データファイルは、reconcile() で照合して反映します。ディレクトリ全体の走査を避けるため
+読み込み時には照合せず、git のチェックアウト後に変更されたファイルを指定して実行します
+（scripts/migrate_pr_store.py --reconcile-index）。
+
+manifest.json はPRデータと一緒にコミットされるため、1件1行で書き出し、
+別々のPRを更新した実行同士の変更が行単位でマージできるようにしています。
+ジャーナルは close() で manifest.json に書き戻されるため、.index/.gitignore で
+コミットの対象から外します。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+INDEX_DIR_NAME = ".index"
+MANIFEST_FILE_NAME = "manifest.json"
+JOURNAL_FILE_NAME = "manifest.journal.jsonl"
+GITIGNORE_FILE_NAME = ".gitignore"
+MANIFEST_VERSION = 2
+
+# ジャーナルがこの行数を超えたらマニフェストへ書き戻す
+COMPACT_THRESHOLD = 500
+
+# データファイルには保存せず、インデックスにのみ記録する項目
+VOLATILE_FIELDS = ("collected_at",)
+
+
+def summarize_pr_data(pr_data):
+    """PRデータからインデックスに保持する項目を取り出す"""
+    basic_info = pr_data.get("basic_info", {})
+    user = basic_info.get("user") or {}
+    return {
+        "state": basic_info.get("state"),
+        "created_at": basic_info.get("created_at"),
+        "updated_at": basic_info.get("updated_at"),
+        "merged_at": basic_info.get("merged_at"),
+        "closed_at": basic_info.get("closed_at"),
+        "labels": [label.get("name") for label in pr_data.get("labels", [])],
+        "author": user.get("login"),
+        "collected_at": pr_data.get("collected_at"),
+    }
+
+
+def summary_matches(
+    summary,
+    state=None,
+    label=None,
+    author=None,
+    created_since=None,
+    updated_since=None,
+    merged=None,
+):
+    """インデックスのエントリが絞り込み条件に一致するか"""
+    if state and summary.get("state") != state:
+        return False
+    if label and label not in summary.get("labels", []):
+        return False
+    if author and summary.get("author") != author:
+        return False
+    if created_since and (summary.get("created_at") or "") < created_since:
+        return False
+    if updated_since and (summary.get("updated_at") or "") < updated_since:
+        return False
+    if merged is not None and bool(summary.get("merged_at")) != merged:
+        return False
+    return True
+
+
+def aggregate_summaries(summaries):
+    """エントリから状態別・ラベル別・作成者別・月別のPR数を集計する"""
+    stats = {
+        "total_prs": 0,
+        "state_counts": {"open": 0, "closed": 0, "merged": 0},
+        "label_counts": defaultdict(int),
+        "user_counts": defaultdict(int),
+        "monthly_counts": defaultdict(int),
+    }
+
+    for summary in summaries:
+        stats["total_prs"] += 1
+
+        state = "merged" if summary.get("merged_at") else summary.get("state")
+        stats["state_counts"][state] = stats["state_counts"].get(state, 0) + 1
+
+        for label in summary.get("labels", []):
+            stats["label_counts"][label] += 1
+
+        if summary.get("author"):
+            stats["user_counts"][summary["author"]] += 1
+
+        created_at = summary.get("created_at")
+        if created_at:
+            stats["monthly_counts"][created_at[:7]] += 1
+
+    stats["label_counts"] = dict(stats["label_counts"])
+    stats["user_counts"] = dict(stats["user_counts"])
+    stats["monthly_counts"] = dict(stats["monthly_counts"])
+    return stats
+
+
+def hash_content(content):
+    """ファイル内容のハッシュを計算する"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def write_file_atomically(path, content):
+    """一時ファイルに書き込んでから置き換えることで、書き込み途中の状態を残さない"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def ensure_gitignored(directory, patterns):
+    """ディレクトリの .gitignore に指定されたパターンが含まれるようにする"""
+    path = Path(directory) / GITIGNORE_FILE_NAME
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    missing = [pattern for pattern in patterns if pattern not in lines]
+    if missing:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines + missing) + "\n", encoding="utf-8")
+
+
+def format_manifest(data):
+    """マニフェストを1件1行のJSONに整形する（PRごとの変更を行単位でマージできるようにする）"""
+    lines = [
+        f"{json.dumps(number)}: {json.dumps(entry, ensure_ascii=False, sort_keys=True)}"
+        for number, entry in sorted(data["prs"].items(), key=lambda item: int(item[0]))
+    ]
+    body = ",\n".join(lines)
+    return f'{{"version": {data["version"]}, "prs": {{\n{body}\n}}}}\n'
+
+
+class PRManifest:
+    """PR番号ごとのメタデータを保持するインデックス
+
+    インデックスが存在しない場合は、最初の参照時にPRデータファイルを一度だけ走査して作成します。
+    """
+
+    def __init__(self, prs_dir, scan, read, compact_threshold=COMPACT_THRESHOLD):
+        """初期化
+
+        scan はPRデータファイルを走査して (PR番号, パス) の組を返す関数、
+        read はファイルを読み込んで (PRデータ, ファイルの内容) を返す関数で、
+        いずれもインデックスの作成時に使用します。
+        """
+        self.prs_dir = Path(prs_dir)
+        self.scan = scan
+        self.read = read
+        self.index_dir = self.prs_dir / INDEX_DIR_NAME
+        self.path = self.index_dir / MANIFEST_FILE_NAME
+        self.journal_path = self.index_dir / JOURNAL_FILE_NAME
+        self.compact_threshold = compact_threshold
+
+        self._entries = None
+        self._journal_lines = 0
+        self._lock = threading.RLock()
+
+    def exists(self):
+        """インデックスがディスク上に存在するか"""
+        return self.path.exists() or self.journal_path.exists()
+
+    def _load(self):
+        """インデックスを読み込む（未作成の場合は作成する）"""
+        if self._entries is not None:
+            return
+
+        if not self.exists():
+            self.rebuild()
+            return
+
+        entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != MANIFEST_VERSION:
+                    print(f"インデックス {self.path} の形式が古いため再作成します")
+                    self.rebuild()
+                    return
+                entries = data["prs"]
+            except Exception as e:
+                print(
+                    f"インデックス {self.path} の読み込みに失敗したため再作成します: {e}"
+                )
+                self.rebuild()
+                return
+
+        self._entries = entries
+        self._journal_lines = self._replay_journal()
+
+    def _replay_journal(self):
+        """ジャーナルの更新をエントリに反映し、行数を返す"""
+        if not self.journal_path.exists():
+            return 0
+
+        count = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 書き込み途中で中断された行は無視する
+                    continue
+                self._entries[str(record.pop("number"))] = record
+                count += 1
+        return count
+
+    def rebuild(self):
+        """PRデータファイルを走査してインデックスを作り直す"""
+        with self._lock:
+            entries = {}
+            for pr_number, path in self.scan():
+                try:
+                    entries[str(pr_number)] = self._make_entry(*self.read(path))
+                except Exception as e:
+                    print(f"警告: {path} の読み込みに失敗しました: {e}")
+
+            self._entries = entries
+            self.compact()
+            print(f"インデックスを作成しました: {len(entries)}件")
+
+    def reconcile(self, targets=None, verify_content=False):
+        """エントリをデータファイルと照合し、反映した件数を返す
+
+        targets に (PR番号, パス) の組を指定した場合はそのファイルのみを、
+        省略した場合は scan() で走査した全ファイルを照合し、ファイルがなくなった
+        エントリを削除します。エントリのないファイルとサイズが異なるファイルは
+        読み込んでエントリを更新します。verify_content が True の場合は、
+        サイズが同じファイルも内容のハッシュで比較します（日時の書き換えなど）。
+        """
+        with self._lock:
+            self._load()
+
+            if targets is None:
+                targets = self.scan()
+                scanned_numbers = {str(pr_number) for pr_number, _ in targets}
+                removed_numbers = set(self._entries) - scanned_numbers
+            else:
+                targets = list(targets)
+                removed_numbers = {
+                    str(pr_number)
+                    for pr_number, path in targets
+                    if not Path(path).exists() and str(pr_number) in self._entries
+                }
+
+            changed_count = len(removed_numbers)
+            for number in removed_numbers:
+                del self._entries[number]
+
+            for pr_number, path in targets:
+                number = str(pr_number)
+                entry = self._entries.get(number)
+                try:
+                    if not Path(path).exists():
+                        continue
+                    if entry and not self._is_modified(entry, path, verify_content):
+                        continue
+                    new_entry = self._make_entry(*self.read(path))
+                except Exception as e:
+                    print(f"警告: {path} の読み込みに失敗しました: {e}")
+                    continue
+
+                if entry:
+                    new_entry["collected_at"] = entry.get("collected_at")
+                self._entries[number] = new_entry
+                changed_count += 1
+
+            if changed_count:
+                print(
+                    f"インデックスをPRデータファイルと照合し、{changed_count}件を反映しました"
+                )
+                self.compact()
+            return changed_count
+
+    @staticmethod
+    def _is_modified(entry, path, verify_content):
+        """データファイルがエントリの記録から変わっているか"""
+        path = Path(path)
+        if entry.get("size") != path.stat().st_size:
+            return True
+        return verify_content and entry.get("hash") != hash_content(path.read_bytes())
+
+    @staticmethod
+    def _make_entry(pr_data, content):
+        """PRデータと保存内容からエントリを作成する"""
+        entry = summarize_pr_data(pr_data)
+        entry["size"] = len(content)
+        entry["hash"] = hash_content(content)
+        return entry
+
+    def get(self, pr_number):
+        """PR番号のエントリを取得する（存在しない場合はNone）"""
+        with self._lock:
+            self._load()
+            return self._entries.get(str(pr_number))
+
+    def entries(self):
+        """PR番号とエントリの組をPR番号順に返す"""
+        with self._lock:
+            self._load()
+            return sorted(
+                ((int(number), entry) for number, entry in self._entries.items()),
+                key=lambda item: item[0],
+            )
+
+    def numbers(self):
+        """保存済みのPR番号の集合を返す"""
+        with self._lock:
+            self._load()
+            return {int(number) for number in self._entries}
+
+    def max_number(self):
+        """保存済みの最大PR番号を返す（PRがない場合はNone）"""
+        numbers = self.numbers()
+        return max(numbers) if numbers else None
+
+    def query(self, **filters):
+        """絞り込み条件に一致するPR番号とエントリの組をPR番号順に返す
+
+        条件は summary_matches の引数（state, label, author, created_since,
+        updated_since, merged）で指定します。
+        """
+        return [
+            (number, entry)
+            for number, entry in self.entries()
+            if summary_matches(entry, **filters)
+        ]
+
+    def stats(self):
+        """保存済みのPRを状態別・ラベル別・作成者別・月別に集計する"""
+        return aggregate_summaries(entry for _, entry in self.entries())
+
+    def update(self, pr_data, content):
+        """保存したPRデータでエントリを更新し、ジャーナルに追記する"""
+        pr_number = pr_data["basic_info"]["number"]
+        entry = self._make_entry(pr_data, content)
+
+        with self._lock:
+            self._load()
+            self._entries[str(pr_number)] = entry
+
+            if not self.journal_path.exists():
+                ensure_gitignored(self.index_dir, [JOURNAL_FILE_NAME])
+            line = json.dumps({"number": pr_number, **entry}, ensure_ascii=False)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._journal_lines += 1
+
+            if self._journal_lines >= self.compact_threshold:
+                self.compact()
+
+    def compact(self):
+        """エントリをマニフェストへ書き戻し、ジャーナルを空にする"""
+        with self._lock:
+            if self._entries is None:
+                return
+
+            data = {"version": MANIFEST_VERSION, "prs": self._entries}
+            write_file_atomically(self.path, format_manifest(data).encode("utf-8"))
+            ensure_gitignored(self.index_dir, [JOURNAL_FILE_NAME])
+
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_lines = 0
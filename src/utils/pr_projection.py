@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+PRデータの保存項目の絞り込み（プロジェクション）
+
+GitHub APIのレスポンスには、分析やレポート生成で使用しない
+ユーザー情報・URL・_links などが多く含まれます。保存前にこのモジュールで
+必要な項目だけを残すことで、PRデータファイルのサイズと読み込み時間を削減します。
+
+絞り込みの対象と残す項目は collectors.projection で変更できます。
+項目は "commit.message" のようにドット区切りで入れ子の値を指定します。
+"""
+
+# src/analyzers, src/generators, src/validators と差分同期で使用する項目
+DEFAULT_PROJECTION = {
+    "labels": ["id", "name", "color", "description"],
+    "comments": [
+        "id",
+        "body",
+        "user.login",
+        "created_at",
+        "updated_at",
+        "html_url",
+    ],
+    "review_comments": [
+        "id",
+        "body",
+        "user.login",
+        "path",
+        "line",
+        "original_line",
+        "in_reply_to_id",
+        "pull_request_review_id",
+        "created_at",
+        "updated_at",
+        "html_url",
+    ],
+    "files": [
+        "sha",
+        "filename",
+        "previous_filename",
+        "status",
+        "additions",
+        "deletions",
+        "changes",
+        "patch",
+        "patch_ref",
+    ],
+    "commits": [
+        "sha",
+        "commit.message",
+        "commit.author.name",
+        "commit.author.date",
+        "commit.committer.date",
+        "author.login",
+        "html_url",
+    ],
+}
+
+
+def get_projection(collectors_config):
+    """設定から絞り込みの定義を取得する（生データを保存する設定の場合はNone）"""
+    if collectors_config.get("keep_raw_payloads", False):
+        return None
+
+    projection = dict(DEFAULT_PROJECTION)
+    projection.update(collectors_config.get("projection") or {})
+    return projection
+
+
+def project_item(item, fields):
+    """要素から指定された項目だけを残した辞書を返す（存在しない項目は含めない）"""
+    projected = {}
+    for field in fields:
+        source = item
+        keys = field.split(".")
+        for key in keys:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            target = projected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = source
+    return projected
+
+
+def project_pr_data(pr_data, projection):
+    """PRデータの各一覧に絞り込みを適用したコピーを返す
+
+    projection に含まれない項目（basic_info など）はそのまま残します。
+    """
+    if projection is None:
+        return pr_data
+
+    projected = dict(pr_data)
+    for key, fields in projection.items():
+        items = pr_data.get(key)
+        if isinstance(items, list):
+            projected[key] = [project_item(item, fields) for item in items]
+    return projected
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+PRデータの保存先（ストア）
+
+PRデータファイルの配置方法を隠蔽し、収集・分析・レポート生成の各ツールが
+同じ方法でPRデータを読み書きできるようにします。
+
+配置方法（data.layout）:
+- flat:    prs/<PR番号>.json
+- sharded: prs/<番号範囲の開始番号>/<PR番号>.json （data.shard_size 件ごとのディレクトリ）
+
+保存形式（data.file_format）は pr_format モジュールを参照してください。
+data.dedupe_patches が true の場合、files[].patch は blob_store モジュールの
+ブロブストアに保存され、PRデータには patch_ref のみが記録されます。
+
+collected_at のように収集のたびに変わる項目はデータファイルには書き込まず、
+インデックス（.index/manifest.json）にのみ記録します。内容に変更がない場合は
+データファイルを書き直さないため、再収集しても差分が発生しません。
+
+使用中の配置方法と保存形式は .index/store.json に記録され、設定ファイルよりも優先されます。
+配置方法・保存形式の変更は scripts/migrate_pr_store.py で行います。
+
+data.storage_type が sqlite の場合は pr_database モジュールの SQLitePRStore を使用します。
+どちらのストアも open_pr_store で開けます。
+"""
+
+import json
+from pathlib import Path
+
+from .blob_store import BlobStore, dedupe_patches
+from .pr_format import (
+    DEFAULT_FILE_FORMAT,
+    check_file_format,
+    decode_pr_data,
+    encode_pr_data,
+    file_suffix,
+)
+from .pr_database import DATABASE_FILE_NAME, SQLitePRStore
+from .pr_manifest import (
+    INDEX_DIR_NAME,
+    VOLATILE_FIELDS,
+    PRManifest,
+    hash_content,
+    write_file_atomically,
+)
+
+STORE_FILE_NAME = "store.json"
+
+LAYOUTS = ("flat", "sharded")
+DEFAULT_LAYOUT = "flat"
+DEFAULT_SHARD_SIZE = 1000
+
+STORAGE_TYPES = ("file_per_pr", "sqlite")
+
+
+class PRStore:
+    """PRデータディレクトリへの読み書きを行うクラス"""
+
+    def __init__(
+        self,
+        prs_dir,
+        layout=None,
+        shard_size=None,
+        file_format=None,
+        dedupe_patches=False,
+    ):
+        """初期化
+
+        ディレクトリに配置方法・保存形式の記録がある場合はそれを使用し、
+        ない場合は引数（省略時は flat / json）を使用します。
+        """
+        self.prs_dir = Path(prs_dir)
+        self.store_path = self.prs_dir / INDEX_DIR_NAME / STORE_FILE_NAME
+
+        recorded = self._read_settings()
+        if recorded is None:
+            settings = {
+                "layout": layout or DEFAULT_LAYOUT,
+                "shard_size": shard_size or DEFAULT_SHARD_SIZE,
+                "file_format": file_format or DEFAULT_FILE_FORMAT,
+            }
+        else:
+            settings = {
+                "layout": recorded.get("layout", DEFAULT_LAYOUT),
+                "shard_size": recorded.get("shard_size", DEFAULT_SHARD_SIZE),
+                "file_format": recorded.get("file_format", DEFAULT_FILE_FORMAT),
+            }
+            for key, requested in (("layout", layout), ("file_format", file_format)):
+                if requested and settings[key] != requested:
+                    print(
+                        f"警告: {self.prs_dir} は {key}={settings[key]} で保存されています。"
+                        f"{requested} に変更するには scripts/migrate_pr_store.py を実行してください"
+                    )
+
+        self.layout = settings["layout"]
+        self.shard_size = settings["shard_size"]
+        self.file_format = settings["file_format"]
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"未対応の配置方法です: {self.layout}")
+        check_file_format(self.file_format)
+
+        self._settings_recorded = recorded is not None
+        self.manifest = PRManifest(self.prs_dir, scan=self.scan, read=self.read_file)
+        self.blobs = BlobStore(self.prs_dir)
+        self.dedupe_patches = dedupe_patches
+
+    @classmethod
+    def from_config(cls, config, prs_dir=None):
+        """設定ファイルの data セクションから作成する"""
+        data_config = config.get("data", {})
+        return cls(
+            prs_dir or data_config["base_dir"],
+            layout=data_config.get("layout"),
+            shard_size=data_config.get("shard_size"),
+            file_format=data_config.get("file_format"),
+            dedupe_patches=data_config.get("dedupe_patches", False),
+        )
+
+    def _read_settings(self):
+        """記録済みの配置方法を読み込む（記録がない場合はNone）"""
+        if not self.store_path.exists():
+            return None
+
+        with open(self.store_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_settings(self):
+        """配置方法と保存形式をディレクトリに記録する"""
+        settings = {"layout": self.layout, "file_format": self.file_format}
+        if self.layout == "sharded":
+            settings["shard_size"] = self.shard_size
+
+        content = json.dumps(settings, ensure_ascii=False, indent=2)
+        write_file_atomically(self.store_path, content.encode("utf-8"))
+        self._settings_recorded = True
+
+    def shard_name(self, pr_number):
+        """PR番号が属するシャードのディレクトリ名を返す"""
+        return f"{pr_number // self.shard_size * self.shard_size:06d}"
+
+    def path_for(self, pr_number):
+        """PR番号のデータファイルのパスを返す"""
+        file_name = f"{pr_number}{file_suffix(self.file_format)}"
+        if self.layout == "sharded":
+            return self.prs_dir / self.shard_name(pr_number) / file_name
+        return self.prs_dir / file_name
+
+    def exists(self, pr_number):
+        """PRデータが保存済みか"""
+        return self.path_for(pr_number).exists()
+
+    def read_file(self, path):
+        """データファイルを読み込み、PRデータとファイルの内容を返す"""
+        content = Path(path).read_bytes()
+        return decode_pr_data(content, self.file_format), content
+
+    def load(self, pr_number):
+        """PRデータを読み込む（保存されていない場合はNone）"""
+        path = self.path_for(pr_number)
+        if not path.exists():
+            return None
+
+        return self.read_file(path)[0]
+
+    def is_unchanged(self, pr_number, content):
+        """保存済みのデータファイルが content と同じ内容か（インデックスのハッシュで判定）"""
+        entry = self.manifest.get(pr_number)
+        if not entry or entry.get("hash") != hash_content(content):
+            return False
+
+        # インデックスの作成後にファイルが差し替えられた場合を除外する
+        path = self.path_for(pr_number)
+        return path.exists() and path.stat().st_size == entry.get("size")
+
+    def save(self, pr_data):
+        """PRデータを保存してインデックスを更新し、保存先のパスを返す
+
+        一時ファイルに書き込んでから置き換えるため、中断されても
+        書き込み途中のファイルが残ることはありません。
+        保存済みの内容と変わらない場合は書き込まずにNoneを返します。
+        """
+        pr_number = pr_data["basic_info"]["number"]
+        path = self.path_for(pr_number)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not self._settings_recorded:
+            self._write_settings()
+
+        stored_data = {
+            key: value for key, value in pr_data.items() if key not in VOLATILE_FIELDS
+        }
+        if self.dedupe_patches:
+            stored_data = dedupe_patches(stored_data, self.blobs)
+
+        content = encode_pr_data(stored_data, self.file_format)
+        if self.is_unchanged(pr_number, content):
+            return None
+
+        if "collected_at" not in pr_data:
+            # 保存済みのデータを書き直す場合は、記録済みの収集日時を引き継ぐ
+            previous = self.manifest.get(pr_number) or {}
+            pr_data = {**pr_data, "collected_at": previous.get("collected_at")}
+
+        write_file_atomically(path, content)
+        self.manifest.update(pr_data, content)
+        return path
+
+    def numbers(self):
+        """保存済みのPR番号の集合を返す"""
+        return self.manifest.numbers()
+
+    def max_number(self):
+        """保存済みの最大PR番号を返す（PRがない場合はNone）"""
+        return self.manifest.max_number()
+
+    def content_hashes(self):
+        """保存済みのPR番号と内容ハッシュの対応を返す"""
+        return {number: entry["hash"] for number, entry in self.manifest.entries()}
+
+    def get_summary(self, pr_number):
+        """PRの状態・日時・ラベルなどをインデックスから取得する（保存されていない場合はNone）"""
+        return self.manifest.get(pr_number)
+
+    def query(self, **filters):
+        """絞り込み条件に一致するPR番号とエントリの組をPR番号順に返す
+
+        条件には state, label, author, created_since, updated_since, merged を指定できます。
+        """
+        return self.manifest.query(**filters)
+
+    def stats(self):
+        """保存済みのPRを状態別・ラベル別・作成者別・月別に集計する"""
+        return self.manifest.stats()
+
+    def scan(self):
+        """データファイルを走査し、PR番号とパスの組をPR番号順に返す
+
+        インデックスを使わずにディレクトリを直接調べます（インデックスの作成・照合用）。
+        """
+        suffix = file_suffix(self.file_format)
+        pattern = f"*{suffix}"
+        if self.layout == "sharded":
+            pattern = f"*/{pattern}"
+
+        found = []
+        for path in self.prs_dir.glob(pattern):
+            number = path.name[: -len(suffix)]
+            if number.isdigit() and not path.parent.name.startswith("."):
+                found.append((int(number), path))
+        return sorted(found, key=lambda item: item[0])
+
+    def reconcile(self, paths=None, verify_content=None):
+        """インデックスをデータファイルと照合し、反映した件数を返す
+
+        git pull などで保存処理を経ずに変更されたデータファイルをインデックスに反映します。
+        paths を指定した場合はそのファイルのみを内容のハッシュまで比較し、
+        省略した場合はディレクトリ全体をファイル一覧とサイズで照合します。
+        PRデータファイル以外のパスは無視します。
+        """
+        if verify_content is None:
+            verify_content = paths is not None
+
+        targets = None
+        if paths is not None:
+            suffix = file_suffix(self.file_format)
+            targets = []
+            for path in paths:
+                path = Path(path)
+                number = path.name[: -len(suffix)]
+                if not path.name.endswith(suffix) or not number.isdigit():
+                    continue
+                if path.resolve() == self.path_for(int(number)).resolve():
+                    targets.append((int(number), path))
+
+        return self.manifest.reconcile(targets, verify_content=verify_content)
+
+    def list_paths(self, numbers=None):
+        """保存済みのPRデータファイルのパスをPR番号順に返す"""
+        saved_numbers = self.manifest.numbers()
+        if numbers is not None:
+            saved_numbers &= set(numbers)
+        return [self.path_for(number) for number in sorted(saved_numbers)]
+
+    def iter_pr_data(self, numbers=None):
+        """保存済みのPRデータをPR番号順に返す（読み込めないファイルは警告して飛ばす）
+
+        numbers を指定した場合は、そのPR番号のデータのみを返します。
+        """
+        for path in self.list_paths(numbers):
+            try:
+                yield self.read_file(path)[0]
+            except Exception as e:
+                print(f"{path}の読み込み中にエラーが発生しました: {e}")
+
+    def close(self):
+        """インデックスを書き戻す"""
+        self.manifest.compact()
+
+    def __enter__(self):
+        """with 文で使用する"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """with 文の終了時に閉じる"""
+        self.close()
+
+    def migrate(self, layout=None, shard_size=None, file_format=None, dry_run=False):
+        """保存済みのPRデータを別の配置方法・保存形式に移行し、移行した件数を返す"""
+        layout = layout or self.layout
+        file_format = file_format or self.file_format
+        if layout not in LAYOUTS:
+            raise ValueError(f"未対応の配置方法です: {layout}")
+        check_file_format(file_format)
+
+        # 配置方法を切り替える前に、現在の配置でインデックスを読み込んでおく
+        self.manifest.numbers()
+
+        source_paths = self.scan()
+        source_format = self.file_format
+        previous = (self.layout, self.shard_size, self.file_format)
+
+        self.layout = layout
+        self.shard_size = shard_size or self.shard_size
+        self.file_format = file_format
+
+        migrated = 0
+        for pr_number, source in source_paths:
+            target = self.path_for(pr_number)
+            if source == target and source_format == file_format:
+                continue
+
+            migrated += 1
+            if dry_run:
+                continue
+
+            if source_format == file_format:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                source.replace(target)
+                continue
+
+            pr_data = decode_pr_data(source.read_bytes(), source_format)
+            content = encode_pr_data(pr_data, file_format)
+            write_file_atomically(target, content)
+            if source != target:
+                source.unlink()
+
+            # 収集日時はデータファイルになくインデックスにのみあるため引き継ぐ
+            previous = self.manifest.get(pr_number) or {}
+            pr_data = {**pr_data, "collected_at": previous.get("collected_at")}
+            self.manifest.update(pr_data, content)
+
+        if dry_run:
+            self.layout, self.shard_size, self.file_format = previous
+            return migrated
+
+        self._write_settings()
+        self.manifest.compact()
+        self.remove_empty_shards()
+
+        return migrated
+
+    def remove_empty_shards(self):
+        """空になったシャードのディレクトリを削除する"""
+        for directory in self.prs_dir.iterdir():
+            if (
+                directory.is_dir()
+                and directory.name.isdigit()
+                and not any(directory.iterdir())
+            ):
+                directory.rmdir()
+
+
+def open_pr_store(prs_dir, config=None):
+    """PRデータディレクトリのストアを開く
+
+    config を指定した場合は data.storage_type に従い、省略した場合は
+    ディレクトリにSQLiteデータベースがあれば SQLitePRStore を、なければ PRStore を返します。
+    """
+    prs_dir = Path(prs_dir)
+    if config is None:
+        if (prs_dir / DATABASE_FILE_NAME).exists():
+            return SQLitePRStore(prs_dir)
+        return PRStore(prs_dir)
+
+    storage_type = config.get("data", {}).get("storage_type", "file_per_pr")
+    if storage_type not in STORAGE_TYPES:
+        raise ValueError(f"未対応の保存方式です: {storage_type}")
+    if storage_type == "sqlite":
+        return SQLitePRStore.from_config(config, prs_dir)
+    return PRStore.from_config(config, prs_dir)
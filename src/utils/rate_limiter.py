@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+GitHub APIのレート制限管理モジュール
+
+レスポンスヘッダー（X-RateLimit-*、Retry-After）からレート制限の状況を把握し、
+リセット時刻までに残りのリクエスト数を均等に使うようにリクエスト間隔を調整します。
+"""
+
+import threading
+import time
+
+# Retry-Afterがない二次レート制限の初回待機時間（秒）
+SECONDARY_LIMIT_WAIT = 60
+MAX_SECONDARY_LIMIT_WAIT = 15 * 60
+
+
+class RateLimitGovernor:
+    """レスポンスヘッダーに基づいてAPIリクエストの間隔を調整するクラス
+
+    リソース（core, graphql など）ごとに残りリクエスト数とリセット時刻を保持し、
+    複数スレッドから同時に使用されても全体として予算を超えないように待機時間を割り当てます。
+    """
+
+    def __init__(
+        self,
+        reserve=10,
+        pace_below_ratio=0.5,
+        min_interval=0.0,
+        buffer_seconds=5,
+        enabled=True,
+    ):
+        """初期化"""
+        self.reserve = reserve
+        self.pace_below_ratio = pace_below_ratio
+        self.min_interval = min_interval
+        self.buffer_seconds = buffer_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._limits = {}
+        self._next_request_at = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """設定ファイルの api セクションから作成する"""
+        api_config = config.get("api", {})
+        return cls(
+            reserve=api_config.get("rate_limit_reserve", 10),
+            pace_below_ratio=api_config.get("pace_below_ratio", 0.5),
+            min_interval=api_config.get("min_request_interval", 0.0),
+            enabled=api_config.get("rate_limit_wait", True),
+        )
+
+    def get_status(self, resource="core"):
+        """把握しているレート制限の状況を返す（未取得の場合はNone）"""
+        with self._lock:
+            status = self._limits.get(resource)
+            return dict(status) if status else None
+
+    def record(self, resource, remaining, reset, limit=None):
+        """レート制限の状況を記録する"""
+        with self._lock:
+            self._limits[resource] = {
+                "remaining": remaining,
+                "reset": reset,
+                "limit": limit,
+            }
+
+    def update_from_response(self, response):
+        """レスポンスヘッダーからレート制限の状況を更新する"""
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = int(headers.get("X-RateLimit-Reset", 0))
+            limit = (
+                int(headers["X-RateLimit-Limit"])
+                if "X-RateLimit-Limit" in headers
+                else None
+            )
+        except ValueError:
+            return
+
+        resource = headers.get("X-RateLimit-Resource", "core")
+        self.record(resource, remaining, reset, limit)
+
+    def _reserve_slot(self, resource):
+        """次のリクエストを送信してよい時刻を確保し、待機秒数を返す"""
+        now = time.time()
+        with self._lock:
+            status = self._limits.get(resource)
+            interval = self.min_interval
+
+            if status:
+                remaining = status["remaining"]
+                time_left = max(status["reset"] - now, 0)
+
+                if remaining <= self.reserve and time_left > 0:
+                    # 予算を使い切ったのでリセットまで全リクエストを止める
+                    wait_until = status["reset"] + self.buffer_seconds
+                    self._next_request_at[resource] = wait_until
+                    status["remaining"] = status["limit"] or remaining
+                    return wait_until - now
+
+                limit = status["limit"]
+                if limit is None or remaining < limit * self.pace_below_ratio:
+                    interval = max(
+                        interval, time_left / max(remaining - self.reserve, 1)
+                    )
+
+                status["remaining"] = remaining - 1
+
+            slot = max(now, self._next_request_at.get(resource, now))
+            self._next_request_at[resource] = slot + interval
+            return slot - now
+
+    def wait(self, resource="core"):
+        """レート制限の予算に応じて、次のリクエストまで待機する"""
+        if not self.enabled:
+            return
+
+        wait_seconds = self._reserve_slot(resource)
+        if wait_seconds > 0:
+            if wait_seconds >= 1:
+                print(f"レート制限の残量に合わせて{wait_seconds:.1f}秒待機します...")
+            time.sleep(wait_seconds)
+
+    def retry_delay(self, response, attempt):
+        """レート制限によるエラーの場合は再試行までの待機秒数を返す（それ以外はNone）"""
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = int(response.headers.get("X-RateLimit-Reset", 0))
+            return max(reset - time.time(), 0) + self.buffer_seconds
+
+        if (
+            response.status_code == 429
+            or "secondary rate limit" in response.text.lower()
+        ):
+            return min(SECONDARY_LIMIT_WAIT * (2**attempt), MAX_SECONDARY_LIMIT_WAIT)
+
+        return None
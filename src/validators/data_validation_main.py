@@ -38,6 +38,12 @@ def parse_args():
         help="コンソール出力のみ（ファイル保存しない）",
     )
 
+    parser.add_argument(
+        "--refresh-number-space",
+        action="store_true",
+        help="欠番の検出前に番号空間マップをAPIで最新の状態に更新する",
+    )
+
     parser.add_argument("--verbose", action="store_true", help="詳細な出力を表示")
 
     return parser.parse_args()
@@ -60,7 +66,9 @@ def main():
     try:
         validator = DataValidator(config)
         result = validator.validate_data(
-            data_dir=args.data_dir, output_file=output_file
+            data_dir=args.data_dir,
+            output_file=output_file,
+            refresh_number_space=args.refresh_number_space,
         )
 
         print("\n" + "=" * 60)
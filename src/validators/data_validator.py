@@ -6,16 +6,15 @@ GitHub APIから取得した統計情報とローカルに保存されたPRデ
 データの整合性を検証します。
 """
 
-import json
 import os
 from collections import defaultdict, Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from ..utils.github_api import make_github_api_request, load_config
-
-issues = [181, 182, 194, 215, 802, 931, 1803]
+from ..utils.github_api import iter_github_api_pages, load_config
+from ..utils.number_space import NumberSpaceMap, compress_ranges, format_ranges
+from ..utils.pr_store import open_pr_store
 
 
 class DataValidator:
@@ -45,24 +44,10 @@ class DataValidator:
             "monthly_counts": defaultdict(int),
         }
 
-        page = 1
-        per_page = 100
-
-        while True:
-            url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls"
-            params = {
-                "state": "all",
-                "sort": "created",
-                "direction": "desc",
-                "per_page": per_page,
-                "page": page,
-            }
-
-            prs = make_github_api_request(url, params)
-
-            if not prs:
-                break
+        url = f"{self.api_base_url}/repos/{self.repo_owner}/{self.repo_name}/pulls"
+        params = {"state": "all", "sort": "created", "direction": "desc"}
 
+        for prs in iter_github_api_pages(url, params):
             for pr in prs:
                 stats["total_prs"] += 1
 
@@ -82,12 +67,6 @@ class DataValidator:
                 month_key = created_date.strftime("%Y-%m")
                 stats["monthly_counts"][month_key] += 1
 
-            page += 1
-
-            if page > 100:  # 最大10,000件
-                print("警告: PR数が非常に多いため、最初の10,000件のみを処理しました")
-                break
-
         stats["label_counts"] = dict(stats["label_counts"])
         stats["user_counts"] = dict(stats["user_counts"])
         stats["monthly_counts"] = dict(stats["monthly_counts"])
@@ -95,7 +74,10 @@ class DataValidator:
         return stats
 
     def get_local_pr_stats(self, data_dir: Optional[str] = None) -> Dict:
-        """ローカルPRデータから統計を取得"""
+        """ローカルPRデータから統計を取得
+
+        PRデータファイルは読み込まず、インデックス（SQLiteの場合はデータベース）で集計します。
+        """
         print("ローカルPRデータから統計を取得中...")
 
         if data_dir:
@@ -116,60 +98,38 @@ class DataValidator:
                 "file_count": 0,
             }
 
-        stats = {
-            "total_prs": 0,
-            "state_counts": {"open": 0, "closed": 0, "merged": 0},
-            "label_counts": defaultdict(int),
-            "user_counts": defaultdict(int),
-            "monthly_counts": defaultdict(int),
-            "file_count": 0,
-        }
-
-        json_files = list(base_dir.glob("*.json"))
-        stats["file_count"] = len(json_files)
-
-        for json_file in json_files:
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    pr_data = json.load(f)
-
-                basic_info = pr_data.get("basic_info", {})
-                if not basic_info:
-                    continue
-
-                stats["total_prs"] += 1
-
-                if basic_info.get("merged_at"):
-                    stats["state_counts"]["merged"] += 1
-                else:
-                    stats["state_counts"][basic_info.get("state", "unknown")] += 1
-
-                for label in pr_data.get("labels", []):
-                    stats["label_counts"][label["name"]] += 1
-
-                user_info = basic_info.get("user", {})
-                if user_info:
-                    stats["user_counts"][user_info.get("login", "unknown")] += 1
-
-                created_at = basic_info.get("created_at")
-                if created_at:
-                    created_date = datetime.fromisoformat(
-                        created_at.replace("Z", "+00:00")
-                    )
-                    month_key = created_date.strftime("%Y-%m")
-                    stats["monthly_counts"][month_key] += 1
-
-            except Exception as e:
-                print(f"警告: {json_file} の読み込みに失敗しました: {e}")
-                continue
-
-        stats["label_counts"] = dict(stats["label_counts"])
-        stats["user_counts"] = dict(stats["user_counts"])
-        stats["monthly_counts"] = dict(stats["monthly_counts"])
+        with open_pr_store(base_dir) as store:
+            stats = store.stats()
+            stats["file_count"] = len(store.numbers())
 
         return stats
 
-    def compare_stats(self, github_stats: Dict, local_stats: Dict) -> Dict:
+    def get_missing_pr_numbers(
+        self, data_dir: Optional[str] = None, refresh_number_space: bool = False
+    ) -> List[int]:
+        """番号空間マップでPRと分類された番号のうち、ローカルにないものを取得
+
+        保存済みの番号空間マップ（.index/number_space.json）を使用し、
+        refresh_number_space が True の場合のみAPIで最新の状態に更新します。
+        """
+        base_dir = Path(data_dir) if data_dir else self.base_dir
+
+        number_space = NumberSpaceMap(base_dir, self.config)
+        if refresh_number_space:
+            number_space.refresh()
+        elif not number_space.max_number:
+            print("警告: 番号空間マップがないため、欠番の検出を省略します")
+            return []
+
+        with open_pr_store(base_dir) as store:
+            return sorted(number_space.pr_numbers() - store.numbers())
+
+    def compare_stats(
+        self,
+        github_stats: Dict,
+        local_stats: Dict,
+        missing_pr_numbers: Optional[List[int]] = None,
+    ) -> Dict:
         """GitHub統計とローカル統計を比較"""
         print("統計データを比較中...")
 
@@ -186,6 +146,7 @@ class DataValidator:
             "coverage_percentage": (local_total / github_total * 100)
             if github_total > 0
             else 0,
+            "missing_pr_numbers": missing_pr_numbers or [],
         }
 
         comparison["differences"]["states"] = {}
@@ -223,6 +184,12 @@ class DataValidator:
                 f"{comparison['summary']['difference']}件のPRがローカルに不足しています。データ収集を実行してください。"
             )
 
+        if missing_pr_numbers:
+            missing_ranges = format_ranges(compress_ranges(missing_pr_numbers))
+            comparison["recommendations"].append(
+                f"未収集のPR番号があります: {', '.join(missing_ranges[:20])}。uncollectedモードで収集してください。"
+            )
+
         if comparison["summary"]["coverage_percentage"] < 95:
             comparison["recommendations"].append(
                 f"データカバレッジが{comparison['summary']['coverage_percentage']:.1f}%です。完全性を向上させるため、全体的なデータ再収集を検討してください。"
@@ -253,6 +220,7 @@ class DataValidator:
             f"- **ローカル総PR数**: {comparison['summary']['local_total_prs']:,}件",
             f"- **ローカルファイル数**: {comparison['summary']['local_file_count']:,}件",
             f"- **差異**: {comparison['summary']['difference']:,}件",
+            f"- **未収集PR番号数**: {len(comparison['summary'].get('missing_pr_numbers', [])):,}件",
             f"- **カバレッジ**: {comparison['summary']['coverage_percentage']:.1f}%",
             "",
             "## 状態別比較",
@@ -302,7 +270,10 @@ class DataValidator:
         return report_content
 
     def validate_data(
-        self, data_dir: Optional[str] = None, output_file: Optional[str] = None
+        self,
+        data_dir: Optional[str] = None,
+        output_file: Optional[str] = None,
+        refresh_number_space: bool = False,
     ) -> Dict:
         """データ検証を実行"""
         print("データ検証を開始します...")
@@ -312,7 +283,13 @@ class DataValidator:
 
             local_stats = self.get_local_pr_stats(data_dir)
 
-            comparison = self.compare_stats(github_stats, local_stats)
+            missing_pr_numbers = self.get_missing_pr_numbers(
+                data_dir, refresh_number_space
+            )
+
+            comparison = self.compare_stats(
+                github_stats, local_stats, missing_pr_numbers
+            )
 
             report = self.generate_validation_report(comparison, output_file)
 
@@ -0,0 +1,29 @@
+"""pytest の共通設定"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def config(tmp_path):
+    """一時ディレクトリにPRデータを保存する設定"""
+    return {
+        "github": {
+            "repo_owner": "team-mirai",
+            "repo_name": "policy",
+            "token_env_var": "GITHUB_TOKEN",
+            "api_base_url": "https://api.github.com",
+        },
+        "data": {
+            "storage_type": "file_per_pr",
+            "base_dir": str(tmp_path / "prs"),
+            "layout": "flat",
+            "file_format": "json",
+        },
+        "api": {"retry_count": 1, "rate_limit_wait": False},
+        "collectors": {"max_workers": 2, "files_source": "api"},
+    }
@@ -0,0 +1,110 @@
+"""非同期PRデータ収集のテスト"""
+
+import threading
+
+import pytest
+
+from src.collectors.async_pr_collector import AsyncPRCollector
+
+
+def make_pr_data(number):
+    return {"basic_info": {"number": number, "state": "open"}, "labels": []}
+
+
+@pytest.fixture
+def collector(config):
+    collector = AsyncPRCollector(config)
+    yield collector
+    collector.close()
+
+
+@pytest.fixture
+def fetched(monkeypatch, collector):
+    """collect_pr_data の代わりに呼び出されたPR番号を記録する関数
+
+    not_found のPRは None を返し、failing のPRは例外を発生させます。
+    """
+    state = {"numbers": [], "not_found": set(), "failing": set()}
+    lock = threading.Lock()
+
+    def collect_pr_data(pr_number, concurrent=None, stored_pr_data=None):
+        with lock:
+            state["numbers"].append(pr_number)
+        if pr_number in state["failing"]:
+            raise RuntimeError("APIエラー")
+        if pr_number in state["not_found"]:
+            return None
+        return make_pr_data(pr_number)
+
+    monkeypatch.setattr(collector, "collect_pr_data", collect_pr_data)
+    return state
+
+
+def test_results_are_saved_in_input_order(collector, fetched, monkeypatch):
+    saved = []
+    monkeypatch.setattr(
+        collector,
+        "save_pr_data",
+        lambda pr_data, output_dir=None: saved.append(pr_data["basic_info"]["number"]),
+    )
+
+    count = collector._run(collector._collect_numbers(range(1, 21)))
+
+    assert count == 20
+    assert saved == list(range(1, 21))
+
+
+def test_no_more_items_are_fetched_than_max_count(collector, fetched):
+    count = collector._run(collector._collect_numbers(range(1, 51), max_count=2))
+
+    assert count == 2
+    assert sorted(fetched["numbers"]) == [1, 2]
+
+
+def test_items_without_data_do_not_use_up_max_count(collector, fetched):
+    fetched["not_found"] = {2}
+
+    count = collector._run(collector._collect_numbers(range(1, 51), max_count=2))
+
+    assert count == 2
+    assert sorted(fetched["numbers"]) == [1, 2, 3]
+    assert collector.get_store().numbers() == {1, 3}
+
+
+def test_failed_item_is_reported_and_skipped(collector, fetched, capsys):
+    fetched["failing"] = {2}
+    finished = []
+
+    count = collector._run(
+        collector._collect_numbers(range(1, 6), on_saved=finished.append)
+    )
+
+    assert count == 4
+    assert collector.get_store().numbers() == {1, 3, 4, 5}
+    assert finished == [1, 3, 4, 5]
+    assert "PR #2 の処理中にエラーが発生しました: APIエラー" in capsys.readouterr().out
+
+
+def test_failed_pr_stops_watermark_in_incremental_sync(collector, fetched, monkeypatch):
+    fetched["failing"] = {2}
+    candidates = [
+        {"number": number, "updated_at": f"2024-05-0{number}T00:00:00Z"}
+        for number in (1, 2, 3)
+    ]
+    monkeypatch.setattr(
+        collector,
+        "get_incremental_candidates",
+        lambda output_dir=None: (None, candidates, "2024-05-03T00:00:00Z"),
+    )
+    monkeypatch.setattr(
+        collector,
+        "refresh_pr_data",
+        lambda pr_number, output_dir=None: collector.collect_pr_data(pr_number),
+    )
+
+    assert collector.collect_prs_incrementally() == 2
+
+    # 失敗したPRを次回に同期し直せるよう、その直前の更新日時で止める
+    assert collector.get_store().numbers() == {1, 3}
+    watermark = collector.load_last_run_info()["update_watermark"]
+    assert watermark == "2024-05-01T00:00:00Z"
@@ -0,0 +1,189 @@
+"""unified diff 形式の解析のテスト"""
+
+from src.utils.diff_parser import parse_unified_diff, unquote_path
+
+OLD_SHA = "1" * 40
+NEW_SHA = "2" * 40
+NULL_SHA = "0" * 40
+
+
+def test_modified_file():
+    diff = (
+        "diff --git a/README.md b/README.md\n"
+        f"index {OLD_SHA}..{NEW_SHA} 100644\n"
+        "--- a/README.md\n"
+        "+++ b/README.md\n"
+        "@@ -1,2 +1,2 @@\n"
+        " タイトル\n"
+        "-旧い文\n"
+        "+新しい文\n"
+    )
+
+    assert parse_unified_diff(diff) == [
+        {
+            "sha": NEW_SHA,
+            "filename": "README.md",
+            "status": "modified",
+            "additions": 1,
+            "deletions": 1,
+            "changes": 2,
+            "patch": "@@ -1,2 +1,2 @@\n タイトル\n-旧い文\n+新しい文",
+        }
+    ]
+
+
+def test_added_and_removed_files():
+    diff = (
+        "diff --git a/new.md b/new.md\n"
+        "new file mode 100644\n"
+        f"index {NULL_SHA}..{NEW_SHA}\n"
+        "--- /dev/null\n"
+        "+++ b/new.md\n"
+        "@@ -0,0 +1 @@\n"
+        "+追加\n"
+        "diff --git a/old.md b/old.md\n"
+        "deleted file mode 100644\n"
+        f"index {OLD_SHA}..{NULL_SHA}\n"
+        "--- a/old.md\n"
+        "+++ /dev/null\n"
+        "@@ -1 +0,0 @@\n"
+        "-削除\n"
+    )
+
+    added, removed = parse_unified_diff(diff)
+    assert (added["filename"], added["status"], added["sha"]) == (
+        "new.md",
+        "added",
+        NEW_SHA,
+    )
+    assert added["additions"] == 1
+    assert (removed["filename"], removed["status"], removed["sha"]) == (
+        "old.md",
+        "removed",
+        OLD_SHA,
+    )
+    assert removed["deletions"] == 1
+
+
+def test_renamed_file_with_changes():
+    diff = (
+        "diff --git a/docs/old name.md b/docs/new name.md\n"
+        "similarity index 90%\n"
+        "rename from docs/old name.md\n"
+        "rename to docs/new name.md\n"
+        f"index {OLD_SHA}..{NEW_SHA} 100644\n"
+        "--- a/docs/old name.md\n"
+        "+++ b/docs/new name.md\n"
+        "@@ -1 +1 @@\n"
+        "-旧\n"
+        "+新\n"
+    )
+
+    [file_info] = parse_unified_diff(diff)
+    assert file_info["status"] == "renamed"
+    assert file_info["filename"] == "docs/new name.md"
+    assert file_info["previous_filename"] == "docs/old name.md"
+    assert file_info["changes"] == 2
+
+
+def test_pure_rename_has_no_patch():
+    diff = (
+        "diff --git a/a.md b/b.md\n"
+        "similarity index 100%\n"
+        "rename from a.md\n"
+        "rename to b.md\n"
+    )
+
+    assert parse_unified_diff(diff) == [
+        {
+            "filename": "b.md",
+            "previous_filename": "a.md",
+            "status": "renamed",
+            "additions": 0,
+            "deletions": 0,
+            "changes": 0,
+        }
+    ]
+
+
+def test_binary_file_has_no_patch():
+    diff = (
+        "diff --git a/image.png b/image.png\n"
+        "new file mode 100644\n"
+        f"index {NULL_SHA}..{NEW_SHA}\n"
+        "Binary files /dev/null and b/image.png differ\n"
+    )
+
+    [file_info] = parse_unified_diff(diff)
+    assert file_info == {
+        "sha": NEW_SHA,
+        "filename": "image.png",
+        "status": "added",
+        "additions": 0,
+        "deletions": 0,
+        "changes": 0,
+    }
+
+
+def test_quoted_non_ascii_path():
+    # core.quotepath が有効な場合、日本語のパスは8進数でエスケープされる
+    escaped = "\\346\\224\\277\\347\\255\\226.md"
+    diff = (
+        f'diff --git "a/{escaped}" "b/{escaped}"\n'
+        f"index {OLD_SHA}..{NEW_SHA} 100644\n"
+        f'--- "a/{escaped}"\n'
+        f'+++ "b/{escaped}"\n'
+        "@@ -1 +1 @@\n"
+        "-a\n"
+        "+b\n"
+    )
+
+    [file_info] = parse_unified_diff(diff)
+    assert file_info["filename"] == "政策.md"
+
+
+def test_unquote_path_escapes():
+    assert unquote_path('"tab\\there"') == "tab\there"
+    assert unquote_path('"quote\\"d"') == 'quote"d'
+    assert unquote_path("plain.md") == "plain.md"
+
+
+def test_content_lines_that_look_like_headers():
+    # 本文の "-- " や "++ " で始まる行は、削除・追加の行として "--- " "+++ " になる
+    diff = (
+        "diff --git a/sig.txt b/sig.txt\n"
+        f"index {OLD_SHA}..{NEW_SHA} 100644\n"
+        "--- a/sig.txt\n"
+        "+++ b/sig.txt\n"
+        "@@ -1,3 +1,3 @@\n"
+        "--- 旧署名\n"
+        "+++ 新署名\n"
+        " diff --git a/x b/x\n"
+        "-@@ 本文 @@\n"
+        "+@@ 本文（改） @@\n"
+    )
+
+    [file_info] = parse_unified_diff(diff)
+    assert file_info["filename"] == "sig.txt"
+    assert file_info["additions"] == 2
+    assert file_info["deletions"] == 2
+    assert file_info["patch"].splitlines()[1] == "--- 旧署名"
+
+
+def test_crlf_line_endings_are_kept():
+    diff = (
+        "diff --git a/win.txt b/win.txt\n"
+        f"index {OLD_SHA}..{NEW_SHA} 100644\n"
+        "--- a/win.txt\n"
+        "+++ b/win.txt\n"
+        "@@ -1 +1 @@\n"
+        "-old\r\n"
+        "+new\r\n"
+    )
+
+    [file_info] = parse_unified_diff(diff)
+    assert file_info["patch"] == "@@ -1 +1 @@\n-old\r\n+new\r"
+
+
+def test_empty_diff():
+    assert parse_unified_diff("") == []
@@ -0,0 +1,141 @@
+"""政策リポジトリのローカルミラーのテスト
+
+一時ディレクトリに作成したリポジトリを refs/pull/1/head 付きでミラーし、
+diff_files と log_commits の結果を確認します。
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.utils.git_mirror import GitMirror
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git コマンドが必要です"
+)
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_AUTHOR_DATE": "2025-06-01T09:00:00+09:00",
+    "GIT_COMMITTER_NAME": "Bob",
+    "GIT_COMMITTER_EMAIL": "bob@example.com",
+    "GIT_COMMITTER_DATE": "2025-06-01T10:00:00+09:00",
+}
+
+
+def git(repo, *args):
+    """テスト用のリポジトリで git コマンドを実行する"""
+    result = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        capture_output=True,
+        check=True,
+        env={**os.environ, **GIT_ENV},
+    )
+    return result.stdout.decode("utf-8").strip()
+
+
+def commit_all(repo, message):
+    git(repo, "add", "-A")
+    git(repo, "commit", "--quiet", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    """main ブランチと PR #1 のヘッドを持つリポジトリ"""
+    repo = tmp_path / "policy"
+    repo.mkdir()
+    git(repo, "init", "--quiet", "--initial-branch=main")
+
+    (repo / "README.md").write_text("# 政策\n", encoding="utf-8")
+    (repo / "old name.md").write_text(
+        "".join(f"{i}行目\n" for i in range(20)), encoding="utf-8"
+    )
+    (repo / "sig.txt").write_text("本文\n-- 旧署名\n", encoding="utf-8")
+    commit_all(repo, "初期化")
+
+    git(repo, "checkout", "--quiet", "-b", "feature")
+    git(repo, "mv", "old name.md", "new name.md")
+    with open(repo / "new name.md", "a", encoding="utf-8") as f:
+        f.write("追加行\n")
+    (repo / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x01\x02")
+    commit_all(repo, "ファイル名を変更\n\n本文の説明")
+
+    (repo / "政策.md").write_text("教育\n", encoding="utf-8")
+    (repo / "sig.txt").write_text("本文\n-- 新署名\n", encoding="utf-8")
+    head = commit_all(repo, "政策を追加")
+
+    git(repo, "update-ref", "refs/pull/1/head", head)
+    git(repo, "checkout", "--quiet", "main")
+    (repo / "README.md").write_text("# 政策（改）\n", encoding="utf-8")
+    commit_all(repo, "mainを更新")
+    return repo
+
+
+@pytest.fixture
+def mirror(tmp_path, source_repo):
+    mirror = GitMirror(tmp_path / "mirror", str(source_repo))
+    mirror.fetch()
+    return mirror
+
+
+def test_fetch_mirrors_branches_and_pull_heads(mirror, source_repo):
+    assert mirror.pull_heads() == {1: git(source_repo, "rev-parse", "refs/pull/1/head")}
+    assert mirror.resolve("refs/heads/main") == git(source_repo, "rev-parse", "main")
+    assert mirror.resolve("refs/heads/missing") is None
+
+
+def test_diff_files_against_merge_base(mirror):
+    files = {
+        file_info["filename"]: file_info
+        for file_info in mirror.diff_files("refs/heads/main", "refs/pull/1/head")
+    }
+
+    # main で後から変更された README.md は差分に含まれない（3点比較）
+    assert sorted(files) == ["image.png", "new name.md", "sig.txt", "政策.md"]
+
+    renamed = files["new name.md"]
+    assert renamed["status"] == "renamed"
+    assert renamed["previous_filename"] == "old name.md"
+    assert (renamed["additions"], renamed["deletions"]) == (1, 0)
+
+    binary = files["image.png"]
+    assert binary["status"] == "added"
+    assert binary["changes"] == 0
+    assert "patch" not in binary
+
+    added = files["政策.md"]
+    assert added["status"] == "added"
+    assert added["patch"] == "@@ -0,0 +1 @@\n+教育"
+    assert len(added["sha"]) == 40
+
+    signature = files["sig.txt"]
+    assert (signature["additions"], signature["deletions"]) == (1, 1)
+    assert signature["patch"].splitlines()[2:] == ["--- 旧署名", "+-- 新署名"]
+
+
+def test_log_commits(mirror, source_repo):
+    commits = mirror.log_commits(
+        "refs/heads/main",
+        "refs/pull/1/head",
+        html_base_url="https://github.com/team-mirai/policy",
+    )
+
+    assert [commit["commit"]["message"] for commit in commits] == [
+        "ファイル名を変更\n\n本文の説明",
+        "政策を追加",
+    ]
+    head = commits[-1]
+    assert head["sha"] == git(source_repo, "rev-parse", "refs/pull/1/head")
+    assert head["html_url"] == (
+        f"https://github.com/team-mirai/policy/commit/{head['sha']}"
+    )
+    assert head["commit"]["author"] == {
+        "name": "Alice",
+        "email": "alice@example.com",
+        "date": "2025-06-01T00:00:00Z",
+    }
+    assert head["commit"]["committer"]["date"] == "2025-06-01T01:00:00Z"
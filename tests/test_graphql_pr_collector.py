@@ -0,0 +1,434 @@
+"""GraphQL APIによるPRデータ一括収集のテスト
+
+make_graphql_request とREST APIの取得処理を差し替え、カーソルによるページング、
+チェックポイントからの再開、件数が上限を超えた一覧のREST APIでの取得、
+collect_pr_data と同じ形式で保存されることを確認します。
+"""
+
+import pytest
+
+from src.collectors import graphql_pr_collector
+from src.collectors.graphql_pr_collector import GraphQLPRCollector
+from src.collectors.pr_collector import PRCollector
+
+HTML_BASE = "https://github.com/team-mirai/policy"
+ALICE = {"login": "alice", "url": "https://github.com/alice", "databaseId": 1}
+BOB = {"login": "bob", "url": "https://github.com/bob", "databaseId": 2}
+
+
+def connection(nodes, total_count=None):
+    """totalCount 付きのGraphQLの一覧を作成する"""
+    return {
+        "totalCount": len(nodes) if total_count is None else total_count,
+        "nodes": nodes,
+    }
+
+
+def make_node(number, updated_at="2025-06-02T00:00:00Z", **overrides):
+    """GraphQL APIのPRノードを作成する"""
+    head_sha = f"{number:040d}"
+    node = {
+        "number": number,
+        "title": f"政策の修正 {number}",
+        "state": "MERGED",
+        "createdAt": "2025-06-01T00:00:00Z",
+        "updatedAt": updated_at,
+        "closedAt": "2025-06-02T00:00:00Z",
+        "mergedAt": "2025-06-02T00:00:00Z",
+        "url": f"{HTML_BASE}/pull/{number}",
+        "headRefOid": head_sha,
+        "baseRefName": "main",
+        "baseRefOid": "b" * 40,
+        "author": ALICE,
+        "labels": {
+            "nodes": [
+                {
+                    "id": "LA_1",
+                    "name": "教育",
+                    "color": "ffffff",
+                    "description": "教育政策",
+                }
+            ]
+        },
+        "comments": connection(
+            [
+                {
+                    "databaseId": 100 + number,
+                    "body": "賛成です",
+                    "createdAt": "2025-06-01T01:00:00Z",
+                    "updatedAt": "2025-06-01T01:00:00Z",
+                    "url": f"{HTML_BASE}/pull/{number}#issuecomment-{100 + number}",
+                    "author": None,
+                }
+            ]
+        ),
+        "reviewThreads": connection(
+            [
+                {
+                    "comments": connection(
+                        [
+                            {
+                                "databaseId": 200 + number,
+                                "body": "ここを修正",
+                                "path": "README.md",
+                                "diffHunk": "@@ -1 +1 @@",
+                                "line": 1,
+                                "originalLine": 1,
+                                "pullRequestReview": {"databaseId": 300},
+                                "createdAt": "2025-06-01T02:00:00Z",
+                                "updatedAt": "2025-06-01T02:00:00Z",
+                                "url": f"{HTML_BASE}/pull/{number}#r{200 + number}",
+                                "replyTo": None,
+                                "author": BOB,
+                            },
+                            {
+                                "databaseId": 210 + number,
+                                "body": "修正しました",
+                                "path": "README.md",
+                                "diffHunk": "@@ -1 +1 @@",
+                                "line": 1,
+                                "originalLine": 1,
+                                "pullRequestReview": {"databaseId": 301},
+                                "createdAt": "2025-06-01T03:00:00Z",
+                                "updatedAt": "2025-06-01T03:00:00Z",
+                                "url": f"{HTML_BASE}/pull/{number}#r{210 + number}",
+                                "replyTo": {"databaseId": 200 + number},
+                                "author": ALICE,
+                            },
+                        ]
+                    )
+                }
+            ]
+        ),
+        "files": connection(
+            [
+                {
+                    "path": "README.md",
+                    "additions": 1,
+                    "deletions": 1,
+                    "changeType": "MODIFIED",
+                }
+            ]
+        ),
+        "commits": connection(
+            [
+                {
+                    "commit": {
+                        "oid": head_sha,
+                        "message": "READMEを修正",
+                        "url": f"{HTML_BASE}/commit/{head_sha}",
+                        "author": {
+                            "name": "Alice",
+                            "email": "alice@example.com",
+                            "date": "2025-06-01T00:30:00Z",
+                            "user": {"login": "alice"},
+                        },
+                        "committer": {
+                            "name": "Alice",
+                            "email": "alice@example.com",
+                            "date": "2025-06-01T00:30:00Z",
+                        },
+                    }
+                }
+            ]
+        ),
+    }
+    node.update(overrides)
+    return node
+
+
+def rest_user(actor):
+    """GraphQLのActorに対応するREST APIのuser"""
+    if actor is None:
+        return {"login": "ghost", "id": 10137, "html_url": "https://github.com/ghost"}
+    return {
+        "login": actor["login"],
+        "id": actor["databaseId"],
+        "html_url": actor["url"],
+    }
+
+
+def rest_pr_details(node):
+    """ノードと同じPRのPR詳細APIのレスポンス"""
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "state": "closed",
+        "created_at": node["createdAt"],
+        "updated_at": node["updatedAt"],
+        "closed_at": node["closedAt"],
+        "merged_at": node["mergedAt"],
+        "html_url": node["url"],
+        "user": rest_user(node["author"]),
+        "head": {"sha": node["headRefOid"]},
+        "base": {"ref": node["baseRefName"], "sha": node["baseRefOid"]},
+        "labels": [
+            {
+                "id": 5000,
+                "node_id": label["id"],
+                "name": label["name"],
+                "color": label["color"],
+                "description": label["description"],
+                "default": False,
+            }
+            for label in node["labels"]["nodes"]
+        ],
+    }
+
+
+def rest_comments(node):
+    return [
+        {
+            "id": comment["databaseId"],
+            "body": comment["body"],
+            "user": rest_user(comment["author"]),
+            "created_at": comment["createdAt"],
+            "updated_at": comment["updatedAt"],
+            "html_url": comment["url"],
+            "author_association": "NONE",
+        }
+        for comment in node["comments"]["nodes"]
+    ]
+
+
+def rest_review_comments(node):
+    review_comments = []
+    for thread in node["reviewThreads"]["nodes"]:
+        for comment in thread["comments"]["nodes"]:
+            review_comment = {
+                "id": comment["databaseId"],
+                "body": comment["body"],
+                "path": comment["path"],
+                "diff_hunk": comment["diffHunk"],
+                "line": comment["line"],
+                "original_line": comment["originalLine"],
+                "pull_request_review_id": comment["pullRequestReview"]["databaseId"],
+                "user": rest_user(comment["author"]),
+                "created_at": comment["createdAt"],
+                "updated_at": comment["updatedAt"],
+                "html_url": comment["url"],
+            }
+            if comment["replyTo"]:
+                review_comment["in_reply_to_id"] = comment["replyTo"]["databaseId"]
+            review_comments.append(review_comment)
+    return review_comments
+
+
+def rest_files(node):
+    return [
+        {
+            "sha": "c" * 40,
+            "filename": file_info["path"],
+            "status": "modified",
+            "additions": file_info["additions"],
+            "deletions": file_info["deletions"],
+            "changes": file_info["additions"] + file_info["deletions"],
+            "patch": "@@ -1 +1 @@\n-旧\n+新",
+        }
+        for file_info in node["files"]["nodes"]
+    ]
+
+
+def rest_commits(node):
+    return [
+        {
+            "sha": item["commit"]["oid"],
+            "html_url": item["commit"]["url"],
+            "author": {"login": item["commit"]["author"]["user"]["login"], "id": 1},
+            "commit": {
+                "message": item["commit"]["message"],
+                "author": {
+                    key: value
+                    for key, value in item["commit"]["author"].items()
+                    if key != "user"
+                },
+                "committer": item["commit"]["committer"],
+            },
+        }
+        for item in node["commits"]["nodes"]
+    ]
+
+
+class FakeGraphQLAPI:
+    """カーソルごとに決まったページを返す make_graphql_request の代わり"""
+
+    def __init__(self, pages, fail_after=None):
+        # pages はカーソル（最初のページはNone）から (ノード, 次のカーソル) への対応
+        self.pages = pages
+        self.fail_after = fail_after
+        self.requested_cursors = []
+
+    def __call__(self, url, query, variables):
+        after = variables["after"]
+        self.requested_cursors.append(after)
+        if after is not None and after == self.fail_after:
+            raise RuntimeError("GraphQL APIへのリクエストが失敗しました")
+
+        nodes, end_cursor = self.pages[after]
+        return {
+            "rateLimit": {"cost": 1, "remaining": 4999, "resetAt": None},
+            "repository": {
+                "pullRequests": {
+                    "pageInfo": {
+                        "hasNextPage": end_cursor is not None,
+                        "endCursor": end_cursor,
+                    },
+                    "nodes": nodes,
+                }
+            },
+        }
+
+
+class FakeRESTAPI:
+    """ノードから作成したREST APIのレスポンスを返し、呼び出しを記録する"""
+
+    def __init__(self, nodes):
+        self.nodes = {node["number"]: node for node in nodes}
+        self.calls = []
+
+    def install(self, collector):
+        fetchers = {
+            "get_pr_details": rest_pr_details,
+            "get_pr_comments": rest_comments,
+            "get_pr_review_comments": rest_review_comments,
+            "get_pr_files": rest_files,
+            "get_pr_commits": rest_commits,
+        }
+        for name, build in fetchers.items():
+            setattr(collector, name, self._fetcher(name, build))
+
+    def _fetcher(self, name, build):
+        def fetch(pr_number):
+            self.calls.append((name, pr_number))
+            return build(self.nodes[pr_number])
+
+        return fetch
+
+
+@pytest.fixture
+def make_collector(config):
+    collectors = []
+
+    def make(**kwargs):
+        collector = GraphQLPRCollector(config, batch_size=2, **kwargs)
+        collectors.append(collector)
+        return collector
+
+    yield make
+    for collector in collectors:
+        collector.close()
+
+
+def install_graphql(monkeypatch, pages, fail_after=None):
+    fake = FakeGraphQLAPI(pages, fail_after)
+    monkeypatch.setattr(graphql_pr_collector, "make_graphql_request", fake)
+    return fake
+
+
+PAGES = {
+    None: ([make_node(5), make_node(4)], "cursor-1"),
+    "cursor-1": ([make_node(3), make_node(2)], "cursor-2"),
+    "cursor-2": ([make_node(1)], None),
+}
+
+
+def test_follows_cursors_until_last_page(monkeypatch, make_collector):
+    fake = install_graphql(monkeypatch, PAGES)
+    collector = make_collector()
+
+    assert collector.collect_prs_via_graphql() == 5
+    assert fake.requested_cursors == [None, "cursor-1", "cursor-2"]
+    assert sorted(collector.get_store().numbers()) == [1, 2, 3, 4, 5]
+    assert collector.get_checkpoint("graphql").load() is None
+
+
+def test_stops_at_since(monkeypatch, make_collector):
+    pages = {
+        None: (
+            [make_node(3), make_node(2, updated_at="2025-05-01T00:00:00Z")],
+            "cursor-1",
+        ),
+        "cursor-1": ([make_node(1)], None),
+    }
+    fake = install_graphql(monkeypatch, pages)
+    collector = make_collector()
+
+    assert collector.collect_prs_via_graphql(since="2025-06-01T00:00:00Z") == 1
+    assert fake.requested_cursors == [None]
+    assert sorted(collector.get_store().numbers()) == [3]
+
+
+def test_resumes_from_checkpoint(monkeypatch, make_collector):
+    install_graphql(monkeypatch, PAGES, fail_after="cursor-2")
+    collector = make_collector()
+
+    with pytest.raises(RuntimeError):
+        collector.collect_prs_via_graphql()
+    assert collector.get_checkpoint("graphql").load()["cursor"] == "cursor-2"
+    assert sorted(collector.get_store().numbers()) == [2, 3, 4, 5]
+
+    fake = install_graphql(monkeypatch, PAGES)
+    assert collector.collect_prs_via_graphql(resume=True) == 1
+    assert fake.requested_cursors == ["cursor-2"]
+    assert sorted(collector.get_store().numbers()) == [1, 2, 3, 4, 5]
+    assert collector.get_checkpoint("graphql").load() is None
+
+
+def test_truncated_connections_fall_back_to_rest(monkeypatch, make_collector):
+    truncated = make_node(
+        7,
+        comments=connection(make_node(7)["comments"]["nodes"], total_count=150),
+        files=connection(make_node(7)["files"]["nodes"], total_count=120),
+    )
+    thread = make_node(7)["reviewThreads"]["nodes"][0]
+    truncated["reviewThreads"] = connection(
+        [{"comments": connection(thread["comments"]["nodes"], total_count=60)}]
+    )
+    complete = make_node(8)
+    install_graphql(monkeypatch, {None: ([truncated, complete], None)})
+
+    collector = make_collector()
+    rest = FakeRESTAPI([make_node(7), complete])
+    rest.install(collector)
+    collector.collect_prs_via_graphql()
+
+    assert sorted(rest.calls) == [
+        ("get_pr_comments", 7),
+        ("get_pr_files", 7),
+        ("get_pr_review_comments", 7),
+    ]
+    stored = collector.get_store().load(7)
+    assert stored["files"] == rest_files(make_node(7))
+    assert stored["comments"][0]["user"] == {"login": "ghost"}
+
+
+def test_saved_data_matches_collect_pr_data(monkeypatch, config, tmp_path):
+    nodes = [make_node(2), make_node(1)]
+    install_graphql(monkeypatch, {None: (nodes, None)})
+
+    graphql_collector = GraphQLPRCollector(config, fetch_patches=True)
+    rest_collector = PRCollector(config)
+    for collector in (graphql_collector, rest_collector):
+        FakeRESTAPI(nodes).install(collector)
+
+    graphql_dir = tmp_path / "graphql"
+    rest_dir = tmp_path / "rest"
+    graphql_collector.collect_prs_via_graphql(output_dir=graphql_dir)
+    for node in nodes:
+        pr_data = rest_collector.collect_pr_data(node["number"])
+        rest_collector.save_pr_data(pr_data, rest_dir)
+
+    for node in nodes:
+        from_graphql = graphql_collector.get_store(graphql_dir).load(node["number"])
+        from_rest = rest_collector.get_store(rest_dir).load(node["number"])
+
+        # GraphQL APIのラベルには REST API の数値のIDがない
+        for label in from_rest["labels"]:
+            del label["id"]
+        for pr_data in (from_graphql, from_rest):
+            pr_data.pop("collected_at", None)
+
+        assert from_graphql == from_rest
+
+    graphql_collector.close()
+    rest_collector.close()
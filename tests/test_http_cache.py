@@ -0,0 +1,85 @@
+"""GitHub APIレスポンスのETagキャッシュのテスト"""
+
+import os
+import time
+
+import requests
+
+from src.utils.http_cache import ETagCache
+
+
+def make_response(content, content_type="application/vnd.github.diff", etag='"e1"'):
+    """ETag付きの200レスポンスを作成する"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "https://api.github.com/repos/team-mirai/policy/pulls/1"
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    response.headers["ETag"] = etag
+    return response
+
+
+def make_not_modified():
+    response = requests.Response()
+    response.status_code = 304
+    response.headers["X-RateLimit-Remaining"] = "4999"
+    return response
+
+
+def test_body_bytes_are_restored(tmp_path):
+    cache = ETagCache(tmp_path)
+    # UTF-8として正しくない部分を含む差分
+    content = "+政策\n".encode("utf-8") + b"\xff\xfe\n"
+    cache.store("k1", make_response(content))
+
+    entry = cache.get("k1")
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"e1"'}
+
+    response = cache.to_response(entry, make_not_modified())
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["X-RateLimit-Remaining"] == "4999"
+
+
+def test_json_response_is_decoded(tmp_path):
+    cache = ETagCache(tmp_path)
+    content = '{"title": "教育政策"}'.encode("utf-8")
+    cache.store("k1", make_response(content, "application/json; charset=utf-8"))
+
+    response = cache.to_response(cache.get("k1"), make_not_modified())
+    assert response.json() == {"title": "教育政策"}
+
+
+def test_response_without_validator_is_not_stored(tmp_path):
+    cache = ETagCache(tmp_path)
+    response = make_response(b"{}")
+    del response.headers["ETag"]
+    cache.store("k1", response)
+
+    assert cache.get("k1") is None
+
+
+def test_expired_entry_is_removed(tmp_path):
+    cache = ETagCache(tmp_path, max_age_days=1)
+    cache.store("k1", make_response(b"old"))
+    old = time.time() - 2 * 86400
+    os.utime(cache._path("k1"), (old, old))
+
+    assert cache.get("k1") is None
+    assert not cache._path("k1").exists()
+
+
+def test_prune_keeps_most_recently_used_entries(tmp_path):
+    cache = ETagCache(tmp_path, max_entries=2)
+    for index, key in enumerate(("k1", "k2", "k3")):
+        cache.store(key, make_response(key.encode("ascii")))
+        used_at = time.time() - 100 + index
+        os.utime(cache._path(key), (used_at, used_at))
+
+    # k1 を使用すると、最も古いエントリは k2 になる
+    assert cache.get("k1") is not None
+    assert cache.prune() == 1
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+    assert cache.get("k3") is not None
@@ -0,0 +1,124 @@
+"""Issue/PR番号空間マップのテスト"""
+
+import pytest
+
+from src.utils import number_space
+from src.utils.number_space import (
+    NumberSpaceMap,
+    compress_ranges,
+    expand_ranges,
+    format_ranges,
+)
+from src.utils.pr_store import PRStore
+from src.validators.data_validator import DataValidator
+
+
+def make_items(prs=(), issues=()):
+    """issues?state=all の一覧を番号の降順で作成する"""
+    items = [{"number": number, "pull_request": {}} for number in prs]
+    items += [{"number": number} for number in issues]
+    return sorted(items, key=lambda item: item["number"], reverse=True)
+
+
+@pytest.fixture
+def fake_pages(monkeypatch):
+    """APIの代わりに pages の一覧を返し、取得したページ数を記録する"""
+    state = {"pages": [], "fetched": 0}
+
+    def iter_pages(url, params):
+        assert url.endswith("/repos/team-mirai/policy/issues")
+        assert params["direction"] == "desc"
+        for page in state["pages"]:
+            state["fetched"] += 1
+            yield page
+
+    monkeypatch.setattr(number_space, "iter_github_api_pages", iter_pages)
+    return state
+
+
+def test_ranges_round_trip():
+    numbers = {7, 1, 2, 3, 5, 8, 9}
+
+    ranges = compress_ranges(numbers)
+    assert ranges == [[1, 3], [5, 5], [7, 9]]
+    assert expand_ranges(ranges) == numbers
+    assert format_ranges(ranges) == ["#1-#3", "#5", "#7-#9"]
+    assert compress_ranges(set()) == []
+
+
+def test_refresh_classifies_prs_issues_and_deleted(tmp_path, config, fake_pages):
+    # 4番は一覧に現れない（削除済み）
+    fake_pages["pages"] = [make_items(prs=[6, 5, 2], issues=[3, 1])]
+
+    space = NumberSpaceMap(tmp_path, config)
+    assert space.refresh()
+
+    assert space.max_number == 6
+    assert space.pr_numbers() == {2, 5, 6}
+    assert space.issue_numbers() == {1, 3}
+    assert space.deleted_numbers() == {4}
+    assert [space.classify(number) for number in (1, 2, 4, 7)] == [
+        "issue",
+        "pr",
+        "deleted",
+        None,
+    ]
+    assert space.ranges("pr") == [[2, 2], [5, 6]]
+
+
+def test_refresh_fetches_only_numbers_after_known_max(tmp_path, config, fake_pages):
+    fake_pages["pages"] = [make_items(prs=[2], issues=[1])]
+    NumberSpaceMap(tmp_path, config).refresh()
+
+    # 保存したマップを読み込み、既知の番号を含むページで打ち切る
+    fake_pages["pages"] = [
+        make_items(prs=[5], issues=[4]),
+        make_items(prs=[2], issues=[3, 1]),
+        make_items(issues=[1]),
+    ]
+    fake_pages["fetched"] = 0
+    space = NumberSpaceMap(tmp_path, config)
+    assert space.max_number == 2
+    assert space.refresh()
+
+    assert fake_pages["fetched"] == 2
+    assert space.pr_numbers() == {2, 5}
+    assert space.issue_numbers() == {1, 3, 4}
+    assert NumberSpaceMap(tmp_path, config).max_number == 5
+
+
+def test_failed_refresh_keeps_saved_map(tmp_path, config, fake_pages, monkeypatch):
+    fake_pages["pages"] = [make_items(prs=[1])]
+    NumberSpaceMap(tmp_path, config).refresh()
+
+    def fail(url, params):
+        raise RuntimeError("APIエラー")
+        yield
+
+    monkeypatch.setattr(number_space, "iter_github_api_pages", fail)
+    space = NumberSpaceMap(tmp_path, config)
+    assert not space.refresh()
+    assert space.pr_numbers() == {1}
+
+
+def test_validator_reads_persisted_map(config, fake_pages):
+    prs_dir = config["data"]["base_dir"]
+    fake_pages["pages"] = [make_items(prs=[4, 2, 1], issues=[3])]
+    NumberSpaceMap(prs_dir, config).refresh()
+    with PRStore(prs_dir) as store:
+        store.save({"basic_info": {"number": 1, "state": "open"}, "labels": []})
+
+    # 既定では保存済みのマップのみを使い、APIを呼ばない
+    fake_pages["fetched"] = 0
+    validator = DataValidator(config)
+    assert validator.get_missing_pr_numbers() == [2, 4]
+    assert fake_pages["fetched"] == 0
+
+    fake_pages["pages"] = [make_items(prs=[5])]
+    assert validator.get_missing_pr_numbers(refresh_number_space=True) == [2, 4, 5]
+    assert fake_pages["fetched"] == 1
+
+
+def test_validator_skips_missing_check_without_map(config, fake_pages):
+    assert DataValidator(config).get_missing_pr_numbers() == []
+    assert fake_pages["fetched"] == 0
@@ -0,0 +1,120 @@
+"""PRデータのParquet形式エクスポートのテスト"""
+
+import pytest
+
+from src.exporters.parquet_exporter import (
+    ParquetExporter,
+    contribution_stats_from_tables,
+    load_parquet_tables,
+    local_pr_stats_from_tables,
+)
+from src.utils.pr_database import SQLitePRStore
+from src.utils.pr_store import PRStore
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+
+def make_pr_data(number, state="open", labels=(), merged_at=None, comments=1):
+    """保存するPRデータを作成する"""
+    return {
+        "basic_info": {
+            "number": number,
+            "title": f"政策の修正 {number}",
+            "state": state,
+            "created_at": "2024-05-01T00:00:00Z",
+            "updated_at": "2024-05-02T00:00:00Z",
+            "closed_at": merged_at
+            or ("2024-05-03T00:00:00Z" if state == "closed" else None),
+            "merged_at": merged_at,
+            "user": {"login": f"user{number % 2}"},
+        },
+        "labels": [{"name": name} for name in labels],
+        "comments": [
+            {
+                "id": number * 10 + i,
+                "body": "賛成です",
+                "created_at": "2024-05-02T00:00:00Z",
+            }
+            for i in range(comments)
+        ],
+        "files": [{"filename": f"{number}.md", "additions": 2, "deletions": 1}],
+        "commits": [],
+    }
+
+
+@pytest.fixture(params=["file_per_pr", "sqlite"])
+def store(request, tmp_path):
+    store_class = PRStore if request.param == "file_per_pr" else SQLitePRStore
+    with store_class(tmp_path / "prs") as store:
+        store.save(make_pr_data(1, labels=["教育"]))
+        store.save(make_pr_data(2, "closed", labels=["thankyou"]))
+        store.save(make_pr_data(3, "closed", merged_at="2024-05-04T00:00:00Z"))
+        store.save(make_pr_data(1001, comments=0))
+        yield store
+
+
+def test_export_round_trip(store, tmp_path):
+    output_dir = tmp_path / "parquet"
+    assert ParquetExporter(store, output_dir).export() == (4, 2)
+
+    tables = load_parquet_tables(output_dir)
+    prs = tables["prs"].sort_values("number")
+    assert prs["number"].tolist() == [1, 2, 3, 1001]
+    assert prs["comment_count"].tolist() == [1, 1, 1, 0]
+    assert prs["additions"].tolist() == [2, 2, 2, 2]
+    assert str(prs["created_at"].dt.tz) == "UTC"
+    assert sorted(tables["comments"]["id"]) == [10, 20, 30]
+    assert tables["commits"].empty
+
+    stats = local_pr_stats_from_tables(tables)
+    expected = store.stats()
+    expected["file_count"] = len(store.numbers())
+    assert stats == expected
+
+    contribution = contribution_stats_from_tables(tables)
+    assert contribution["merged_prs"] == 1
+    assert contribution["thankyou_closed_prs"] == 1
+    assert contribution["daily_counts"] == {"2024-05-03": 1, "2024-05-04": 1}
+
+
+def test_export_rewrites_only_changed_partitions(store, tmp_path):
+    output_dir = tmp_path / "parquet"
+    exporter = ParquetExporter(store, output_dir)
+    exporter.export()
+
+    untouched = exporter.partition_path("prs", 0)
+    mtime = untouched.stat().st_mtime_ns
+    assert exporter.export() == (0, 0)
+
+    store.save(make_pr_data(1001, comments=2))
+    assert exporter.export() == (1, 1)
+    assert untouched.stat().st_mtime_ns == mtime
+
+    tables = load_parquet_tables(output_dir)
+    assert tables["prs"].set_index("number").loc[1001, "comment_count"] == 2
+    assert sorted(tables["comments"]["id"]) == [10, 20, 30, 10010, 10011]
+
+
+def test_full_export_rewrites_everything(store, tmp_path):
+    exporter = ParquetExporter(store, tmp_path / "parquet")
+    exporter.export()
+
+    assert exporter.export(full=True) == (4, 2)
+
+
+def test_removed_pr_is_dropped(tmp_path):
+    prs_dir = tmp_path / "prs"
+    output_dir = tmp_path / "parquet"
+    with PRStore(prs_dir) as store:
+        store.save(make_pr_data(1))
+        store.save(make_pr_data(1001))
+        ParquetExporter(store, output_dir).export()
+
+        store.path_for(1001).unlink()
+        store.reconcile()
+        assert ParquetExporter(store, output_dir).export() == (1, 1)
+
+    tables = load_parquet_tables(output_dir)
+    assert tables["prs"]["number"].tolist() == [1]
+    assert not (output_dir / "prs" / "bucket=001000").exists()
@@ -0,0 +1,191 @@
+"""PRデータ収集の差分判定とコメント同期のテスト"""
+
+import pytest
+
+from src.collectors.pr_collector import (
+    PRCollector,
+    classify_changed_sub_resources,
+    merge_comments,
+)
+
+HEAD_SHA = "a" * 40
+
+
+def make_stored(files=1, commits=1, comments=1, review_comments=1):
+    """保存済みのPRデータを作成する"""
+    return {
+        "basic_info": {"number": 1, "head_sha": HEAD_SHA},
+        "files": [{"filename": f"{i}.md"} for i in range(files)],
+        "commits": [{"sha": str(i)} for i in range(commits)],
+        "comments": [{"id": i} for i in range(comments)],
+        "review_comments": [{"id": i} for i in range(review_comments)],
+    }
+
+
+def make_details(head_sha=HEAD_SHA, **counts):
+    """PR詳細APIのレスポンスを作成する"""
+    details = {
+        "head": {"sha": head_sha},
+        "changed_files": 1,
+        "commits": 1,
+        "comments": 1,
+        "review_comments": 1,
+    }
+    details.update(counts)
+    return details
+
+
+def test_nothing_changed():
+    assert classify_changed_sub_resources(make_details(), make_stored()) == set()
+
+
+def test_new_head_refetches_files_and_commits():
+    details = make_details(head_sha="b" * 40)
+    assert classify_changed_sub_resources(details, make_stored()) == {
+        "files",
+        "commits",
+    }
+
+
+def test_count_change_refetches_that_resource():
+    details = make_details(comments=2)
+    assert classify_changed_sub_resources(details, make_stored()) == {"comments"}
+
+
+def test_lists_at_api_limit_are_not_refetched_for_same_head():
+    stored = make_stored(files=3000, commits=250)
+    details = make_details(changed_files=3500, commits=300)
+    assert classify_changed_sub_resources(details, stored) == set()
+
+
+def test_lists_at_api_limit_are_refetched_for_new_head():
+    stored = make_stored(files=3000, commits=250)
+    details = make_details(head_sha="b" * 40, changed_files=3500, commits=300)
+    assert classify_changed_sub_resources(details, stored) == {"files", "commits"}
+
+
+def make_comment(comment_id, created_at, updated_at=None, body="賛成です", pr=1):
+    """リポジトリ全体のコメント一覧APIのコメントを作成する"""
+    return {
+        "id": comment_id,
+        "body": body,
+        "user": {"login": "alice"},
+        "created_at": created_at,
+        "updated_at": updated_at or created_at,
+        "issue_url": f"https://api.github.com/repos/team-mirai/policy/issues/{pr}",
+    }
+
+
+def test_merge_comments_replaces_by_id_and_sorts_by_creation():
+    existing = [
+        make_comment(1, "2024-05-01T00:00:00Z"),
+        make_comment(3, "2024-05-03T00:00:00Z"),
+    ]
+    updates = [
+        make_comment(2, "2024-05-02T00:00:00Z"),
+        make_comment(3, "2024-05-03T00:00:00Z", "2024-05-09T00:00:00Z", "修正"),
+    ]
+
+    merged = merge_comments(existing, updates)
+
+    assert [comment["id"] for comment in merged] == [1, 2, 3]
+    assert merged[2]["body"] == "修正"
+    assert merge_comments(merged, updates) == merged
+
+
+@pytest.fixture
+def collector(config):
+    collector = PRCollector(config)
+    yield collector
+    collector.close()
+
+
+def fake_repo_comments(monkeypatch, pages_by_endpoint, calls):
+    """リポジトリ全体のコメント一覧APIの代わりに pages_by_endpoint を返す"""
+
+    def iter_repo_comments(self, endpoint, since=None):
+        calls.append((endpoint, since))
+        for page in pages_by_endpoint.get(endpoint, []):
+            if isinstance(page, Exception):
+                raise page
+            yield page
+
+    monkeypatch.setattr(PRCollector, "iter_repo_comments", iter_repo_comments)
+
+
+def save_pr(collector, number, comments):
+    collector.save_pr_data(
+        {
+            "basic_info": {"number": number, "state": "open"},
+            "comments": comments,
+            "review_comments": [],
+        }
+    )
+
+
+def test_sync_comments_merges_into_saved_prs(monkeypatch, collector):
+    save_pr(collector, 1, [make_comment(1, "2024-05-01T00:00:00Z")])
+    review_comment = {
+        **make_comment(20, "2024-05-04T00:00:00Z"),
+        "path": "README.md",
+        "pull_request_url": "https://api.github.com/repos/team-mirai/policy/pulls/1",
+    }
+    calls = []
+    fake_repo_comments(
+        monkeypatch,
+        {
+            "issues/comments": [
+                [
+                    make_comment(
+                        1, "2024-05-01T00:00:00Z", "2024-05-05T00:00:00Z", "修正"
+                    )
+                ],
+                # 未保存のPRへのコメントは対象外
+                [make_comment(5, "2024-05-06T00:00:00Z", pr=2)],
+            ],
+            "pulls/comments": [[review_comment]],
+        },
+        calls,
+    )
+
+    assert collector.sync_comments() == 1
+
+    pr_data = collector.get_store().load(1)
+    assert [(c["id"], c["body"]) for c in pr_data["comments"]] == [(1, "修正")]
+    assert [c["id"] for c in pr_data["review_comments"]] == [20]
+    assert collector.get_store().load(2) is None
+    assert calls == [("issues/comments", None), ("pulls/comments", None)]
+    watermark = collector.load_last_run_info()["comment_watermark"]
+    assert watermark == "2024-05-06T00:00:00Z"
+
+    # 次回は記録したウォーターマーク以降のみを取得する
+    calls.clear()
+    fake_repo_comments(monkeypatch, {}, calls)
+    assert collector.sync_comments() == 0
+    assert calls == [
+        ("issues/comments", watermark),
+        ("pulls/comments", watermark),
+    ]
+    assert collector.load_last_run_info()["comment_watermark"] == watermark
+
+
+def test_failed_sync_keeps_watermark(monkeypatch, collector):
+    save_pr(collector, 1, [])
+    collector.save_last_run_value("comment_watermark", "2024-05-01T00:00:00Z")
+    fake_repo_comments(
+        monkeypatch,
+        {
+            "issues/comments": [
+                [make_comment(1, "2024-05-02T00:00:00Z")],
+                RuntimeError("APIエラー"),
+            ]
+        },
+        [],
+    )
+
+    with pytest.raises(RuntimeError):
+        collector.sync_comments()
+
+    info = collector.load_last_run_info()
+    assert info["comment_watermark"] == "2024-05-01T00:00:00Z"
+    assert collector.get_store().load(1)["comments"] == []
@@ -0,0 +1,43 @@
+"""PRデータ収集スクリプトのテスト"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.collectors import pr_collector_main
+from src.collectors.pr_collector import PRCollector
+from src.utils.pr_manifest import INDEX_DIR_NAME, JOURNAL_FILE_NAME, MANIFEST_FILE_NAME
+
+
+@pytest.mark.parametrize("engine", ["sync", "async"])
+def test_index_is_written_back_when_collection_fails(monkeypatch, config, engine):
+    def collect_then_fail(self, output_dir=None, max_count=None, since=None):
+        self.save_pr_data(
+            {
+                "basic_info": {"number": 1, "state": "open", "user": {"login": "a"}},
+                "labels": [],
+            },
+            output_dir,
+        )
+        raise RuntimeError("APIエラー")
+
+    monkeypatch.setattr(pr_collector_main, "load_config", lambda: config)
+    monkeypatch.setattr(PRCollector, "collect_prs_by_update_time", collect_then_fail)
+    monkeypatch.setattr(
+        pr_collector_main.AsyncPRCollector,
+        "collect_prs_by_update_time",
+        collect_then_fail,
+    )
+    monkeypatch.setattr(
+        sys, "argv", ["pr_collector_main.py", "--mode", "update", "--engine", engine]
+    )
+
+    with pytest.raises(RuntimeError):
+        pr_collector_main.main()
+
+    index_dir = Path(config["data"]["base_dir"]) / INDEX_DIR_NAME
+    assert not (index_dir / JOURNAL_FILE_NAME).exists()
+    manifest = json.loads((index_dir / MANIFEST_FILE_NAME).read_text("utf-8"))
+    assert list(manifest["prs"]) == ["1"]
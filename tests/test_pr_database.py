@@ -0,0 +1,123 @@
+"""SQLiteストアがファイルのストアと同じ結果を返すことのテスト"""
+
+import pytest
+
+from src.utils.pr_database import SQLitePRStore
+from src.utils.pr_store import PRStore
+
+
+def make_pr_data(number, state, author, labels=(), merged_at=None, created="05"):
+    """保存するPRデータを作成する"""
+    return {
+        "basic_info": {
+            "number": number,
+            "title": f"政策の修正 {number}",
+            "state": state,
+            "created_at": f"2024-{created}-01T00:00:00Z",
+            "updated_at": f"2024-{created}-02T00:00:00Z",
+            "closed_at": merged_at,
+            "merged_at": merged_at,
+            "user": {"login": author},
+            "html_url": f"https://github.com/team-mirai/policy/pull/{number}",
+        },
+        "labels": [{"name": name, "color": "ffffff"} for name in labels],
+        "comments": [{"id": number * 10, "body": "賛成です", "user": {"login": "c"}}],
+        "files": [{"filename": f"{number}.md", "additions": 1, "deletions": 0}],
+        "commits": [{"sha": f"{number:040d}", "commit": {"message": "修正"}}],
+        "collected_at": "2024-07-01T00:00:00",
+    }
+
+
+SAMPLE_PRS = [
+    make_pr_data(1, "open", "alice", ["教育"]),
+    make_pr_data(2, "closed", "bob", ["教育", "thankyou"], created="06"),
+    make_pr_data(3, "closed", "alice", merged_at="2024-06-03T00:00:00Z"),
+    make_pr_data(1500, "open", "carol", ["経済"], created="06"),
+]
+
+
+def without_file_info(summary):
+    """インデックスのエントリからファイルのサイズ・ハッシュを除く"""
+    if summary is None:
+        return None
+    return {key: value for key, value in summary.items() if key not in ("size", "hash")}
+
+
+@pytest.fixture(params=["file_per_pr", "sqlite"])
+def store(request, tmp_path):
+    store_class = PRStore if request.param == "file_per_pr" else SQLitePRStore
+    with store_class(tmp_path / request.param) as store:
+        for pr_data in SAMPLE_PRS:
+            store.save(pr_data)
+        yield store
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """同じPRデータを保存したファイルのストアとSQLiteストア"""
+    with PRStore(tmp_path / "files") as files, SQLitePRStore(
+        tmp_path / "sqlite"
+    ) as sqlite:
+        for pr_data in SAMPLE_PRS:
+            files.save(pr_data)
+            sqlite.save(pr_data)
+        yield files, sqlite
+
+
+def test_load_and_numbers_match(stores):
+    files, sqlite = stores
+
+    assert sqlite.numbers() == files.numbers() == {1, 2, 3, 1500}
+    assert sqlite.max_number() == files.max_number() == 1500
+    for number in (1, 3, 1500, 99):
+        assert sqlite.load(number) == files.load(number)
+        assert sqlite.exists(number) == files.exists(number)
+    assert list(sqlite.iter_pr_data([3, 1])) == list(files.iter_pr_data([1, 3]))
+
+
+def test_summaries_match(stores):
+    files, sqlite = stores
+
+    for number in (1, 2, 3, 1500, 99):
+        assert sqlite.get_summary(number) == without_file_info(
+            files.get_summary(number)
+        )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"state": "open"},
+        {"label": "教育"},
+        {"author": "alice"},
+        {"created_since": "2024-06-01"},
+        {"updated_since": "2024-06-02T00:00:00Z"},
+        {"merged": True},
+        {"merged": False, "label": "教育"},
+    ],
+)
+def test_query_matches(stores, filters):
+    files, sqlite = stores
+
+    assert sqlite.query(**filters) == [
+        (number, without_file_info(entry)) for number, entry in files.query(**filters)
+    ]
+
+
+def test_stats_match(stores):
+    files, sqlite = stores
+
+    assert sqlite.stats() == files.stats()
+    assert sqlite.stats()["state_counts"] == {"open": 2, "closed": 1, "merged": 1}
+
+
+def test_unchanged_save_is_skipped_and_keeps_collected_at(store):
+    pr_data = {**SAMPLE_PRS[0], "collected_at": "2024-08-01T00:00:00"}
+    assert store.save(pr_data) is None
+
+    changed = {**SAMPLE_PRS[0], "labels": []}
+    del changed["collected_at"]
+    assert store.save(changed) is not None
+    assert store.get_summary(1)["labels"] == []
+    assert store.get_summary(1)["collected_at"] == "2024-07-01T00:00:00"
@@ -0,0 +1,236 @@
+"""PRデータの保存先（ストア）のテスト"""
+
+import json
+import os
+
+import pytest
+
+from src.utils.checkpoint import CollectionCheckpoint
+from src.utils.pr_format import FILE_FORMATS
+from src.utils.pr_manifest import (
+    INDEX_DIR_NAME,
+    JOURNAL_FILE_NAME,
+    MANIFEST_FILE_NAME,
+    write_file_atomically,
+)
+from src.utils.pr_store import LAYOUTS, PRStore
+
+# 保存形式ごとに必要なパッケージ
+FORMAT_PACKAGES = {"json_zstd": "zstandard", "msgpack": "msgpack"}
+
+
+def make_pr_data(number, state="open", collected_at="2024-05-05T00:00:00", **extra):
+    """保存するPRデータを作成する"""
+    return {
+        "basic_info": {
+            "number": number,
+            "title": f"政策の修正 {number}",
+            "state": state,
+            "created_at": "2024-05-01T00:00:00Z",
+            "updated_at": "2024-05-02T00:00:00Z",
+            "closed_at": None,
+            "merged_at": None,
+            "user": {"login": "alice"},
+        },
+        "labels": [{"name": "教育"}],
+        "comments": [{"id": 1, "body": "賛成です"}],
+        "files": [{"filename": "README.md", "patch": "@@ -1 +1 @@\n-a\n+b"}],
+        "collected_at": collected_at,
+        **extra,
+    }
+
+
+@pytest.mark.parametrize("file_format", FILE_FORMATS)
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_save_and_load_round_trip(tmp_path, layout, file_format):
+    if file_format in FORMAT_PACKAGES:
+        pytest.importorskip(FORMAT_PACKAGES[file_format])
+
+    with PRStore(
+        tmp_path, layout=layout, shard_size=10, file_format=file_format
+    ) as store:
+        path = store.save(make_pr_data(1))
+        store.save(make_pr_data(12, state="closed"))
+
+    if layout == "sharded":
+        assert path.parent.name == "000000"
+
+    # 記録された配置方法・保存形式で開き直す
+    with PRStore(tmp_path) as store:
+        assert (store.layout, store.file_format) == (layout, file_format)
+        assert store.numbers() == {1, 12}
+
+        loaded = store.load(12)
+        expected = make_pr_data(12, state="closed")
+        del expected["collected_at"]
+        assert loaded == expected
+        assert store.get_summary(12)["collected_at"] == "2024-05-05T00:00:00"
+        assert [number for number, _ in store.query(state="open")] == [1]
+
+
+def test_unchanged_pr_is_not_rewritten(tmp_path):
+    with PRStore(tmp_path) as store:
+        path = store.save(make_pr_data(1))
+        mtime = path.stat().st_mtime_ns
+
+        # 収集日時のみが異なる場合はファイルを書き直さない
+        assert store.save(make_pr_data(1, collected_at="2024-06-01T00:00:00")) is None
+        assert path.stat().st_mtime_ns == mtime
+        assert store.get_summary(1)["collected_at"] == "2024-05-05T00:00:00"
+
+        assert store.save(make_pr_data(1, state="closed")) == path
+        assert store.load(1)["basic_info"]["state"] == "closed"
+
+
+def test_replaced_file_is_not_treated_as_unchanged(tmp_path):
+    with PRStore(tmp_path) as store:
+        path = store.save(make_pr_data(1))
+        content = path.read_bytes()
+        assert store.is_unchanged(1, content)
+
+        path.write_bytes(content + b"\n")
+        assert not store.is_unchanged(1, content)
+
+
+def test_journal_is_replayed_when_store_is_not_closed(tmp_path):
+    store = PRStore(tmp_path)
+    store.save(make_pr_data(1))
+    store.save(make_pr_data(2))
+
+    index_dir = tmp_path / INDEX_DIR_NAME
+    journal = (index_dir / JOURNAL_FILE_NAME).read_text("utf-8").splitlines()
+    assert [json.loads(line)["number"] for line in journal] == [1, 2]
+    assert JOURNAL_FILE_NAME in (index_dir / ".gitignore").read_text("utf-8")
+
+    # close() されずに終了しても、次に開いたときにジャーナルから復元する
+    with PRStore(tmp_path) as reopened:
+        assert reopened.numbers() == {1, 2}
+
+    assert not (index_dir / JOURNAL_FILE_NAME).exists()
+    manifest = json.loads((index_dir / MANIFEST_FILE_NAME).read_text("utf-8"))
+    assert list(manifest["prs"]) == ["1", "2"]
+
+
+def test_journal_is_compacted_at_threshold(tmp_path):
+    store = PRStore(tmp_path)
+    store.manifest.compact_threshold = 2
+    index_dir = tmp_path / INDEX_DIR_NAME
+
+    store.save(make_pr_data(1))
+    assert (index_dir / JOURNAL_FILE_NAME).exists()
+
+    store.save(make_pr_data(2))
+    assert not (index_dir / JOURNAL_FILE_NAME).exists()
+    manifest = (index_dir / MANIFEST_FILE_NAME).read_text("utf-8")
+    # 1件1行で書き出す
+    assert manifest.splitlines()[1].startswith('"1": ')
+    assert manifest.splitlines()[2].startswith('"2": ')
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / "1.json"
+    write_file_atomically(path, b"old")
+
+    def fail_replace(src, dst):
+        raise OSError("ディスクがいっぱいです")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        write_file_atomically(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert [child.name for child in tmp_path.iterdir()] == ["1.json"]
+
+
+def test_checkpoint_save_load_clear(tmp_path):
+    checkpoint = CollectionCheckpoint(tmp_path, "sequential")
+    assert checkpoint.load() is None
+
+    checkpoint.save(next_number=120, collected_count=3)
+    state = CollectionCheckpoint(tmp_path, "sequential").load()
+    assert state["mode"] == "sequential"
+    assert (state["next_number"], state["collected_count"]) == (120, 3)
+    assert checkpoint.path.parent.parent == tmp_path / INDEX_DIR_NAME
+
+    checkpoint.clear()
+    assert checkpoint.load() is None
+
+
+def test_broken_checkpoint_is_ignored(tmp_path):
+    checkpoint = CollectionCheckpoint(tmp_path, "graphql")
+    checkpoint.path.parent.mkdir(parents=True)
+    checkpoint.path.write_text("{", encoding="utf-8")
+
+    assert checkpoint.load() is None
+
+
+def test_migrate_layout_moves_files(tmp_path):
+    with PRStore(tmp_path) as store:
+        for number in (1, 1500):
+            store.save(make_pr_data(number))
+
+    with PRStore(tmp_path) as store:
+        assert store.migrate(layout="sharded", shard_size=1000) == 2
+
+    assert not (tmp_path / "1.json").exists()
+    assert (tmp_path / "000000" / "1.json").exists()
+    assert (tmp_path / "001000" / "1500.json").exists()
+
+    with PRStore(tmp_path) as store:
+        assert store.layout == "sharded"
+        assert store.load(1500)["basic_info"]["number"] == 1500
+
+        assert store.migrate(layout="flat") == 2
+        assert sorted(child.name for child in tmp_path.iterdir()) == [
+            ".index",
+            "1.json",
+            "1500.json",
+        ]
+
+
+def test_migrate_format_keeps_collected_at(tmp_path):
+    with PRStore(tmp_path) as store:
+        store.save(make_pr_data(1))
+        store.save(make_pr_data(2, collected_at="2024-06-06T00:00:00"))
+
+    with PRStore(tmp_path) as store:
+        assert store.migrate(file_format="json_gzip") == 2
+
+    with PRStore(tmp_path) as store:
+        assert store.file_format == "json_gzip"
+        assert store.get_summary(1)["collected_at"] == "2024-05-05T00:00:00"
+        assert store.get_summary(2)["collected_at"] == "2024-06-06T00:00:00"
+
+
+def test_reconcile_picks_up_files_changed_outside_the_store(tmp_path):
+    with PRStore(tmp_path) as store:
+        for number in (1, 2, 3):
+            store.save(make_pr_data(number))
+
+    # git pull などで保存処理を経ずにファイルが変わった状態を作る
+    with PRStore(tmp_path) as other:
+        other.save(make_pr_data(4))
+        other.path_for(2).unlink()
+    (tmp_path / ".index" / "manifest.json").write_text(
+        (tmp_path / ".index" / "manifest.json")
+        .read_text("utf-8")
+        .replace('"4"', '"9"'),
+        "utf-8",
+    )
+    path = tmp_path / "3.json"
+    path.write_text(
+        path.read_text("utf-8").replace("2024-05-02", "2024-05-09"), "utf-8"
+    )
+
+    with PRStore(tmp_path) as store:
+        # 読み込み時には照合しない
+        assert store.numbers() == {1, 2, 3, 9}
+
+        # サイズが同じ変更は内容を比較しないと検出できない
+        assert store.reconcile() == 3
+        assert store.numbers() == {1, 3, 4}
+        assert store.get_summary(3)["updated_at"] == "2024-05-02T00:00:00Z"
+
+        assert store.reconcile([path, tmp_path / ".index" / "store.json"]) == 1
+        assert store.get_summary(3)["updated_at"] == "2024-05-09T00:00:00Z"
+        assert store.get_summary(3)["collected_at"] == "2024-05-05T00:00:00"
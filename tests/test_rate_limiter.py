@@ -0,0 +1,190 @@
+"""GitHub APIのレート制限管理のテスト"""
+
+import threading
+
+import pytest
+import requests
+
+from src.utils import rate_limiter
+from src.utils.rate_limiter import (
+    MAX_SECONDARY_LIMIT_WAIT,
+    SECONDARY_LIMIT_WAIT,
+    RateLimitGovernor,
+)
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    """time.time と time.sleep の代わりに使う時計（sleep は時刻を進めるだけ）"""
+
+    def __init__(self, now=NOW):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def make_response(status_code=200, text="", **headers):
+    """指定したヘッダーのレスポンスを作成する（"_" は "-" に置き換える）"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    for name, value in headers.items():
+        response.headers[name.replace("_", "-")] = str(value)
+    return response
+
+
+def rate_limit_response(remaining, reset, limit=5000, resource="core"):
+    return make_response(
+        **{
+            "X-RateLimit-Remaining": remaining,
+            "X-RateLimit-Reset": int(reset),
+            "X-RateLimit-Limit": limit,
+            "X-RateLimit-Resource": resource,
+        }
+    )
+
+
+def test_update_from_response_records_each_resource(clock):
+    governor = RateLimitGovernor()
+    governor.update_from_response(rate_limit_response(4000, NOW + 600))
+    governor.update_from_response(
+        rate_limit_response(10, NOW + 60, limit=5000, resource="graphql")
+    )
+    # ヘッダーがない・値が壊れているレスポンスは無視する
+    governor.update_from_response(make_response())
+    governor.update_from_response(make_response(X_RateLimit_Remaining="?"))
+
+    assert governor.get_status() == {
+        "remaining": 4000,
+        "reset": int(NOW + 600),
+        "limit": 5000,
+    }
+    assert governor.get_status("graphql")["remaining"] == 10
+    assert governor.get_status("search") is None
+
+
+def test_no_pacing_while_budget_is_above_ratio(clock):
+    governor = RateLimitGovernor(reserve=10, pace_below_ratio=0.5)
+    governor.update_from_response(rate_limit_response(4000, NOW + 1000))
+
+    for _ in range(3):
+        governor.wait()
+
+    assert clock.sleeps == []
+    assert governor.get_status()["remaining"] == 3997
+
+
+def test_requests_are_spread_until_reset(clock):
+    governor = RateLimitGovernor(reserve=10, pace_below_ratio=0.5)
+    governor.update_from_response(rate_limit_response(1010, NOW + 1000))
+
+    governor.wait()
+    governor.wait()
+
+    # 残り1000件（予備を除く）をリセットまでの1000秒で均等に使う
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_min_interval_applies_without_status(clock):
+    governor = RateLimitGovernor(min_interval=0.5)
+
+    for _ in range(3):
+        governor.wait()
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_exhausted_budget_waits_until_reset(clock):
+    governor = RateLimitGovernor(reserve=10, buffer_seconds=5)
+    governor.update_from_response(rate_limit_response(10, NOW + 120))
+
+    governor.wait()
+    assert clock.sleeps == [125]
+
+    # リセット後は上限まで回復したものとして扱う
+    assert governor.get_status()["remaining"] == 5000
+    governor.wait()
+    assert clock.sleeps == [125]
+
+
+def test_disabled_governor_never_sleeps(clock):
+    governor = RateLimitGovernor(enabled=False, min_interval=10)
+    governor.update_from_response(rate_limit_response(0, NOW + 120))
+
+    governor.wait()
+    governor.wait()
+
+    assert clock.sleeps == []
+
+
+def test_concurrent_reservations_get_distinct_slots(clock):
+    governor = RateLimitGovernor(min_interval=1.0)
+    governor.update_from_response(rate_limit_response(4000, NOW + 1000))
+    waits = []
+    start = threading.Barrier(20)
+
+    def reserve():
+        start.wait()
+        waits.append(governor._reserve_slot("core"))
+
+    threads = [threading.Thread(target=reserve) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(waits) == [float(i) for i in range(20)]
+    assert governor.get_status()["remaining"] == 3980
+
+
+def test_retry_delay_uses_retry_after(clock):
+    governor = RateLimitGovernor()
+    response = make_response(403, Retry_After="30", X_RateLimit_Remaining="0")
+
+    assert governor.retry_delay(response, attempt=0) == 30.0
+
+
+def test_retry_delay_waits_for_reset_when_exhausted(clock):
+    governor = RateLimitGovernor(buffer_seconds=5)
+    response = make_response(
+        403, X_RateLimit_Remaining="0", X_RateLimit_Reset=int(NOW + 100)
+    )
+
+    assert governor.retry_delay(response, attempt=0) == 105
+
+    clock.now = NOW + 200
+    assert governor.retry_delay(response, attempt=0) == 5
+
+
+def test_retry_delay_backs_off_on_secondary_limit(clock):
+    governor = RateLimitGovernor()
+    response = make_response(
+        403, text='{"message": "You have exceeded a secondary rate limit."}'
+    )
+
+    assert governor.retry_delay(response, attempt=0) == SECONDARY_LIMIT_WAIT
+    assert governor.retry_delay(response, attempt=1) == SECONDARY_LIMIT_WAIT * 2
+    assert governor.retry_delay(response, attempt=10) == MAX_SECONDARY_LIMIT_WAIT
+    assert governor.retry_delay(make_response(429), attempt=0) == SECONDARY_LIMIT_WAIT
+
+
+def test_retry_delay_ignores_other_errors(clock):
+    governor = RateLimitGovernor()
+
+    assert governor.retry_delay(make_response(403, text="Forbidden"), 0) is None
+    assert governor.retry_delay(make_response(500), 0) is None
+    assert governor.retry_delay(make_response(200), 0) is None
@@ -0,0 +1,304 @@
+"""Webhook受信サーバーのテスト
+
+署名付きのペイロードをプロセス内のサーバーに送信し、保存されたPRデータを確認します。
+"""
+
+import hashlib
+import hmac
+import http.client
+import json
+import threading
+
+import pytest
+
+from src.collectors.pr_collector import PRCollector
+from src.collectors.webhook_receiver import WebhookProcessor, create_webhook_server
+
+SECRET = "test-secret"
+REPOSITORY = {"full_name": "team-mirai/policy"}
+
+
+def make_pull_request(number=1, **overrides):
+    """pull_request イベントに含まれるPRを作成する"""
+    pull_request = {
+        "number": number,
+        "title": "教育政策の修正",
+        "state": "open",
+        "created_at": "2025-06-01T00:00:00Z",
+        "updated_at": "2025-06-02T00:00:00Z",
+        "closed_at": None,
+        "merged_at": None,
+        "html_url": f"https://github.com/team-mirai/policy/pull/{number}",
+        "user": {
+            "login": "alice",
+            "id": 1,
+            "html_url": "https://github.com/alice",
+        },
+        "head": {"sha": "a" * 40},
+        "base": {"ref": "main", "sha": "b" * 40},
+        "labels": [{"id": 10, "name": "教育", "color": "ffffff", "description": ""}],
+        "comments": 1,
+        "review_comments": 1,
+        "changed_files": 1,
+        "commits": 1,
+    }
+    pull_request.update(overrides)
+    return pull_request
+
+
+def make_comment(comment_id, body, created_at="2025-06-01T01:00:00Z", **extra):
+    """コメントを作成する"""
+    return {
+        "id": comment_id,
+        "body": body,
+        "user": {"login": "bob"},
+        "created_at": created_at,
+        "updated_at": created_at,
+        "html_url": f"https://github.com/team-mirai/policy/pull/1#c{comment_id}",
+        **extra,
+    }
+
+
+@pytest.fixture
+def collector(config):
+    collector = PRCollector(config)
+    yield collector
+    collector.close()
+
+
+@pytest.fixture
+def processor(collector):
+    """PR #1 を保存済みのストアを対象にしたプロセッサ"""
+    pull_request = make_pull_request()
+    collector.save_pr_data(
+        {
+            "basic_info": collector.build_basic_info(pull_request),
+            "labels": pull_request["labels"],
+            "comments": [make_comment(100, "賛成です")],
+            "review_comments": [make_comment(200, "ここを修正", path="README.md")],
+            "files": [{"filename": "README.md", "status": "modified"}],
+            "commits": [{"sha": "a" * 40}],
+        }
+    )
+
+    processor = WebhookProcessor(collector)
+    processor.refreshed = []
+    collector.refresh_pr_data = lambda pr_number, output_dir=None: (
+        processor.refreshed.append(pr_number)
+    )
+    return processor
+
+
+@pytest.fixture
+def server(processor):
+    server = create_webhook_server(processor, SECRET, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, event, payload=None, secret=SECRET, body=None, headers=None):
+    """ペイロードに署名してサーバーに送信し、(ステータス, 応答) を返す"""
+    if body is None:
+        body = json.dumps(payload).encode("utf-8")
+    signature = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    connection.putrequest("POST", "/webhook")
+    request_headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+        "X-GitHub-Event": event,
+        "X-Hub-Signature-256": f"sha256={signature}",
+        **(headers or {}),
+    }
+    for name, value in request_headers.items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def deliver(server, processor, event, payload):
+    """ペイロードを送信し、キューに入ったイベントを反映する"""
+    status, _ = post(server, event, {**payload, "repository": REPOSITORY})
+    processor.process_pending()
+    return status
+
+
+def load_stored(processor, pr_number=1):
+    return processor.store.load(pr_number)
+
+
+def test_ping(server, processor):
+    before = load_stored(processor)
+    assert deliver(server, processor, "ping", {"zen": "Keep it simple."}) == 202
+    assert load_stored(processor) == before
+
+
+def test_pull_request_updates_basic_info_and_labels(server, processor):
+    pull_request = make_pull_request(
+        title="教育政策の修正（改訂）",
+        updated_at="2025-06-03T00:00:00Z",
+        labels=[{"id": 11, "name": "子育て", "color": "000000", "description": ""}],
+    )
+    status = deliver(
+        server,
+        processor,
+        "pull_request",
+        {"action": "edited", "pull_request": pull_request},
+    )
+
+    stored = load_stored(processor)
+    assert status == 202
+    assert stored["basic_info"]["title"] == "教育政策の修正（改訂）"
+    assert stored["basic_info"]["updated_at"] == "2025-06-03T00:00:00Z"
+    assert [label["name"] for label in stored["labels"]] == ["子育て"]
+    assert stored["comments"][0]["body"] == "賛成です"
+    assert processor.refreshed == []
+
+
+def test_pull_request_older_than_stored_is_ignored(server, processor):
+    pull_request = make_pull_request(
+        title="古いタイトル", updated_at="2025-06-01T12:00:00Z"
+    )
+    deliver(
+        server,
+        processor,
+        "pull_request",
+        {"action": "edited", "pull_request": pull_request},
+    )
+
+    stored = load_stored(processor)
+    assert stored["basic_info"]["title"] == "教育政策の修正"
+    assert stored["basic_info"]["updated_at"] == "2025-06-02T00:00:00Z"
+
+
+def test_pull_request_with_new_commits_queues_refresh(server, processor):
+    pull_request = make_pull_request(
+        updated_at="2025-06-03T00:00:00Z", head={"sha": "c" * 40}, commits=2
+    )
+    deliver(
+        server,
+        processor,
+        "pull_request",
+        {"action": "synchronize", "pull_request": pull_request},
+    )
+
+    assert processor.refreshed == [1]
+    assert load_stored(processor)["basic_info"]["head_sha"] == "a" * 40
+
+
+def test_pull_request_not_stored_queues_refresh(server, processor):
+    deliver(
+        server,
+        processor,
+        "pull_request",
+        {"action": "opened", "pull_request": make_pull_request(number=2)},
+    )
+
+    assert processor.refreshed == [2]
+    assert load_stored(processor, 2) is None
+
+
+def test_issue_comment_created_and_deleted(server, processor):
+    issue = {"number": 1, "pull_request": {"url": "https://api.github.com/x"}}
+    comment = make_comment(101, "反対です", created_at="2025-06-02T01:00:00Z")
+
+    deliver(
+        server,
+        processor,
+        "issue_comment",
+        {"action": "created", "issue": issue, "comment": comment},
+    )
+    assert [c["id"] for c in load_stored(processor)["comments"]] == [100, 101]
+
+    deliver(
+        server,
+        processor,
+        "issue_comment",
+        {"action": "deleted", "issue": issue, "comment": make_comment(100, "")},
+    )
+    assert [c["id"] for c in load_stored(processor)["comments"]] == [101]
+
+
+def test_issue_comment_on_issue_is_ignored(server, processor):
+    before = load_stored(processor)
+    deliver(
+        server,
+        processor,
+        "issue_comment",
+        {
+            "action": "created",
+            "issue": {"number": 1},
+            "comment": make_comment(102, "Issueへのコメント"),
+        },
+    )
+    assert load_stored(processor) == before
+
+
+def test_review_comment_edited(server, processor):
+    comment = make_comment(200, "ここを修正してください", path="README.md")
+    deliver(
+        server,
+        processor,
+        "pull_request_review_comment",
+        {
+            "action": "edited",
+            "pull_request": make_pull_request(),
+            "comment": comment,
+        },
+    )
+
+    review_comments = load_stored(processor)["review_comments"]
+    assert len(review_comments) == 1
+    assert review_comments[0]["body"] == "ここを修正してください"
+
+
+def test_label_renamed(server, processor):
+    label = {"id": 10, "name": "教育・子育て", "color": "ff0000", "description": ""}
+    deliver(
+        server,
+        processor,
+        "label",
+        {
+            "action": "edited",
+            "label": label,
+            "changes": {"name": {"from": "教育"}},
+        },
+    )
+
+    assert load_stored(processor)["labels"] == [label]
+
+
+def test_invalid_signature_is_rejected(server, processor):
+    before = load_stored(processor)
+    payload = {
+        "action": "edited",
+        "pull_request": make_pull_request(
+            title="改ざん", updated_at="2025-06-03T00:00:00Z"
+        ),
+        "repository": REPOSITORY,
+    }
+
+    status, _ = post(server, "pull_request", payload, secret="wrong-secret")
+    processor.process_pending()
+
+    assert status == 401
+    assert load_stored(processor) == before
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_invalid_content_length_is_rejected(server, content_length):
+    status, body = post(
+        server,
+        "ping",
+        body=b"{}",
+        headers={"Content-Length": content_length},
+    )
+    assert status == 400
+    assert body["message"] == "invalid content length"
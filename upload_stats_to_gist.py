@@ -5,10 +5,11 @@
 
 import os
 import json
-import requests
 from datetime import datetime, timezone
 from pathlib import Path
 
+from src.utils.github_api import get_session
+
 
 def upload_to_gist(json_data, github_token, gist_id=None):
     """
@@ -35,12 +36,13 @@ def upload_to_gist(json_data, github_token, gist_id=None):
     }
 
     try:
+        session = get_session()
         if gist_id:
             url = f"https://api.github.com/gists/{gist_id}"
-            response = requests.patch(url, headers=headers, json=gist_data)
+            response = session.patch(url, headers=headers, json=gist_data)
         else:
             url = "https://api.github.com/gists"
-            response = requests.post(url, headers=headers, json=gist_data)
+            response = session.post(url, headers=headers, json=gist_data)
 
         if response.status_code in [200, 201]:
             gist_info = response.json()